@@ -20,6 +20,8 @@ TimeoutError = futures.TimeoutError
 Executor = futures.Executor
 ProcessPoolExecutor = futures.ProcessPoolExecutor
 ThreadPoolExecutor = futures.ThreadPoolExecutor
+FIRST_COMPLETED = futures.FIRST_COMPLETED
+wait = futures.wait
 
 if sys.version_info < (3, 8):
 
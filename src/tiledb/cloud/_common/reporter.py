@@ -0,0 +1,159 @@
+"""Background reporting of client-side status changes to the server."""
+
+import atexit
+import collections
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+import urllib3
+
+logger = logging.getLogger(__name__)
+
+_Report = Tuple[Callable[..., Any], Dict[str, Any]]
+
+_IDLE_SECS = 30
+"""How long a reporter thread waits for new reports before exiting."""
+
+
+class StatusReporter:
+    """Sends status reports to the server from a few background threads.
+
+    Reports are keyed by what they describe (e.g. a single node of a task
+    graph). If a new report is submitted for a key whose previous report has
+    not been sent yet, the older one is dropped, so a burst of status changes
+    only results in the latest being sent. Reports for the same key are never
+    sent concurrently.
+
+    Failures from connection errors or 5xx/429 responses are retried with
+    exponential backoff; other failures are logged and dropped. At interpreter
+    exit, pending reports are sent for up to ``flush_timeout_sec``.
+
+    :param max_workers: The maximum number of reports sent at once.
+    :param max_attempts: How many times to try sending each report.
+    :param backoff_sec: The delay before the first retry; doubled every retry.
+    :param flush_timeout_sec: How long to wait for pending reports at exit.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        *,
+        max_attempts: int = 3,
+        backoff_sec: float = 0.5,
+        flush_timeout_sec: float = 10,
+    ):
+        self._max_workers = max_workers
+        self._max_attempts = max_attempts
+        self._backoff_sec = backoff_sec
+        self._flush_timeout_sec = flush_timeout_sec
+
+        self._cond = threading.Condition(threading.Lock())
+        self._pending: "collections.OrderedDict[Hashable, _Report]" = (
+            collections.OrderedDict()
+        )
+        self._in_flight: Set[Hashable] = set()
+        self._workers = 0
+        self._idle = 0
+        self._closing = False
+        self._registered = False
+
+    def submit(self, key: Hashable, func: Callable[..., Any], /, **kwargs) -> None:
+        """Queues ``func(**kwargs)`` to be called in the background.
+
+        :param key: Identifies what the report is about. An unsent report
+            with the same key is replaced by this one.
+        :param func: The API call that sends the report.
+        """
+        with self._cond:
+            self._pending[key] = (func, kwargs)
+            self._pending.move_to_end(key)
+            if not self._registered:
+                atexit.register(self._shutdown)
+                self._registered = True
+            if len(self._pending) > self._idle and self._workers < self._max_workers:
+                self._workers += 1
+                thread = threading.Thread(
+                    name=f"tiledb-status-reporter-{self._workers}",
+                    target=self._run,
+                    daemon=True,
+                )
+                thread.start()
+            else:
+                self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all submitted reports have been sent (or dropped).
+
+        :param timeout: The maximum number of seconds to wait, defaults to
+            waiting forever.
+        :return: True if everything was sent; False if the wait timed out.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+
+    def _next(self) -> Optional[Tuple[Hashable, _Report]]:
+        """Takes the oldest report that is not in flight. Must hold the lock."""
+        for key in self._pending:
+            if key not in self._in_flight:
+                self._in_flight.add(key)
+                return key, self._pending.pop(key)
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._idle += 1
+                item = self._next()
+                while item is None:
+                    if not self._cond.wait(_IDLE_SECS) and not self._pending:
+                        self._idle -= 1
+                        self._workers -= 1
+                        return
+                    item = self._next()
+                self._idle -= 1
+            key, (func, kwargs) = item
+            try:
+                self._send(key, func, kwargs)
+            finally:
+                with self._cond:
+                    self._in_flight.discard(key)
+                    self._cond.notify_all()
+
+    def _send(
+        self, key: Hashable, func: Callable[..., Any], kwargs: Dict[str, Any]
+    ) -> None:
+        delay = self._backoff_sec
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                func(**kwargs)
+                return
+            except Exception as exc:
+                if attempt == self._max_attempts or not _is_transient(exc):
+                    logger.debug("Dropping status report %r", key, exc_info=True)
+                    return
+            time.sleep(0 if self._closing else delay)
+            delay *= 2
+            with self._cond:
+                if key in self._pending:
+                    # A newer report will be sent in place of this one.
+                    return
+
+    def _shutdown(self) -> None:
+        self._closing = True
+        if not self.flush(self._flush_timeout_sec):
+            with self._cond:
+                unsent = len(self._pending) + len(self._in_flight)
+            logger.warning("Exiting with %d status reports unsent", unsent)
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Whether the failure of a request is worth retrying."""
+    if isinstance(exc, urllib3.exceptions.HTTPError):
+        return True
+    status = getattr(exc, "status", None)
+    # The generated client reports connection and SSL errors as status 0.
+    return isinstance(status, int) and (status in (0, 429) or status >= 500)
@@ -0,0 +1,324 @@
+"""Cached plans for converting generated REST API models to and from JSON.
+
+The generated ``ApiClient`` interprets type strings like ``list[ArrayInfo]``
+and reflects over each model's ``openapi_types`` for every value it converts.
+Here, that work happens once per type: :func:`decoder` and :func:`encoder`
+build a function for a type the first time it is seen and cache it, so large
+responses (e.g. listings and task graph logs with thousands of entries) only
+pay for the conversion itself.
+
+These are used by ``tiledb.cloud.rest_api.ApiClient``, and therefore by the
+clients of both the v1 and v2 APIs.
+"""
+
+import datetime
+import inspect
+import re
+import threading
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from dateutil import tz
+from dateutil.parser import parse
+
+from tiledb.cloud._common import json_safe
+from tiledb.cloud.rest_api.configuration import Configuration
+from tiledb.cloud.rest_api.exceptions import ApiException
+
+Codec = Callable[[Any], Any]
+
+PRIMITIVE_TYPES = (float, bool, bytes, str, int)
+NATIVE_TYPES_MAPPING = {
+    "int": int,
+    "long": int,
+    "float": float,
+    "str": str,
+    "bool": bool,
+    "date": datetime.date,
+    "datetime": datetime.datetime,
+    "object": object,
+}
+
+_LIST_RE = re.compile(r"list\[(.*)\]")
+_DICT_RE = re.compile(r"dict\(([^,]*), (.*)\)")
+
+_lock = threading.Lock()
+_decoders: Dict[Tuple[ModuleType, Union[str, type]], Codec] = {}
+_encoders: Dict[type, Codec] = {}
+
+_model_config: Optional[Configuration] = None
+"""The configuration given to every decoded model.
+
+Models create a new default ``Configuration`` if they are not given one,
+which is by far the most expensive part of creating them. They only read
+``client_side_validation`` from it, so they can all share a default one.
+"""
+
+
+def decoder(models: ModuleType, klass: Union[str, type]) -> Codec:
+    """Returns a function that converts parsed JSON into ``klass``.
+
+    :param models: The module containing the model classes named by ``klass``.
+    :param klass: A type string (e.g. ``list[ArrayInfo]``), or a class.
+    """
+    key = (models, klass)
+    try:
+        return _decoders[key]
+    except KeyError:
+        pass
+    with _lock:
+        if key not in _decoders:
+            # Models are registered before their fields are resolved, so
+            # recursive types find their own (lazily completed) decoder.
+            _decoders[key] = _build_decoder(models, klass)
+        return _decoders[key]
+
+
+def decode(models: ModuleType, data: Any, klass: Union[str, type]) -> Any:
+    """Converts parsed JSON into ``klass``. Equivalent to the generated code."""
+    return decoder(models, klass)(data)
+
+
+def _build_decoder(models: ModuleType, klass: Union[str, type]) -> Codec:
+    if isinstance(klass, str):
+        if klass.startswith("list["):
+            return _ListDecoder(models, _LIST_RE.match(klass).group(1))
+        if klass.startswith("dict("):
+            return _DictDecoder(models, _DICT_RE.match(klass).group(2))
+        try:
+            klass = NATIVE_TYPES_MAPPING[klass]
+        except KeyError:
+            klass = getattr(models, klass)
+
+    if klass in PRIMITIVE_TYPES:
+        return _primitive_decoder(klass)
+    if klass is object:
+        return _identity
+    if klass is datetime.date:
+        return _decode_date
+    if klass is datetime.datetime:
+        return _decode_datetime
+    return _ModelDecoder(models, klass)
+
+
+class _ListDecoder:
+    def __init__(self, models: ModuleType, item_type: str):
+        self._models = models
+        self._item_type = item_type
+        self._item: Optional[Codec] = None
+
+    def __call__(self, data: Any) -> Any:
+        if data is None:
+            return None
+        item = self._item
+        if item is None:
+            item = self._item = decoder(self._models, self._item_type)
+        return [item(value) for value in data]
+
+
+class _DictDecoder(_ListDecoder):
+    def __call__(self, data: Any) -> Any:
+        if data is None:
+            return None
+        item = self._item
+        if item is None:
+            item = self._item = decoder(self._models, self._item_type)
+        return {key: item(value) for key, value in data.items()}
+
+
+class _ModelDecoder:
+    def __init__(self, models: ModuleType, klass: type):
+        self._models = models
+        self._klass = klass
+        self._discriminated = bool(
+            hasattr(klass, "get_real_child_model")
+            and klass.discriminator_value_class_map
+        )
+        self._fields: Optional[Tuple[Tuple[str, str, Codec], ...]] = None
+        self._config: Dict[str, Any] = {}
+        try:
+            params = inspect.signature(klass).parameters
+        except (TypeError, ValueError):
+            params = {}
+        if "local_vars_configuration" in params:
+            self._config["local_vars_configuration"] = _get_model_config()
+
+    def _resolve_fields(self) -> Tuple[Tuple[str, str, Codec], ...]:
+        klass = self._klass
+        fields = tuple(
+            (attr, klass.attribute_map[attr], decoder(self._models, attr_type))
+            for attr, attr_type in klass.openapi_types.items()
+        )
+        self._fields = fields
+        return fields
+
+    def __call__(self, data: Any) -> Any:
+        if data is None:
+            return None
+        klass = self._klass
+        if not klass.openapi_types and not self._discriminated:
+            return data
+
+        kwargs = dict(self._config)
+        if klass.openapi_types is not None and isinstance(data, (list, dict)):
+            fields = self._fields
+            if fields is None:
+                fields = self._resolve_fields()
+            for attr, key, decode_field in fields:
+                if key in data:
+                    kwargs[attr] = decode_field(data[key])
+
+        instance = klass(**kwargs)
+
+        if self._discriminated:
+            klass_name = instance.get_real_child_model(data)
+            if klass_name:
+                instance = decode(self._models, data, klass_name)
+        return instance
+
+
+def _get_model_config() -> Configuration:
+    global _model_config
+    if _model_config is None:
+        _model_config = Configuration()
+    return _model_config
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _primitive_decoder(klass: type) -> Codec:
+    def decode_primitive(data: Any) -> Any:
+        if data is None:
+            return None
+        try:
+            return klass(data)
+        except UnicodeEncodeError:
+            return str(data)
+        except TypeError:
+            return data
+
+    return decode_primitive
+
+
+def _decode_date(string: Any) -> Any:
+    if string is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(string)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return parse(string).date()
+    except ValueError:
+        raise ApiException(
+            status=0, reason="Failed to parse `{0}` as date object".format(string)
+        )
+
+
+def _decode_datetime(string: Any) -> Any:
+    if string is None:
+        return None
+    try:
+        return _from_isoformat(string)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return parse(string)
+    except ValueError:
+        raise ApiException(
+            status=0,
+            reason=("Failed to parse `{0}` as datetime object".format(string)),
+        )
+
+
+def _from_isoformat(string: str) -> datetime.datetime:
+    """Parses an ISO 8601 timestamp the way ``dateutil`` would, but faster.
+
+    ``dateutil.parser.parse`` is general but slow, and nearly every timestamp
+    the server sends is ISO 8601. Offsets use ``dateutil``'s time zone classes
+    so results compare and print the same; the only difference is that UTC
+    is always ``tzutc()``, where ``dateutil`` uses ``tzlocal()`` if the local
+    time zone is also named UTC.
+    """
+    result = datetime.datetime.fromisoformat(string)
+    offset = result.utcoffset()
+    if offset is None:
+        return result
+    if not offset:
+        return result.replace(tzinfo=tz.tzutc())
+    return result.replace(tzinfo=tz.tzoffset(None, offset))
+
+
+def encode(obj: Any) -> Any:
+    """Converts ``obj`` into JSON-serializable values.
+
+    Equivalent to the generated ``ApiClient.sanitize_for_serialization``:
+    models become dicts of their non-None attributes, dates become ISO 8601
+    strings, and containers are converted recursively.
+    """
+    if obj is None:
+        return None
+    return encoder(type(obj))(obj)
+
+
+def encoder(cls: type) -> Codec:
+    """Returns the function :func:`encode` uses for values of type ``cls``."""
+    try:
+        return _encoders[cls]
+    except KeyError:
+        pass
+    enc = _build_encoder(cls)
+    with _lock:
+        return _encoders.setdefault(cls, enc)
+
+
+def _build_encoder(cls: type) -> Codec:
+    if issubclass(cls, json_safe.Value):
+        return _encode_json_safe
+    if issubclass(cls, PRIMITIVE_TYPES):
+        return _identity
+    if issubclass(cls, list):
+        return _encode_list
+    if issubclass(cls, tuple):
+        return _encode_tuple
+    if issubclass(cls, (datetime.datetime, datetime.date)):
+        return _encode_date
+    if issubclass(cls, dict):
+        return _encode_dict
+    return _model_encoder(cls)
+
+
+def _encode_json_safe(obj: json_safe.Value) -> Any:
+    return obj.value
+
+
+def _encode_list(obj: list) -> list:
+    return [encode(value) for value in obj]
+
+
+def _encode_tuple(obj: tuple) -> tuple:
+    return tuple(encode(value) for value in obj)
+
+
+def _encode_date(obj: datetime.date) -> str:
+    return obj.isoformat()
+
+
+def _encode_dict(obj: dict) -> dict:
+    return {key: encode(value) for key, value in obj.items()}
+
+
+def _model_encoder(cls: type) -> Codec:
+    fields = tuple((attr, cls.attribute_map[attr]) for attr in cls.openapi_types)
+
+    def encode_model(obj: Any) -> dict:
+        result = {}
+        for attr, key in fields:
+            value = getattr(obj, attr)
+            if value is not None:
+                result[key] = encode(value)
+        return result
+
+    return encode_model
@@ -0,0 +1,261 @@
+"""Per-node lifecycle timestamps and critical-path reports for task graphs.
+
+Nodes record the wall-clock time of each lifecycle event in a `NodeTimes`.
+Events that happen deep inside a request (the server response arriving, the
+result body being downloaded) are recorded through `mark`, which writes to the
+`NodeTimes` bound to the current thread by `record`.
+"""
+
+import contextvars
+import functools
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+import attrs
+
+_T = TypeVar("_T")
+
+EVENTS = ("queued", "started", "submitted", "accepted", "downloaded", "completed")
+"""Lifecycle events of a node, in the order they happen."""
+
+_PHASE_ORDER = ("wait", "queue", "prepare", "server", "download", "run", "finish")
+"""Phases in the order they happen to a node."""
+
+CLIENT_PHASES = frozenset(("queue", "prepare", "finish"))
+"""Phases spent in the client (the driver) rather than the network or server."""
+
+
+@attrs.define
+class NodeTimes:
+    """Wall-clock times (seconds since the epoch) of a node's lifecycle events.
+
+    Events that did not happen, e.g. the server events of a local node, are None.
+    """
+
+    queued: Optional[float] = None
+    """The node became ready to run and was handed to the client executor."""
+    started: Optional[float] = None
+    """The client started executing the node."""
+    submitted: Optional[float] = None
+    """The request was sent to the server, or the local function was called."""
+    accepted: Optional[float] = None
+    """The server responded to the request with the task ID."""
+    downloaded: Optional[float] = None
+    """The result body was downloaded from the server."""
+    completed: Optional[float] = None
+    """The node finished, successfully or not."""
+
+    def mark(self, event: str, when: Optional[float] = None) -> None:
+        """Records the time of an event, now by default."""
+        setattr(self, event, time.time() if when is None else when)
+
+    def phases(self, ready: Optional[float] = None) -> List[Tuple[str, float, float]]:
+        """Splits the lifetime of the node into phases.
+
+        Each phase ends at an event and starts at the previous recorded event.
+
+        :param ready: The time the node's last parent completed, if any.
+            The time from then until the first recorded event is ``wait``:
+            scheduling by the client for realtime graphs, and by the server
+            for batch graphs.
+        :return: A list of ``(phase, start, end)`` tuples, in order.
+        """
+        names = {
+            "started": "queue",
+            "submitted": "prepare",
+            "accepted": "server",
+            "downloaded": "download",
+            "completed": "finish" if self.accepted is not None else "run",
+        }
+        result: List[Tuple[str, float, float]] = []
+        last = None
+        for event in EVENTS:
+            when = getattr(self, event)
+            if when is None:
+                continue
+            if last is not None:
+                result.append((names[event], last, when))
+            elif ready is not None and when > ready:
+                result.append(("wait", ready, when))
+            last = when
+        return result
+
+
+_current: "contextvars.ContextVar[Optional[NodeTimes]]" = contextvars.ContextVar(
+    "tiledb_cloud_node_times", default=None
+)
+
+
+def mark(event: str) -> None:
+    """Records an event on the `NodeTimes` being recorded on this thread."""
+    times = _current.get()
+    if times is not None:
+        times.mark(event)
+
+
+def record(times: NodeTimes, func: Callable[..., _T]) -> Callable[..., _T]:
+    """Wraps a function to record its submission and completion in ``times``.
+
+    While the function runs, `mark` records events into ``times``.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> _T:
+        times.mark("submitted")
+        token = _current.set(times)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+            times.mark("completed")
+
+    return wrapper
+
+
+@attrs.define(frozen=True)
+class NodeTiming:
+    """The timestamps of one node, with what is needed to place it in a graph."""
+
+    id: str
+    """The client-side ID of the node."""
+    name: str
+    """The display name of the node."""
+    parents: Tuple[str, ...]
+    """The IDs of the node's parents."""
+    times: NodeTimes
+    """The node's lifecycle timestamps."""
+
+
+@attrs.define(frozen=True)
+class TimingReport:
+    """Where the time of a task graph execution went."""
+
+    nodes: Tuple[NodeTiming, ...]
+    """The timing of every node that ran."""
+    critical_path: Tuple[NodeTiming, ...]
+    """The chain of nodes, each waiting on the previous one, ending with the
+    node that completed last."""
+    phases: Dict[str, float]
+    """The seconds spent in each phase, summed over all nodes."""
+    critical_phases: Dict[str, float]
+    """The seconds spent in each phase along the critical path."""
+    wall_sec: float
+    """The seconds from the first node queued to the last node completed."""
+
+    @classmethod
+    def build(cls, nodes: Iterable[NodeTiming]) -> "TimingReport":
+        nodes = tuple(n for n in nodes if n.times.completed is not None)
+        by_id = {n.id: n for n in nodes}
+        ready = _ready_times(nodes)
+
+        phases: Dict[str, float] = {}
+        for node in nodes:
+            for phase, start, end in node.times.phases(ready[node.id]):
+                phases[phase] = phases.get(phase, 0.0) + end - start
+
+        path: List[NodeTiming] = []
+        current = max(nodes, key=lambda n: n.times.completed, default=None)
+        while current is not None:
+            path.append(current)
+            parents = [by_id[p] for p in current.parents if p in by_id]
+            current = max(parents, key=lambda n: n.times.completed, default=None)
+        path.reverse()
+
+        critical_phases: Dict[str, float] = {}
+        for node in path:
+            for phase, start, end in node.times.phases(ready[node.id]):
+                critical_phases[phase] = critical_phases.get(phase, 0.0) + end - start
+
+        starts = [n.times.queued or n.times.started for n in nodes]
+        starts = [s for s in starts if s is not None]
+        wall_sec = (
+            max(n.times.completed for n in nodes) - min(starts)  # type: ignore
+            if starts
+            else 0.0
+        )
+        return cls(
+            nodes=nodes,
+            critical_path=tuple(path),
+            phases=phases,
+            critical_phases=critical_phases,
+            wall_sec=wall_sec,
+        )
+
+    @property
+    def critical_path_sec(self) -> float:
+        """The seconds spent along the critical path."""
+        return sum(self.critical_phases.values())
+
+    @property
+    def client_overhead_sec(self) -> float:
+        """The seconds the critical path spent in the client."""
+        return sum(
+            sec for phase, sec in self.critical_phases.items() if phase in CLIENT_PHASES
+        )
+
+    def summary(self) -> str:
+        """A human-readable summary of the report."""
+        lines = [
+            f"{len(self.nodes)} nodes in {self.wall_sec:.3f}s;"
+            f" critical path of {len(self.critical_path)} nodes"
+            f" ({self.critical_path_sec:.3f}s,"
+            f" {self.client_overhead_sec:.3f}s in the client)",
+        ]
+        for phase in _PHASE_ORDER:
+            if phase in self.phases:
+                lines.append(
+                    f"  {phase}: {self.critical_phases.get(phase, 0.0):.3f}s"
+                    f" on critical path, {self.phases[phase]:.3f}s total"
+                )
+        lines.append(
+            "  critical path: " + " -> ".join(n.name for n in self.critical_path)
+        )
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Exports the report in the Chrome trace event format.
+
+        Write the result with ``json.dump`` and load it in ``chrome://tracing``
+        or Perfetto. Each node is a row, with one slice per phase.
+        """
+        ready = _ready_times(self.nodes)
+        phases = {n.id: n.times.phases(ready[n.id]) for n in self.nodes}
+        origin = min((p[0][1] for p in phases.values() if p), default=0.0)
+        critical = {n.id for n in self.critical_path}
+        events: List[Dict[str, Any]] = []
+        for tid, node in enumerate(self.nodes, 1):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": node.name},
+                }
+            )
+            for phase, start, end in phases[node.id]:
+                events.append(
+                    {
+                        "name": phase,
+                        "cat": "critical" if node.id in critical else "node",
+                        "ph": "X",
+                        "pid": 1,
+                        "tid": tid,
+                        "ts": (start - origin) * 1e6,
+                        "dur": (end - start) * 1e6,
+                        "args": {"node": node.name, "id": node.id},
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _ready_times(nodes: Iterable[NodeTiming]) -> Dict[str, Optional[float]]:
+    """Finds when the last parent of each node completed."""
+    completed = {n.id: n.times.completed for n in nodes}
+    return {
+        n.id: max(
+            (completed[p] for p in n.parents if p in completed),  # type: ignore
+            default=None,
+        )
+        for n in nodes
+    }
@@ -145,7 +145,8 @@ class AsyncResult(Generic[_T]):
             pass
         else:
             with self._id_lock:
-                self._task_id = res.task_id
+                # Results of local execution have no task.
+                self._task_id = getattr(res, "task_id", None)
 
 
 def extract_task_id(
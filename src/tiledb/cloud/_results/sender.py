@@ -6,6 +6,7 @@ import urllib3
 from tiledb.cloud import client
 from tiledb.cloud import rest_api
 from tiledb.cloud import tiledb_cloud_error as tce
+from tiledb.cloud._common import timing
 from tiledb.cloud._common import utils
 from tiledb.cloud._results import decoders
 from tiledb.cloud._results import results
@@ -51,6 +52,7 @@ def send_udf_call(
         that value.
     :return: A response containing the parsed result and metadata about it.
     """
+    timing.mark("submitted")
     try:
         http_response = api_func(_preload_content=False, **api_kwargs)
     except rest_api.ApiException as exc:
@@ -59,12 +61,17 @@ def send_udf_call(
         raise tce.maybe_wrap(exc) from None
 
     try:
+        timing.mark("accepted")
         task_id = results.extract_task_id(http_response)
         if id_callback:
             id_callback(task_id)
 
+        body = None
+        if results_downloaded:
+            body = http_response.data
+            timing.mark("downloaded")
         return results.RemoteResult(
-            body=http_response.data if results_downloaded else None,
+            body=body,
             decoder=decoder,
             task_id=task_id,
             results_stored=results_stored,
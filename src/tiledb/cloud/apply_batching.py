@@ -0,0 +1,282 @@
+"""Batching of many asynchronous array UDF requests into fewer requests.
+
+Every :func:`tiledb.cloud.array.apply_async` call is normally its own
+request, which opens its own array on the server. With apply batching
+enabled, calls of the same function on the same array that are made within
+a short window are held back and sent together as one multi-array UDF
+request, with one entry (and its own ranges) per call. On the server, the
+function is run on each entry's data in turn, and the results are split
+back out to the calls' own futures::
+
+    from tiledb.cloud import apply_batching
+    from tiledb.cloud import client
+
+    client.client.apply_batching = apply_batching.ApplyBatching()
+
+Only calls whose results would be the same are batched: Python functions
+(not registered UDFs) with NATIVE results, whose results are not stored and
+whose arguments have no stored parameters, made outside task graphs. Calls
+are grouped by array URI, function (by identity, so a lambda defined anew
+for every call is never batched), and the options that apply to the whole
+request (namespace, image, resource class, timeout...).
+Other calls are sent on their own, as usual.
+
+If the function fails for one call, only that call fails; if the request
+fails, all of its calls do.
+"""
+
+import logging
+import threading
+import uuid
+from concurrent import futures
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import attrs
+
+from tiledb.cloud import array
+from tiledb.cloud import client
+from tiledb.cloud import tiledb_cloud_error as tce
+from tiledb.cloud._results import results
+from tiledb.cloud.rest_api import models
+
+logger = logging.getLogger(__name__)
+
+BATCH_RESULT_FORMATS = frozenset((models.ResultFormat.NATIVE,))
+"""Result formats whose results are the same when returned in a batch.
+
+ARROW results are converted to a table by the server, which cannot be done
+for the results of the calls of a batch separately.
+"""
+
+_REQUEST_OPTIONS = (
+    "namespace",
+    "image_name",
+    "http_compressor",
+    "task_name",
+    "timeout",
+    "resource_class",
+)
+"""Arguments of :func:`array.apply_base` that apply to a whole request.
+
+Calls are only batched with calls that have the same values of these, which
+are passed on to :func:`array.exec_multi_array_udf_base`.
+"""
+
+
+@attrs.define(frozen=True)
+class BatchedResult(results.Result[Any]):
+    """The result of one call of a batch."""
+
+    it: Any
+    task_id: Optional[uuid.UUID]
+    """The ID of the task that ran the whole batch."""
+
+    def get(self) -> Any:
+        return self.it
+
+
+class ApplyBatching:
+    """Groups asynchronous array UDF calls and sends them together.
+
+    :param window_sec: How long to hold back a call, waiting for others to
+        send it with, defaults to 0.05.
+    :param max_batch: The most calls to send in one request, defaults to
+        64. A group with more calls is sent as several requests.
+    """
+
+    def __init__(self, window_sec: float = 0.05, max_batch: int = 64):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1, not {max_batch}")
+        self.window_sec = window_sec
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, _Batch] = {}
+        self.calls = 0
+        """Calls that were batched."""
+        self.requests = 0
+        """Requests that batched calls were sent in."""
+
+    def submit(self, call: Dict[str, Any]) -> "Optional[futures.Future[Any]]":
+        """Adds a call to a batch, if it can be batched.
+
+        :param call: The arguments of :func:`array.apply_base`, by name
+            (with the arguments of the function itself under ``kwargs``).
+        :return: A future of the call's :class:`results.Result`, or None if
+            the call cannot be batched and should be sent on its own.
+        """
+        key = _batch_key(call)
+        if key is None:
+            return None
+        try:
+            ranges = array.parse_ranges(call["ranges"])
+        except ValueError:
+            # Sent on its own, the call fails as usual.
+            return None
+
+        future: "futures.Future[Any]" = futures.Future()
+        full = None
+        with self._lock:
+            self.calls += 1
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(call)
+                timer = threading.Timer(self.window_sec, self._flush, (key, batch))
+                timer.daemon = True
+                batch.timer = timer
+                timer.start()
+            batch.calls.append(
+                _Call(ranges, call["attrs"], call["layout"], call["kwargs"], future)
+            )
+            if len(batch.calls) >= self.max_batch:
+                full = self._pending.pop(key)
+        if full is not None:
+            full.timer.cancel()
+            self._send(full)
+        return future
+
+    def flush(self) -> None:
+        """Sends all the held-back calls now."""
+        with self._lock:
+            batches = tuple(self._pending.values())
+            self._pending.clear()
+        for batch in batches:
+            batch.timer.cancel()
+            self._send(batch)
+
+    def _flush(self, key: Hashable, batch: "_Batch") -> None:
+        with self._lock:
+            if self._pending.get(key) is not batch:
+                # Already sent because it was full, or by flush().
+                return
+            del self._pending[key]
+        self._send(batch)
+
+    def _send(self, batch: "_Batch") -> None:
+        with self._lock:
+            self.requests += 1
+        logger.debug(
+            "apply on %s: sending %d calls in one request",
+            batch.call["uri"],
+            len(batch.calls),
+        )
+        client.client._pool_submit(_run, batch)
+
+
+@attrs.define
+class _Call:
+    """One held-back call: what differs between the calls of a batch."""
+
+    ranges: Any
+    attrs: Any
+    layout: Optional[str]
+    kwargs: Dict[str, Any]
+    future: "futures.Future[Any]"
+
+
+@attrs.define
+class _Batch:
+    """Calls that are sent together."""
+
+    call: Dict[str, Any]
+    """The arguments of the first call, whose options apply to all."""
+    calls: List[_Call] = attrs.field(factory=list)
+    timer: Optional[threading.Timer] = None
+
+
+def _batch_key(call: Dict[str, Any]) -> Optional[Hashable]:
+    """The key that calls batched together share, or None if not batchable."""
+    func = call["func"]
+    if (
+        not callable(func)
+        or call["name"]
+        or call["result_format"] not in BATCH_RESULT_FORMATS
+        or call["result_format_version"]
+        or call["store_results"]
+        or call["stored_param_uuids"]
+        or not call["_download_results"]
+        or call["_server_graph_uuid"]
+        or call["_client_node_uuid"]
+    ):
+        return None
+    key = (call["uri"], func, tuple(call[opt] for opt in _REQUEST_OPTIONS))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _run(batch: "_Batch") -> None:
+    """Sends a batch and completes the futures of its calls."""
+    calls = [one for one in batch.calls if one.future.set_running_or_notify_cancel()]
+    if not calls:
+        return
+    if len(calls) == 1:
+        (one,) = calls
+        try:
+            one.future.set_result(_apply_one(batch.call, one))
+        except Exception as exc:
+            one.future.set_exception(exc)
+        return
+    try:
+        result = _apply_batch(batch.call, calls)
+        outcomes = result.get()
+    except Exception as exc:
+        for one in calls:
+            one.future.set_exception(exc)
+        return
+    task_id = getattr(result, "task_id", None)
+    for one, (ok, value) in zip(calls, outcomes):
+        if ok:
+            one.future.set_result(BatchedResult(value, task_id))
+        else:
+            one.future.set_exception(
+                tce.TileDBCloudError(
+                    f"apply on {batch.call['uri']} failed in a batch:\n{value}"
+                )
+            )
+
+
+def _apply_one(call: Dict[str, Any], one: _Call) -> results.Result:
+    """Sends a batch of one call exactly as it would be sent on its own."""
+    kwargs = dict(call)
+    kwargs.update(kwargs.pop("kwargs"))
+    kwargs.update(ranges=one.ranges, attrs=one.attrs, layout=one.layout)
+    return array.apply_base(**kwargs)
+
+
+def _apply_batch(call: Dict[str, Any], calls: List[_Call]) -> results.Result:
+    array_list = array.ArrayList()
+    for one in calls:
+        array_list.add(call["uri"], one.ranges, one.attrs, one.layout)
+    return array.exec_multi_array_udf_base(
+        _batch_func(call["func"], [one.kwargs for one in calls]),
+        array_list,
+        # The source would be that of the wrapper, not of the function.
+        include_source_lines=False,
+        result_format=models.ResultFormat.NATIVE,
+        **{opt: call[opt] for opt in _REQUEST_OPTIONS},
+    )
+
+
+def _batch_func(
+    func: Callable[..., Any], all_kwargs: List[Dict[str, Any]]
+) -> Callable[[List[Any]], List[Tuple[bool, Any]]]:
+    """Wraps ``func`` to run it on the data of each entry of the request.
+
+    The wrapper is defined here, rather than at module level, so that it is
+    pickled by value: the UDF image need not have this module.
+    """
+
+    def apply_batch(data: List[Any]) -> List[Tuple[bool, Any]]:
+        import traceback
+
+        outcomes = []
+        for one, kwargs in zip(data, all_kwargs):
+            try:
+                outcomes.append((True, func(one, **kwargs)))
+            except Exception:
+                outcomes.append((False, traceback.format_exc()))
+        return outcomes
+
+    return apply_batch
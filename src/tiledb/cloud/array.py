@@ -1,5 +1,6 @@
 """Register, search, and manage arrays with TileDB."""
 
+import inspect
 import posixpath
 import urllib.parse
 import uuid
@@ -9,6 +10,7 @@ from typing import Any, Callable, Iterable, List, Optional, Sequence, Union
 import numpy
 
 from . import client
+from . import local_execution
 from . import rest_api
 from . import tiledb_cloud_error
 from . import udf
@@ -350,18 +352,31 @@ def array_activity(uri, async_req=False):
         raise tiledb_cloud_error.maybe_wrap(exc) from None
 
 
-def parse_ranges(ranges):
+def parse_ranges(ranges, *, coalesce: bool = False):
     """
     Takes a list of the following objects per dimension:
 
     - scalar index
     - (start,end) tuple
     - list of either of the above types
-
-    :param ranges: list of (scalar, tuple, list)
-    :param builder: function taking arguments (dim_idx, start, end)
-    :return:
+    - ``numpy.ndarray`` of flattened ``start, end`` pairs, or of shape (N, 2)
+
+    Lists of only numbers or datetimes, and arrays, are converted in bulk
+    with NumPy, which is much faster for large numbers of ranges (e.g. point
+    queries). Lists that NumPy cannot hold exactly (e.g. integers mixed with
+    floats) are converted one range at a time. Datetimes and timedeltas are
+    converted to integers.
+
+    :param ranges: list of (scalar, tuple, list, ndarray), or ranges already
+        returned by this function (which are returned as-is)
+    :param coalesce: If true, sorts the ranges of each dimension and merges
+        overlapping ranges (and, for integer dimensions, adjacent ones).
+        This makes requests smaller, but the function receives each cell
+        only once and in domain order, not once per range as requested.
+    :return: the list of flattened ``start, end`` pairs of each dimension
     """
+    if isinstance(ranges, json_safe.Value):
+        return ranges
 
     def make_range(dim_range):
         if isinstance(dim_range, (int, float, numpy.datetime64, numpy.timedelta64)):
@@ -389,32 +404,129 @@ def parse_ranges(ranges):
         if type(end) == numpy.datetime64 or type(end) == numpy.timedelta64:
             end = end.astype("int64").item()
 
+        if isinstance(start, (int, float)) and isinstance(end, (int, float)):
+            if start > end:
+                raise ValueError(f"Range start {start} is greater than its end {end}")
+
         return [start, end]
 
     result = list()
     for dim_idx, dim_range in enumerate(ranges):
-        dim_list = []
-        if isinstance(dim_range, numpy.ndarray):
+        pairs = _range_pairs(dim_range)
+        if pairs is not None:
+            dim_list = None
+        elif isinstance(dim_range, numpy.ndarray):
             dim_list = dim_range.tolist()
         elif isinstance(
             dim_range, (int, float, tuple, slice, numpy.datetime64, numpy.timedelta64)
         ):
             dim_list = make_range(dim_range)
         elif isinstance(dim_range, list):
+            dim_list = []
             for r in dim_range:
                 dim_list.extend(make_range(r))
         elif dim_range is None:
-            pass
+            dim_list = []
         else:
             raise ValueError(
                 "Unknown subarray/index type! (type: '{}', "
                 ", idx: '{}', value: '{}')".format(type(dim_range), dim_idx, dim_range)
             )
+        if coalesce:
+            if pairs is None:
+                flat = _exact_array(dim_list)
+                if flat is not None:
+                    pairs = _range_pairs(flat)
+            if pairs is not None:
+                pairs = _coalesce_ranges(pairs)
+        if pairs is not None:
+            dim_list = pairs.ravel().tolist()
         result.append(dim_list)
 
     return json_safe.Value(result)
 
 
+_RANGE_KINDS = frozenset("iufmM")
+"""NumPy dtype kinds of the ranges that are converted in bulk."""
+
+
+def _range_pairs(dim_range: Any) -> Optional[numpy.ndarray]:
+    """Converts the ranges of a dimension into an (N, 2) array, if possible.
+
+    This is possible for arrays and for lists of only numbers or only pairs
+    of numbers (including datetimes and timedeltas). Otherwise, returns None.
+    """
+    if isinstance(dim_range, numpy.ndarray):
+        pairs = dim_range
+        if pairs.ndim == 1 and pairs.dtype.kind in _RANGE_KINDS:
+            if len(pairs) % 2:
+                raise ValueError(
+                    "A flattened array of ranges must have an even length,"
+                    f" not {len(pairs)}"
+                )
+            pairs = pairs.reshape(-1, 2)
+    elif isinstance(dim_range, list) and dim_range:
+        pairs = _exact_array(dim_range)
+        if pairs is None:
+            return None
+        if pairs.ndim == 1:
+            # Points.
+            pairs = numpy.repeat(pairs, 2).reshape(-1, 2)
+    else:
+        return None
+    if pairs.ndim != 2 or pairs.shape[1] != 2 or pairs.dtype.kind not in _RANGE_KINDS:
+        return None
+    if pairs.dtype.kind in "mM":
+        pairs = pairs.astype("int64")
+    bad = numpy.flatnonzero(pairs[:, 0] > pairs[:, 1])
+    if len(bad):
+        start, end = pairs[bad[0]].tolist()
+        raise ValueError(f"Range start {start} is greater than its end {end}")
+    return pairs
+
+
+def _exact_array(values: list) -> Optional[numpy.ndarray]:
+    """Converts a list into an array, if it holds the values exactly.
+
+    NumPy converts a mix of integers and floats (or of negative integers and
+    integers beyond int64) to floats, losing their type and maybe precision.
+    For such lists, and for those NumPy cannot convert, returns None.
+    """
+    try:
+        arr = numpy.asarray(values)
+    except (ValueError, OverflowError):
+        # A mix of scalars and pairs, or integers too large for NumPy.
+        return None
+    if arr.dtype.kind == "f" and _has_ints(values):
+        return None
+    return arr
+
+
+def _has_ints(values: Iterable[Any]) -> bool:
+    """Whether a (nested) list of numbers contains any integers."""
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            if _has_ints(value):
+                return True
+        elif isinstance(value, (int, numpy.integer)):
+            return True
+    return False
+
+
+def _coalesce_ranges(pairs: numpy.ndarray) -> numpy.ndarray:
+    """Sorts ranges and merges those that overlap or (for integers) touch."""
+    if len(pairs) < 2:
+        return pairs
+    pairs = pairs[numpy.argsort(pairs[:, 0], kind="stable")]
+    ends = numpy.maximum.accumulate(pairs[:, 1])
+    gap = 1 if pairs.dtype.kind in "iu" else 0
+    new_range = numpy.ones(len(pairs), dtype=bool)
+    new_range[1:] = pairs[1:, 0] > ends[:-1] + gap
+    firsts = numpy.flatnonzero(new_range)
+    lasts = numpy.append(firsts[1:] - 1, len(pairs) - 1)
+    return numpy.column_stack((pairs[firsts, 0], ends[lasts]))
+
+
 def apply_base(
     uri: str,
     func: Union[str, Callable, None] = None,
@@ -438,9 +550,12 @@ def apply_base(
     _server_graph_uuid: Optional[uuid.UUID] = None,
     _client_node_uuid: Optional[uuid.UUID] = None,
     **kwargs: Any,
-) -> results.RemoteResult:
+) -> results.Result:
     """Apply a user-defined function to an array, and return data and metadata.
 
+    If local execution is enabled on the client (see
+    :mod:`tiledb.cloud.local_execution`), small requests run on the client.
+
     :param uri: The ``tiledb://...`` URI of the array to apply the function to.
     :param func: The function to run. This can be either a callable function,
         or the name of a registered user-defined function
@@ -488,8 +603,6 @@ def apply_base(
     if result_format_version:
         warnings.warn(DeprecationWarning("result_format_version is unused."))
 
-    api_instance = client.build(rest_api.UdfApi)
-
     if name:
         warnings.warn(
             DeprecationWarning(
@@ -499,6 +612,22 @@ def apply_base(
         )
     user_func = _pick_func(func=func, name=name)
 
+    local = client.client.local_execution
+    if (
+        local is not None
+        and callable(user_func)
+        and result_format in local_execution.LOCAL_RESULT_FORMATS
+        and not store_results
+        and not stored_param_uuids
+    ):
+        result = local.apply(
+            uri, user_func, parse_ranges(ranges).value, attrs, layout, kwargs
+        )
+        if result is not None:
+            return result
+
+    api_instance = client.build(rest_api.UdfApi)
+
     array_list = ArrayList()
     array_list.add(
         uri=uri,
@@ -585,7 +714,18 @@ def apply_async(*args, **kwargs) -> results.AsyncResult:
 
     All arguments are exactly as in :func:`apply_base`, but this returns
     the data as a future-like AsyncResponse.
+
+    If apply batching is enabled on the client (see
+    :mod:`tiledb.cloud.apply_batching`), the call may be sent together with
+    other calls on the same array.
     """
+    batching = client.client.apply_batching
+    if batching is not None:
+        call = inspect.signature(apply_base).bind(*args, **kwargs)
+        call.apply_defaults()
+        future = batching.submit(call.arguments)
+        if future is not None:
+            return results.AsyncResult(future)
     return sender.wrap_async_base_call(apply_base, *args, **kwargs)
 
 
@@ -604,6 +744,7 @@ def exec_multi_array_udf_base(
     store_results: bool = False,
     stored_param_uuids: Iterable[uuid.UUID] = (),
     resource_class: Optional[str] = None,
+    timeout: int = None,
     _download_results: bool = True,
     _server_graph_uuid: Optional[uuid.UUID] = None,
     _client_node_uuid: Optional[uuid.UUID] = None,
@@ -632,6 +773,7 @@ def exec_multi_array_udf_base(
         the ID of this function's node within the graph. Otherwise, None.
     :param resource_class: The name of the resource class to use. Resource classes
         define maximum limits for cpu and memory usage.
+    :param timeout: Timeout for UDF in seconds
     :param kwargs: named arguments to pass to function
     :return: A future containing the results of the UDF.
     >>> import numpy as np
@@ -684,6 +826,9 @@ def exec_multi_array_udf_base(
         client_node_uuid=_client_node_uuid and str(_client_node_uuid),
     )
 
+    if timeout is not None:
+        udf_model.timeout = timeout
+
     if callable(user_func):
         udf_model._exec = utils.b64_pickle(user_func)
         if include_source_lines:
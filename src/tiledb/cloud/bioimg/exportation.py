@@ -3,10 +3,12 @@ from typing import Any, Iterator, Mapping, Optional, Sequence, Tuple, Union
 
 import tiledb
 from tiledb.cloud import dag
+from tiledb.cloud.bioimg.helpers import get_uri_sizes
 from tiledb.cloud.bioimg.helpers import validate_io_paths
 from tiledb.cloud.dag.mode import Mode
 from tiledb.cloud.rest_api.models import RetryStrategy
 from tiledb.cloud.utilities import get_logger_wrapper
+from tiledb.cloud.utilities import partition_by_size
 from tiledb.cloud.utilities._common import as_batch
 from tiledb.cloud.utilities._common import run_dag
 
@@ -23,6 +25,7 @@ def export(
     config: Optional[Mapping[str, Any]] = None,
     taskgraph_name: Optional[str] = None,
     num_batches: Optional[int] = None,
+    batch_bytes: Optional[int] = None,
     resources: Optional[Mapping[str, Any]] = None,
     compute: bool = True,
     mode: Optional[Mode] = Mode.BATCH,
@@ -41,6 +44,8 @@ def export(
     :param taskgraph_name: Optional name for taskgraph, defaults to None
     :param num_batches: Number of graph nodes to spawn.
         Performs it sequentially if default, defaults to 1
+    :param batch_bytes: Target total size of the images of each graph node.
+        Images are balanced across nodes by size either way, defaults to None
     :param threads: Number of threads for node side multiprocessing, defaults to 8
     :param resources: configuration for node specs e.g. {"cpu": "8", "memory": "4Gi"},
         defaults to None
@@ -121,6 +126,7 @@ def export(
         out_ext: str,
         *,
         verbose: bool,
+        batch_bytes: Optional[int] = None,
     ):
         logger = get_logger_wrapper(verbose)
 
@@ -131,10 +137,16 @@ def export(
         logger.debug("Input batches: %s", uri_pairs)
         logger.debug("The io pairs for ingestion: %s:", uri_pairs)
         my_num_batches = num_batches or len(uri_pairs)
-        # If they specified too many batches, don't create empty tasks.
-        my_num_batches = min(len(uri_pairs), my_num_batches)
         logger.debug("Number of batches: %r", my_num_batches)
-        split_batches = [uri_pairs[n::my_num_batches] for n in range(my_num_batches)]
+        # Balance the batches by image size. partition_by_size does not create
+        # empty tasks if they specified too many batches.
+        sizes = get_uri_sizes([s for s, _ in uri_pairs], directories=True)
+        split_batches = partition_by_size(
+            uri_pairs,
+            sizes,
+            num_batches=my_num_batches,
+            target_batch_bytes=batch_bytes,
+        )
         logger.debug("Split batches: %r", split_batches)
         return split_batches
 
@@ -199,6 +211,7 @@ def export(
         output_ext,
         *args,
         verbose=verbose,
+        batch_bytes=batch_bytes,
         access_credentials_name=access_credentials_name,
         name=f"{dag_name} input collector",
         result_format="json",
@@ -1,5 +1,6 @@
 import warnings
-from typing import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Mapping, Optional, Sequence
 
 import tiledb
 import tiledb.cloud.utilities.logging
@@ -47,6 +48,26 @@ def validate_io_paths(
             raise ValueError("Invalid combination of source and output paths.")
 
 
+def get_uri_sizes(
+    uris: Sequence[str],
+    *,
+    config: Optional[Mapping[str, Any]] = None,
+    directories: bool = False,
+    max_workers: int = 16,
+) -> List[int]:
+    """Get the size in bytes of each file (or directory), 0 if it is unknown."""
+    vfs = tiledb.VFS(ctx=tiledb.Ctx(config))
+
+    def size(uri: str) -> int:
+        try:
+            return vfs.dir_size(uri) if directories else vfs.file_size(uri)
+        except tiledb.TileDBError:
+            return 0
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(size, uris))
+
+
 def get_logger_wrapper(*args, **kwargs):
     warnings.warn(
         "Bioimg's get_logger_wrapper() is deprecated, "
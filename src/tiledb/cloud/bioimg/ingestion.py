@@ -5,11 +5,13 @@ from typing import Any, Callable, Iterator, Mapping, Optional, Sequence, Tuple,
 
 import tiledb
 from tiledb.cloud import dag
+from tiledb.cloud.bioimg.helpers import get_uri_sizes
 from tiledb.cloud.bioimg.helpers import serialize_filter
 from tiledb.cloud.bioimg.helpers import validate_io_paths
 from tiledb.cloud.dag.mode import Mode
 from tiledb.cloud.rest_api.models import RetryStrategy
 from tiledb.cloud.utilities import get_logger_wrapper
+from tiledb.cloud.utilities import partition_by_size
 from tiledb.cloud.utilities._common import as_batch
 from tiledb.cloud.utilities._common import run_dag
 
@@ -33,6 +35,7 @@ def ingest(
     acn: str = "",
     taskgraph_name: Optional[str] = None,
     num_batches: Optional[int] = None,
+    batch_bytes: Optional[int] = None,
     threads: Optional[int] = 0,
     resources: Optional[Mapping[str, Any]] = None,
     ingest_resources: Optional[Mapping[str, Any]] = None,
@@ -59,6 +62,8 @@ def ingest(
     :param taskgraph_name: Optional name for taskgraph, defaults to None
     :param num_batches: Number of graph nodes to spawn.
         Performs it sequentially if default, defaults to 1
+    :param batch_bytes: Target total size of the images of each graph node.
+        Images are balanced across nodes by size either way, defaults to None
     :param threads: Number of threads for node side multiprocessing, defaults to 0
     :param resources: configuration for node specs e.g. {"cpu": "8", "memory": "4Gi"},
         defaults to None
@@ -183,6 +188,7 @@ def ingest(
         *,
         verbose: bool,
         config: Optional[Mapping[str, Any]] = None,
+        batch_bytes: Optional[int] = None,
     ):
         logger = get_logger_wrapper(verbose)
 
@@ -195,10 +201,17 @@ def ingest(
         # as its own task.
         logger.debug(f"The io pairs for ingestion: {uri_pairs}")
         my_num_batches = num_batches or len(uri_pairs)
-        # If they specified too many batches, don't create empty tasks.
-        my_num_batches = min(len(uri_pairs), my_num_batches)
         logger.debug(f"Number of batches:{my_num_batches}")
-        split_batches = [uri_pairs[n::my_num_batches] for n in range(my_num_batches)]
+        # Balance the batches by image size, so that a few large images do not
+        # end up in the same task as many small ones. partition_by_size does
+        # not create empty tasks if they specified too many batches.
+        sizes = get_uri_sizes([s for s, _ in uri_pairs], config=config)
+        split_batches = partition_by_size(
+            uri_pairs,
+            sizes,
+            num_batches=my_num_batches,
+            target_batch_bytes=batch_bytes,
+        )
         logger.debug(f"Split batches:{split_batches}")
         return split_batches
 
@@ -372,6 +385,7 @@ def ingest(
         *args,
         verbose=verbose,
         config=config,
+        batch_bytes=batch_bytes,
         access_credentials_name=acn,
         name=f"{dag_name} input collector",
         result_format="json",
@@ -2,10 +2,11 @@ import enum
 import os
 import threading
 import types
+import urllib.parse
 import uuid
 import warnings
 from concurrent import futures
-from typing import Callable, Optional, Sequence, TypeVar, Union
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, TypeVar, Union
 
 import urllib3
 
@@ -13,11 +14,20 @@ import tiledb
 import tiledb.cloud._common.api_v2.models as models_v2
 import tiledb.cloud.rest_api.models as models_v1
 from tiledb.cloud import config
+from tiledb.cloud import instrumentation as instr
+from tiledb.cloud import request_compression as rc
 from tiledb.cloud import rest_api
+from tiledb.cloud import retry_policy as rp
 from tiledb.cloud import tiledb_cloud_error
+from tiledb.cloud._common import reporter
 from tiledb.cloud.pool_manager_wrapper import _PoolManagerWrapper
+from tiledb.cloud.region import routing
 from tiledb.cloud.rest_api import ApiException as GenApiException
 
+if TYPE_CHECKING:
+    from tiledb.cloud import apply_batching as ab
+    from tiledb.cloud import local_execution as le
+
 _T = TypeVar("_T")
 
 
@@ -655,18 +665,60 @@ class Client:
 
     :param pool_threads: Number of threads to use for http requests
     :param retry_mode: Retry mode ["default", "forceful", "disabled"]
+    :param instrumentation: Collector of HTTP request statistics and hooks
+    :param request_compression: How to compress large request bodies
+    :param retry_policy: The retry budget, backoff and circuit breakers
+        shared by all retries
+    :param local_execution: Which array UDF requests to run on the client
+    :param apply_batching: Which asynchronous array UDF requests to send
+        together
+    :param routes: Where to send the requests to each API host
     """
 
     def __init__(
         self,
         pool_threads: Optional[int] = None,
         retry_mode: RetryOrStr = RetryMode.DEFAULT,
+        instrumentation: Optional[instr.Instrumentation] = None,
+        request_compression: Optional[rc.RequestCompression] = None,
+        retry_policy: Optional[rp.RetryPolicy] = None,
+        local_execution: Optional["le.LocalExecution"] = None,
+        apply_batching: Optional["ab.ApplyBatching"] = None,
+        routes: Optional[routing.RouteCache] = None,
     ):
         """
 
         :param pool_threads: Number of threads to use for http requests
         :param retry_mode: Retry mode ["default", "forceful", "disabled"]
+        :param instrumentation: Collector of HTTP request statistics and hooks,
+            defaults to a new one
+        :param request_compression: How to compress large request bodies,
+            defaults to not compressing them
+        :param retry_policy: The retry budget, backoff and circuit breakers
+            shared by all retries, defaults to a new one
+        :param local_execution: Which array UDF requests to run on the client,
+            defaults to running all of them on the server
+        :param apply_batching: Which asynchronous array UDF requests to send
+            together, defaults to sending each on its own
+        :param routes: Where to send the requests to each API host,
+            defaults to sending them to that host (and following redirects)
+        """
+        self.instrumentation = instrumentation or instr.Instrumentation()
+        """Statistics of the HTTP requests made by this client."""
+        self.reporter = reporter.StatusReporter()
+        """Sends client-side task graph status changes to the server."""
+        self.routes = routes
+        """The hosts that requests to each API host are sent to, if any.
+
+        Set with :meth:`set_routes` or :meth:`select_region`.
         """
+        self.retry_policy = retry_policy or rp.RetryPolicy()
+        """Limits and spaces out the retries of this client's requests."""
+        self.local_execution = local_execution
+        """Which array UDF requests to run on the client, if any."""
+        self.apply_batching = apply_batching
+        """Which asynchronous array UDF requests to send together, if any."""
+        self._request_compression = request_compression
         self._pool_lock = threading.Lock()
         self._set_threads(pool_threads)
         # Low-level clients begin uninitialized.
@@ -714,6 +766,87 @@ class Client:
         self._set_threads(threads)
         self._rebuild_clients()
 
+    def set_request_compression(
+        self, compression: Optional[rc.RequestCompression]
+    ) -> None:
+        """Sets how request bodies are compressed and updates API instances.
+
+        :param compression: How to compress large request bodies,
+            or None to send them uncompressed.
+        """
+        self._request_compression = compression
+        self._rebuild_clients()
+
+    def set_routes(self, routes: Optional[routing.RouteCache]) -> None:
+        """Sets where requests to each API host go and updates API instances.
+
+        To share routes with other processes::
+
+            client.client.set_routes(
+                routing.RouteCache(config.default_routes_file)
+            )
+
+        :param routes: Where to send the requests to each API host (learning
+            from redirects), or None to send them to that host.
+        """
+        self.routes = routes
+        self._rebuild_clients()
+
+    def warm_up(
+        self, hosts: Optional[Sequence[str]] = None, timeout: float = 5
+    ) -> Dict[str, Optional[float]]:
+        """Opens connections to API hosts before they are first needed.
+
+        This moves connecting and the TLS handshake out of the first
+        requests, e.g. while a short-lived worker is still loading its data.
+
+        :param hosts: The base URLs of the hosts to connect to, defaults to
+            the configured host and the host its requests are routed to.
+        :param timeout: How long to wait for each host, in seconds.
+        :return: The latency of a request to each host, in seconds,
+            or None for hosts that could not be reached.
+        """
+        if hosts is None:
+            host = urllib.parse.urlparse(config.config.host)
+            hosts = [config.config.host]
+            routed = self.routes and self.routes.get(host.netloc)
+            if routed:
+                hosts.append(host._replace(netloc=routed).geturl())
+        # Both API versions have their own connection pools.
+        latencies = self._client_v1.rest_client.pool_manager.warm_up(hosts, timeout)
+        self._client_v2.rest_client.pool_manager.warm_up(hosts, timeout)
+        return latencies
+
+    def select_region(
+        self, hosts: Optional[Sequence[str]] = None, timeout: float = 5
+    ) -> Optional[str]:
+        """Routes requests to the regional API host with the lowest latency.
+
+        Requests to the configured host are sent to the fastest host instead
+        (and the server redirects those for resources in other regions, as
+        before). The choice is remembered in :attr:`routes`; if those are
+        persisted, it is also used by later processes. If routing by host is
+        not enabled, it is enabled with routes kept in memory only.
+
+        :param hosts: The base URLs of the hosts to choose from, defaults to
+            all the regions in :class:`tiledb.cloud.region.AWS`.
+        :param timeout: How long to wait for each host, in seconds.
+        :return: The chosen host, or None if no host could be reached
+            (in which case routing is unchanged).
+        """
+        latencies = self.warm_up(hosts or routing.hosts(), timeout)
+        reachable = {h: t for h, t in latencies.items() if t is not None}
+        if not reachable:
+            return None
+        best = min(reachable, key=reachable.__getitem__)
+        if self.routes is None:
+            self.set_routes(routing.RouteCache())
+        self.routes.set(
+            urllib.parse.urlparse(config.config.host).netloc,
+            urllib.parse.urlparse(best).netloc,
+        )
+        return best
+
     def _retry_mode(self, mode: RetryOrStr) -> None:
         mode = RetryMode.maybe_from(mode)
         config.config.retries = _RETRY_CONFIGS[mode]
@@ -735,7 +868,11 @@ class Client:
         config.config.connection_pool_maxsize = pool_size
         client = rest_api.ApiClient(config.config, _tdb_models_module=module)
         client.rest_client.pool_manager = _PoolManagerWrapper(
-            client.rest_client.pool_manager
+            client.rest_client.pool_manager,
+            self.instrumentation,
+            self._request_compression,
+            self.routes,
+            self.retry_policy,
         )
         return client
 
@@ -11,6 +11,8 @@ from tiledb.cloud.rest_api import models
 
 default_host = "https://api.tiledb.com"
 default_config_file = Path.joinpath(Path.home(), ".tiledb", "cloud.json")
+default_routes_file = Path.joinpath(Path.home(), ".tiledb", "cloud-routes.json")
+"""Where the hosts that API requests are redirected to are remembered."""
 
 # Starting with version 0.12.30, "config" is a dynamic attribute of
 # this module. The actual state of the attribute is bound to "_config",
@@ -1,7 +1,9 @@
 from types import MappingProxyType
 
 from tiledb.cloud.dag import dag
+from tiledb.cloud.dag import memo
 from tiledb.cloud.dag import mode
+from tiledb.cloud.dag import speculation
 from tiledb.cloud.dag import status
 
 # Globals
@@ -9,8 +11,10 @@ MIN_BATCH_RESOURCES = MappingProxyType({"cpu": "1", "memory": "2Gi"})
 
 # Re-exports.
 Mode = mode.Mode
+MemoCache = memo.MemoCache
 DAG = dag.DAG
 Node = dag.Node
+Speculation = speculation.Speculation
 Status = status.Status
 list_logs = dag.list_logs
 server_logs = dag.server_logs
@@ -19,8 +23,10 @@ server_logs = dag.server_logs
 __all__ = (
     "DAG",
     "MIN_BATCH_RESOURCES",
+    "MemoCache",
     "Mode",
     "Node",
+    "Speculation",
     "Status",
     "list_logs",
     "server_logs",
@@ -3,7 +3,6 @@
 import collections
 import datetime
 import itertools
-import json
 import numbers
 import re
 import threading
@@ -36,6 +35,7 @@ from .. import rest_api
 from .. import udf
 from .._common import functions
 from .._common import futures
+from .._common import timing
 from .._common import utils
 from .._common import visitor
 from .._results import codecs
@@ -46,6 +46,8 @@ from .._results import types
 from ..rest_api import models
 from ..sql import _execution as _sql_exec
 from ..taskgraphs import _results as _tg_results
+from . import memo as mem
+from . import speculation as spec
 from . import status as st
 from . import visualization as viz
 from .mode import Mode
@@ -106,6 +108,9 @@ class Node(futures.FutureLike[_T]):
     :param dag: DAG this node is associated with.
     :param mode: Mode the Node is to run in.
     :param expand_node_output: Node to expand processes upon.
+    :param idempotent: True if running the function more than once is
+        harmless. If the DAG has speculation enabled, a duplicate of an
+        idempotent node may be started if it runs for too long.
     :param _download_results: An optional boolean to override default
         result-downloading behavior. If True, will always download the
         results of the function immediately upon completion.
@@ -129,6 +134,7 @@ class Node(futures.FutureLike[_T]):
         dag: Optional["DAG"] = None,
         mode: Mode = Mode.REALTIME,
         expand_node_output: Optional["Node"] = None,
+        idempotent: bool = False,
         _download_results: Optional[bool] = None,
         _internal_prewrapped_func: Callable[..., "results.Result[_T]"] = None,
         _internal_accepts_stored_params: bool = True,
@@ -146,12 +152,18 @@ class Node(futures.FutureLike[_T]):
         self._lifecycle_exception: Optional[Exception] = None
         self._exception: Optional[Exception] = None
         self._cb_list: List[Callable[["Node[_T]"], None]] = []
+        self.times = timing.NodeTimes()
+        """Timestamps of this Node's lifecycle events (of its latest attempt)."""
 
         self.dag = dag
         """DAG this Node is pinned to."""
         self.mode: Mode = mode
         """Processing mode of Node."""
         self._expand_node_output: Optional[Node] = expand_node_output
+        self.idempotent = idempotent
+        """Whether this Node may be run more than once."""
+        self._stage = spec.stage_of(func)
+        self._memo_key: Optional[str] = None
 
         self._resource_class = kwargs.pop("resource_class", None)
         self._resources = kwargs.pop("resources", None)
@@ -433,6 +445,7 @@ class Node(futures.FutureLike[_T]):
         self._result = None
         self._lifecycle_exception = None
         self._exception = None
+        self.times = timing.NodeTimes()
         self._update_status(Status.NOT_STARTED)
         return True
 
@@ -471,6 +484,7 @@ class Node(futures.FutureLike[_T]):
             ) or all(p.status is Status.COMPLETED for p in parents)
             if not self._starting:
                 return False
+        self.times.mark("queued")
         self.dag._node_executor.submit(self._dag_exec, namespace)
         return True
 
@@ -498,12 +512,15 @@ class Node(futures.FutureLike[_T]):
             else:
                 cbs = None
                 self._update_status(Status.RUNNING)
+                self.times.mark("started")
 
         if cbs is not None:
             futures.execute_callbacks(self, cbs)
             return
         assert self.dag
         self.dag._report_node_status_update()
+        if self._complete_from_memo():
+            return
         # We have to make a shallow copy of kwargs here.
         # Since we modify the kwargs dictionary here before passing it
         # to the wrapped function, we need to ensure that the arguments
@@ -563,9 +580,18 @@ class Node(futures.FutureLike[_T]):
                 download_results = self._download_results
             kwargs["_download_results"] = download_results
 
-        sp_future = self.dag._udf_executor.submit(self._wrapped_func, *args, **kwargs)
+        stages = self.dag.stage_times if self.mode == Mode.REALTIME else None
         try:
-            result = sp_future.result()
+            result, times = spec.run(
+                self.dag._udf_executor,
+                self._wrapped_func,
+                args,
+                kwargs,
+                times=self.times,
+                stages=stages,
+                stage=self._stage,
+                speculate=self.idempotent,
+            )
         except Exception as exc:
             # We don't need to worry about cancellation exceptions here, because
             # we're the only ones who hold onto this future and we never cancel.
@@ -581,15 +607,19 @@ class Node(futures.FutureLike[_T]):
             # Otherwise, fall through to _replace_nodes_with_results below.
         else:
             # We succeeded!
+            self._memoize(result)
             with self._lifecycle_condition:
                 self._result = result
+                self.times = times
                 self._update_status(Status.COMPLETED)
                 cbs = self._callbacks()
             futures.execute_callbacks(self, cbs)
             return
 
         args, kwargs = _replace_nodes_with_results((self.args, self.kwargs))
-        raw_future = self.dag._udf_executor.submit(self._wrapped_func, *args, **kwargs)
+        raw_future = self.dag._udf_executor.submit(
+            timing.record(self.times, self._wrapped_func), *args, **kwargs
+        )
         try:
             result = raw_future.result()
         except Exception as exc:
@@ -599,12 +629,48 @@ class Node(futures.FutureLike[_T]):
                 cbs = self._callbacks()
             futures.execute_callbacks(self, cbs)
         else:
+            self._memoize(result)
             with self._lifecycle_condition:
                 self._result = result
                 self._update_status(Status.COMPLETED)
                 cbs = self._callbacks()
             futures.execute_callbacks(self, cbs)
 
+    def _make_memo_key(self) -> Optional[str]:
+        """Derives the memoization key of this Node from its inputs.
+
+        Parents' keys must already be set. Returns None if this Node's
+        result cannot be memoized.
+        """
+        parent_keys = sorted(p._memo_key or "" for p in self.parents.values())
+        if not all(parent_keys):
+            return None
+        args, kwargs = _NodeKeyReplacer().visit((self.args, self.kwargs))
+        return mem.make_key(
+            self.mode, self._wrapped_func, parent_keys, args, kwargs, self.dag.namespace
+        )
+
+    def _complete_from_memo(self) -> bool:
+        """Completes this Node with its memoized result, if there is one."""
+        assert self.dag
+        if self.dag.memo is None or self._memo_key is None:
+            return False
+        result = self.dag.memo.get(self._memo_key)
+        if result is None:
+            return False
+        with self._lifecycle_condition:
+            self._result = result
+            self._update_status(Status.COMPLETED)
+            self.times.mark("completed")
+            cbs = self._callbacks()
+        futures.execute_callbacks(self, cbs)
+        return True
+
+    def _memoize(self, result: "results.Result[_T]") -> None:
+        assert self.dag
+        if self.dag.memo is not None and self._memo_key is not None:
+            self.dag.memo.put(self._memo_key, result)
+
     def _update_status(self, st: Status) -> None:
         if self._status is st:
             return
@@ -697,6 +763,12 @@ class DAG:
     :param retry_strategy: K8S retry policy to be applied to each Node.
     :param workflow_retry_strategy: K8S retry policy to be applied to DAG.
     :param deadline: Duration (sec) DAG allowed to execute before timeout.
+    :param speculation: If set, idempotent realtime Nodes that run for much
+        longer than others running the same function get a duplicate, and
+        take the result of whichever finishes first.
+    :param memo: If set, Nodes whose function and arguments are unchanged
+        since a previous run with the same cache reuse its results instead
+        of running again. Not supported for BATCH mode DAGs.
     """
 
     def __init__(
@@ -711,7 +783,11 @@ class DAG:
         retry_strategy: Optional[models.RetryStrategy] = None,
         workflow_retry_strategy: Optional[models.RetryStrategy] = None,
         deadline: Optional[int] = None,
+        speculation: Optional[spec.Speculation] = None,
+        memo: Optional[mem.MemoCache] = None,
     ) -> None:
+        if memo is not None and mode == Mode.BATCH:
+            raise ValueError("Memoization is not supported for BATCH mode DAGs.")
         self.id: uuid.UUID = uuid.uuid4()
         """UUID for DAG instance."""
         self.nodes: Dict[uuid.UUID, Node] = {}
@@ -741,11 +817,19 @@ class DAG:
         """K8S retry policy to be applied to DAG."""
         self.deadline: Optional[str] = deadline
         """Duration (sec) DAG allowed to execute before timeout."""
+        self.stage_times: Optional[spec.StageTimes] = (
+            spec.StageTimes(speculation) if speculation else None
+        )
+        """Run times of the Nodes running each function, if speculating."""
+        self.memo: Optional[mem.MemoCache] = memo
+        """The cache of Node results to reuse across runs."""
         self._update_batch_status_thread: Optional[threading.Thread] = None
         """The thread that is updating the status of Batch execution."""
         self.mode: Mode = mode
         """Mode the DAG is to run in."""
         self.visualization = None
+        self._visualization_layout: Optional[Tuple[Hashable, Dict]] = None
+        """Cached layout positions of the visualized graph."""
         """
         The following executors are initialized by calling
         self._init_executors on demand
@@ -901,10 +985,12 @@ class DAG:
             api_st = _API_STATUSES[status]
         except KeyError as ke:
             raise AssertionError(f"Task graph ended in invalid state {status}") from ke
-        do_update = utils.ephemeral_thread(
-            client.build(rest_api.TaskGraphLogsApi).update_task_graph_log
-        )
-        do_update(
+        self._report_graph_status(api_st)
+
+    def _report_graph_status(self, api_st: str) -> None:
+        client.client.reporter.submit(
+            ("task_graph", self.server_graph_uuid),
+            client.build(rest_api.TaskGraphLogsApi).update_task_graph_log,
             id=str(self.server_graph_uuid),
             namespace=self.namespace,
             log=rest_api.TaskGraphLog(status=api_st),
@@ -1249,10 +1335,9 @@ class DAG:
             # Only report client-side events to the server if we've submitted
             # the structure of the graph.
             if to_report:
-                do_report = utils.ephemeral_thread(
-                    client.build(rest_api.TaskGraphLogsApi).report_client_node
-                )
-                do_report(
+                client.client.reporter.submit(
+                    ("task_graph_node", self.server_graph_uuid, node.id),
+                    client.build(rest_api.TaskGraphLogsApi).report_client_node,
                     id=str(self.server_graph_uuid),
                     namespace=self.namespace,
                     report=models.TaskGraphClientNodeStatus(
@@ -1267,15 +1352,7 @@ class DAG:
                     api_st = _API_STATUSES[status]
                 except KeyError as ke:
                     raise AssertionError(f"Invalid end state {status}") from ke
-                do_update = utils.ephemeral_thread(
-                    client.build(rest_api.TaskGraphLogsApi).update_task_graph_log
-                )
-                do_update(
-                    id=str(self.server_graph_uuid),
-                    namespace=self.namespace,
-                    log=rest_api.TaskGraphLog(status=api_st),
-                    _request_timeout=_REPORT_TIMEOUT_SECS,
-                )
+                self._report_graph_status(api_st)
 
     def _set_status(self, st: Status) -> None:
         if self._status is st:
@@ -1317,6 +1394,9 @@ class DAG:
                 roots = self._find_root_nodes()
                 if len(roots) == 0:
                     raise ValueError("DAG is circular, there are no root nodes")
+                if self.memo is not None:
+                    for node in _topo_sort_nodes(self.nodes):
+                        node._memo_key = node._make_memo_key()
                 self._status = Status.RUNNING
 
                 for node in roots:
@@ -1451,6 +1531,33 @@ class DAG:
             "total_count": len(self.nodes),
         }
 
+    def timing_report(self) -> timing.TimingReport:
+        """Reports where the time of the DAG's execution went.
+
+        Every node records when it was queued, started, submitted to the
+        server, accepted by the server, had its result downloaded, and
+        completed. The report splits that into phases for each node, and finds
+        the critical path: the chain of nodes, each started by the completion
+        of the previous one, that ends with the last node to complete.
+        Batch DAGs only have the server's start and finish times of each node.
+
+        Use ``report.summary()`` for a readable overview, and
+        ``report.to_chrome_trace()`` to view the timeline in a trace viewer.
+
+        :return: The timing report of the nodes that completed.
+        """
+        with self._lifecycle_condition:
+            nodes = tuple(self.nodes.values())
+        return timing.TimingReport.build(
+            timing.NodeTiming(
+                id=str(node.id),
+                name=node.name,
+                parents=tuple(str(p) for p in node.parents),
+                times=node.times,
+            )
+            for node in nodes
+        )
+
     def networkx_graph(self):
         import networkx as nx
 
@@ -1486,24 +1593,14 @@ class DAG:
             nodes=_topo_sort(nodes),
         )
 
-    @staticmethod
-    def _update_dag_tiledb_graph(graph):
-        graph.visualization["node_details"] = graph.get_tiledb_plot_node_details()
-        viz.update_tiledb_graph(
-            graph.visualization["nodes"],
-            graph.visualization["edges"],
-            graph.visualization["node_details"],
-            graph.visualization["positions"],
-            graph.visualization["fig"],
-        )
-
-    @staticmethod
-    def _update_dag_plotly_graph(graph):
-        viz.update_plotly_graph(
-            graph.visualization["nodes"], graph.visualization["fig"]
-        )
-
-    def visualize(self, notebook=True, auto_update=True, force_plotly=False):
+    def visualize(
+        self,
+        notebook=True,
+        auto_update=True,
+        force_plotly=False,
+        update_interval=viz.DEFAULT_UPDATE_INTERVAL,
+        max_nodes=viz.MAX_VISUALIZED_NODES,
+    ):
         """Build and render a tree diagram of the DAG.
 
         :param notebook: Is the visualization inside a jupyter notebook?
@@ -1511,20 +1608,61 @@ class DAG:
         :param auto_update: Should the diagram be auto updated with each status change.
         :param force_plotly: Force the use of plotly graphs instead of
             TileDB Plot Widget.
+        :param update_interval: Minimum time (sec) between two automatic
+            updates of the diagram; status changes in between are batched.
+        :param max_nodes: Graphs with more nodes are rendered as a summary of
+            node counts by status instead of a tree diagram.
         :return: returns figure.
         """
+        if max_nodes is not None and len(self.nodes) > max_nodes:
+            return self._visualize_summary(
+                notebook=notebook,
+                auto_update=auto_update,
+                update_interval=update_interval,
+            )
+
         if not notebook or force_plotly:
-            return self._visualize_plotly(notebook=notebook, auto_update=auto_update)
+            return self._visualize_plotly(
+                notebook=notebook,
+                auto_update=auto_update,
+                update_interval=update_interval,
+            )
 
         try:
-            return self._visualize_tiledb(auto_update=auto_update)
+            return self._visualize_tiledb(
+                auto_update=auto_update, update_interval=update_interval
+            )
         except ImportError:
-            return self._visualize_plotly(notebook=notebook, auto_update=auto_update)
+            return self._visualize_plotly(
+                notebook=notebook,
+                auto_update=auto_update,
+                update_interval=update_interval,
+            )
 
-    def _visualize_tiledb(self, auto_update=True):
+    def _visualization_positions(self, graph) -> Dict[str, Tuple[float, float]]:
+        """Computes the layout of the graph, reusing the last layout if the
+        graph structure did not change."""
+        key = (frozenset(graph.nodes()), frozenset(graph.edges()))
+        cached = self._visualization_layout
+        if cached is None or cached[0] != key:
+            cached = (key, viz.build_visualization_positions(graph))
+            self._visualization_layout = cached
+        return cached[1]
+
+    def _add_visualization_updater(self, render, update_interval) -> None:
+        """Registers callbacks that render at most once per update_interval
+        while the DAG runs, and once more when it is done."""
+        throttler = viz.UpdateThrottler(render, interval=update_interval)
+        self.add_update_callback(throttler)
+        self.add_done_callback(throttler.flush)
+
+    def _visualize_tiledb(
+        self, auto_update=True, update_interval=viz.DEFAULT_UPDATE_INTERVAL
+    ):
         """
         Create graph visualization with tiledb.plot.widget
         :param auto_update: Should the diagram be auto updated with each status change
+        :param update_interval: Minimum time (sec) between two automatic updates
         :return: figure
         """
 
@@ -1533,35 +1671,47 @@ class DAG:
         graph = self.networkx_graph()
         nodes = list(graph.nodes())
         edges = list(graph.edges())
-        node_details = self.get_tiledb_plot_node_details()
-        positions = viz.build_visualization_positions(graph)
+        positions = self._visualization_positions(graph)
+        updater = viz.TileDBGraphUpdater(
+            nodes,
+            edges,
+            positions,
+            {str(node.id): node for node in self.nodes.values()},
+            fig=None,
+        )
 
         self.visualization = {
             "nodes": nodes,
             "edges": edges,
-            "node_details": node_details,
+            "node_details": updater.node_details,
             "positions": positions,
         }
-        fig = tiledb.plot.widget.Visualize(data=json.dumps(self.visualization))
-        self.visualization["fig"] = fig
+        fig = tiledb.plot.widget.Visualize(data=updater.data())
+        self.visualization["fig"] = updater.fig = fig
 
         if auto_update:
-            self.add_update_callback(self._update_dag_tiledb_graph)
+            self._add_visualization_updater(updater, update_interval)
 
         return fig
 
-    def _visualize_plotly(self, notebook=True, auto_update=True):
+    def _visualize_plotly(
+        self,
+        notebook=True,
+        auto_update=True,
+        update_interval=viz.DEFAULT_UPDATE_INTERVAL,
+    ):
         """Visualize figure.
 
         :param notebook: Is the visualization inside a jupyter notebook?
             If so we'll use a widget
         :param auto_update: Should the diagram be auto updated with each status change
+        :param update_interval: Minimum time (sec) between two automatic updates
         :return: figure
         """
         import plotly.graph_objects as go
 
         graph = self.networkx_graph()
-        pos = viz.build_visualization_positions(graph)
+        pos = self._visualization_positions(graph)
 
         # Convert to plotly scatter plot
         edge_x = []
@@ -1606,7 +1756,8 @@ class DAG:
             marker=dict(size=15, line_width=2),
         )
 
-        (node_trace.marker.color, node_trace.text) = viz.build_graph_node_details(nodes)
+        updater = viz.PlotlyGraphUpdater(nodes, fig=None)
+        node_trace.marker.color, node_trace.text = (updater.colors, updater.text)
 
         fig_obj = go.Figure
         if notebook:
@@ -1629,9 +1780,35 @@ class DAG:
         )
 
         self.visualization = dict(fig=fig, network=graph, nodes=nodes)
+        updater.fig = fig
 
         if auto_update:
-            self.add_update_callback(self._update_dag_plotly_graph)
+            self._add_visualization_updater(updater, update_interval)
+
+        return fig
+
+    def _visualize_summary(
+        self,
+        notebook=True,
+        auto_update=True,
+        update_interval=viz.DEFAULT_UPDATE_INTERVAL,
+    ):
+        """Visualize node counts by status, for graphs too large to draw.
+
+        :param notebook: Is the visualization inside a jupyter notebook?
+            If so we'll use a widget
+        :param auto_update: Should the diagram be auto updated with each status change
+        :param update_interval: Minimum time (sec) between two automatic updates
+        :return: figure
+        """
+        fig = viz.build_summary_figure(self.stats(), notebook=notebook)
+        self.visualization = dict(fig=fig)
+
+        if auto_update:
+            self._add_visualization_updater(
+                lambda: viz.update_summary_figure(self.stats(), fig),
+                update_interval,
+            )
 
         return fig
 
@@ -1786,8 +1963,9 @@ class DAG:
 
     def _update_status(self) -> None:
         consecutive_failures = 0
+        backoff = 0.0
         while True:
-            time.sleep(2)
+            time.sleep(2 + backoff)
             if self._done():
                 return
 
@@ -1801,14 +1979,17 @@ class DAG:
                 except rest_api.ApiException:
                     consecutive_failures += 1
                     # We might have a problem connecting to the server.
-                    # Ignore it if it's transient. (The exact number here
-                    # is a heuristic.)
-                    if consecutive_failures < 5:
+                    # Ignore it if it's transient, unless the client is
+                    # out of retries. (The exact number here is a heuristic.)
+                    policy = client.client.retry_policy
+                    if consecutive_failures < 5 and policy.acquire_retry():
+                        backoff = policy.backoff(backoff)
                         continue
                     # At this point, we have had a lot of failures.
                     # Handle it like any other internal error.
                     raise
                 consecutive_failures = 0
+                backoff = 0.0
                 for new_node in result.nodes or ():
                     assert isinstance(new_node, models.TaskGraphNodeMetadata)
                     node_uuid = uuid.UUID(new_node.client_node_uuid)
@@ -1821,9 +2002,15 @@ class DAG:
                             Status.COMPLETED,
                         ):
                             if new_node.executions:
-                                execution_id = new_node.executions[
-                                    len(new_node.executions) - 1
-                                ].id
+                                execution = new_node.executions[-1]
+                                execution_id = execution.id
+                                if execution.start_time and execution.finish_time:
+                                    node.times.mark(
+                                        "started", execution.start_time.timestamp()
+                                    )
+                                    node.times.mark(
+                                        "completed", execution.finish_time.timestamp()
+                                    )
                                 node._lazy_result = _tg_results.LazyResult(
                                     client, execution_id
                                 )
@@ -2036,6 +2223,15 @@ class _DepFinder(visitor.ReplacingVisitor):
         return None
 
 
+class _NodeKeyReplacer(visitor.ReplacingVisitor):
+    """Replaces Nodes with their memoization keys."""
+
+    def maybe_replace(self, arg) -> Optional[visitor.Replacement]:
+        if isinstance(arg, Node):
+            return visitor.Replacement(mem.ParentKey(arg._memo_key or ""))
+        return None
+
+
 class _NodeToStoredParamReplacer(visitor.ReplacingVisitor):
     """Replaces Nodes with :class:`stored_param.StoredParam`s (if possible).
 
@@ -0,0 +1,114 @@
+"""Memoization of DAG node results across runs.
+
+Re-running a graph, e.g. after fixing a downstream failure in a notebook,
+normally runs every node again. When DAGs are given the same
+:class:`MemoCache`, each node is identified by a key derived from its
+function, its arguments and the keys of its parents. A node whose key is in
+the cache completes immediately with the cached result, so the graph resumes
+from the first node that changed::
+
+    memo = dag.MemoCache()
+
+    def build():
+        graph = dag.DAG(memo=memo)
+        data = graph.submit(load, "s3://bucket/input")
+        return graph, graph.submit(analyze, data, threshold=0.5)
+
+    graph, result = build()
+    graph.compute()
+    # Change `analyze` or its arguments, then run again. Only `analyze` runs.
+    graph, result = build()
+    graph.compute()
+
+Stored results of remote nodes are cached as their task ID, so children of
+a cached node receive it as a stored parameter and its data never travels
+through the client. Other results are cached in memory.
+
+Functions are identified by their pickles. Functions defined in importable
+modules are pickled by name, so changing their code does not change the key.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import attrs
+
+from .._results import results
+from .._vendor import cloudpickle as tdbcp
+
+
+@attrs.define(frozen=True)
+class ParentKey:
+    """Stands in for a parent Node in the arguments a key is made from."""
+
+    key: str
+
+
+def make_key(*parts: Any) -> Optional[str]:
+    """Hashes the parts that identify a node.
+
+    :return: The key, or None if the parts cannot be pickled.
+    """
+    try:
+        data = tdbcp.dumps(parts)
+    except Exception:
+        return None
+    return hashlib.sha256(data).hexdigest()
+
+
+class MemoCache:
+    """A thread-safe map from node keys to their results.
+
+    :param max_age_sec: How long a result is reused for, defaults to forever.
+        Stored results expire on the server, so when reusing them for long,
+        set this below the server's retention period.
+    """
+
+    def __init__(self, max_age_sec: Optional[float] = None):
+        self._max_age_sec = max_age_sec
+        self._lock = threading.Lock()
+        self._results: Dict[str, Tuple[results.Result, float]] = {}
+        self.hits = 0
+        """Nodes that were completed from the cache."""
+        self.misses = 0
+        """Nodes that had to run."""
+
+    def get(self, key: str) -> Optional[results.Result]:
+        """Returns the result cached for ``key``, if any."""
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                result, added = entry
+                if (
+                    self._max_age_sec is None
+                    or time.monotonic() - added <= self._max_age_sec
+                ):
+                    self.hits += 1
+                    return result
+                del self._results[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: results.Result) -> None:
+        """Caches the result of a node."""
+        if isinstance(result, results.RemoteResult) and result.results_stored:
+            # Keep only what is needed to fetch it (or pass it on) again.
+            result = results.RemoteResult(
+                task_id=result.task_id,
+                decoder=result.decoder,
+                results_stored=True,
+                body=None,
+            )
+        with self._lock:
+            self._results[key] = (result, time.monotonic())
+
+    def clear(self) -> None:
+        """Forgets all results."""
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
@@ -0,0 +1,176 @@
+"""Speculative execution of straggling nodes in realtime task graphs.
+
+In a large fan-out, the slowest of many similar UDFs decides when the fan-in
+can start. When a DAG is given a :class:`Speculation`, the run times of its
+remote nodes are tracked per stage (the function the node runs). A node
+marked ``idempotent`` that runs much longer than the others of its stage gets
+a duplicate, and the node takes whichever result arrives first::
+
+    graph = dag.DAG(speculation=dag.Speculation(percentile=0.9))
+    for part in parts:
+        graph.submit(query, part, idempotent=True)
+
+The losing attempt is cancelled if it has not started yet, and otherwise left
+to finish and ignored. Only mark nodes idempotent if running them twice is
+harmless, e.g. if they only read data.
+"""
+
+import bisect
+import functools
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import attrs
+
+from .._common import functions
+from .._common import futures
+from .._common import timing
+
+_T = TypeVar("_T")
+
+_POLL_SEC = 0.5
+"""How often to check a node against its stage while the threshold changes."""
+
+
+@attrs.define(frozen=True)
+class Speculation:
+    """When to start a duplicate of a straggling node.
+
+    :param percentile: The percentile of the run times of a stage that
+        straggling is measured against, defaults to 0.9.
+    :param multiplier: A node straggles once it has run for this multiple of
+        the percentile, defaults to 1.5.
+    :param min_samples: The number of nodes of a stage that must complete
+        before its nodes get duplicates, defaults to 5.
+    :param min_sec: Nodes that have run for less than this never get
+        duplicates, defaults to 1.
+    """
+
+    percentile: float = attrs.field(default=0.9)
+    multiplier: float = 1.5
+    min_samples: int = 5
+    min_sec: float = 1
+
+    @percentile.validator
+    def _check_percentile(self, attribute, value) -> None:
+        if not 0 < value <= 1:
+            raise ValueError(f"percentile must be in (0, 1], not {value}")
+
+
+class StageTimes:
+    """The run times of the nodes of each stage of a graph.
+
+    Also counts the duplicates started and how many of them won.
+
+    :param speculation: When nodes straggle.
+    """
+
+    def __init__(self, speculation: Speculation):
+        self.speculation = speculation
+        self._lock = threading.Lock()
+        self._times: Dict[str, List[float]] = {}
+        self.launched = 0
+        """Duplicates started."""
+        self.won = 0
+        """Duplicates that finished before the original attempt."""
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Records the run time of a successful node of a stage."""
+        with self._lock:
+            bisect.insort(self._times.setdefault(stage, []), seconds)
+
+    def threshold(self, stage: str) -> Optional[float]:
+        """How long a node of the stage can run before it straggles.
+
+        :return: The threshold in seconds, or None if too few nodes of the
+            stage have completed to tell.
+        """
+        spec = self.speculation
+        with self._lock:
+            times = self._times.get(stage, ())
+            if len(times) < max(1, spec.min_samples):
+                return None
+            index = min(len(times) - 1, math.ceil(spec.percentile * len(times)) - 1)
+            value = times[index]
+        return max(spec.min_sec, value * spec.multiplier)
+
+    def _count(self, won: bool) -> None:
+        with self._lock:
+            if won:
+                self.won += 1
+            else:
+                self.launched += 1
+
+
+def stage_of(func: Any) -> str:
+    """The stage that a node running ``func`` belongs to."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    return functions.full_name(func)
+
+
+def run(
+    executor: futures.Executor,
+    func: Callable[..., _T],
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    *,
+    times: timing.NodeTimes,
+    stages: Optional[StageTimes] = None,
+    stage: str = "",
+    speculate: bool = False,
+) -> Tuple[_T, timing.NodeTimes]:
+    """Runs ``func`` on the executor, starting a duplicate if it straggles.
+
+    :param times: Where to record the times of the first attempt.
+    :param stages: The run times to record this run in (if it succeeds),
+        and to compare it to.
+    :param stage: The stage of the node.
+    :param speculate: If true, start a duplicate when the first attempt
+        runs past the threshold of ``stages``.
+    :return: The result and the times of the attempt that produced it.
+        If all attempts fail, raises the error of the first attempt.
+    """
+    first = executor.submit(timing.record(times, func), *args, **kwargs)
+    attempts = {first: times}
+    if stages is not None and speculate:
+        while not first.done():
+            threshold = stages.threshold(stage)
+            # Only the time the attempt has actually run for counts.
+            submitted = times.submitted
+            elapsed = 0.0 if submitted is None else time.time() - submitted
+            if threshold is None:
+                wait = _POLL_SEC
+            elif submitted is None:
+                wait = min(_POLL_SEC, threshold)
+            elif elapsed < threshold:
+                wait = min(_POLL_SEC, threshold - elapsed)
+            else:
+                dup_times = timing.NodeTimes(queued=times.queued, started=times.started)
+                dup = executor.submit(timing.record(dup_times, func), *args, **kwargs)
+                attempts[dup] = dup_times
+                stages._count(won=False)
+                break
+            futures.wait((first,), timeout=wait)
+
+    pending = set(attempts)
+    errors: Dict[futures.Future, Exception] = {}
+    while pending:
+        done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+        for attempt in sorted(done, key=lambda f: f is not first):
+            try:
+                result = attempt.result()
+            except Exception as exc:
+                errors[attempt] = exc
+                continue
+            for loser in pending:
+                loser.cancel()
+            won = attempts[attempt]
+            if attempt is not first:
+                stages._count(won=True)
+            if stages is not None and won.submitted and won.completed:
+                stages.record(stage, won.completed - won.submitted)
+            return result, won
+    raise errors.get(first) or next(iter(errors.values()))
@@ -1,8 +1,37 @@
 import json
+import logging
 import random
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from tiledb.cloud.dag import status as st
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_UPDATE_INTERVAL = 0.5
+"""Minimum time (sec) between two renders of an auto-updating visualization."""
+
+MAX_VISUALIZED_NODES = 1000
+"""Graphs with more nodes than this are rendered as a status summary."""
+
+_STATUS_STYLES = {
+    st.Status.NOT_STARTED: ("Not Started", "black"),
+    st.Status.RUNNING: ("Running", "blue"),
+    st.Status.COMPLETED: ("Completed", "green"),
+    st.Status.FAILED: ("Failed", "red"),
+    st.Status.CANCELLED: ("Cancelled", "yellow"),
+    st.Status.PARENT_FAILED: ("Parent Failed", "orange"),
+}
+
+# Statuses shown in summaries, with the matching ``DAG.stats`` keys.
+_SUMMARY_KEYS = {
+    st.Status.NOT_STARTED: "not_started",
+    st.Status.RUNNING: "running",
+    st.Status.COMPLETED: "completed",
+    st.Status.FAILED: "failed",
+    st.Status.CANCELLED: "cancelled",
+}
+
 
 def build_graph_node_details(nodes):
     """
@@ -14,26 +43,192 @@ def build_graph_node_details(nodes):
     node_colors = []
     node_text = []
     for node in nodes:
-        status = node.status
-        if status == st.Status.NOT_STARTED:
-            node_text.append("{} - Not Started".format(node.name))
-            node_colors.append("black")
-        elif status == st.Status.RUNNING:
-            node_text.append("{} - Running".format(node.name))
-            node_colors.append("blue")
-        elif status == st.Status.COMPLETED:
-            node_text.append("{} - Completed".format(node.name))
-            node_colors.append("green")
-        elif status == st.Status.FAILED:
-            node_text.append("{} - Failed".format(node.name))
-            node_colors.append("red")
-        elif status == st.Status.CANCELLED:
-            node_text.append("{} - Cancelled".format(node.name))
-            node_colors.append("yellow")
+        style = _STATUS_STYLES.get(node.status)
+        if style:
+            label, color = style
+            node_text.append("{} - {}".format(node.name, label))
+            node_colors.append(color)
 
     return (node_colors, node_text)
 
 
+class UpdateThrottler:
+    """Coalesces update requests into at most one render per interval.
+
+    Calling the throttler schedules a render ``interval`` seconds later,
+    unless one is already scheduled, so any number of status changes in
+    between cost a single render. Call :meth:`flush` to render immediately,
+    e.g. once the graph is done.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[], None],
+        interval: float = DEFAULT_UPDATE_INTERVAL,
+    ):
+        self._render = render
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def __call__(self, *_: Any) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self._interval, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self, *_: Any) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._render()
+
+    def _fire(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            self._render()
+        except Exception:
+            # Rendering runs on a timer thread, where errors cannot be handled.
+            logger.exception("Failed to update the graph visualization")
+
+
+class _StatusTracker:
+    """Tracks the status last rendered for each node of a graph."""
+
+    def __init__(self, nodes: Sequence[Any]):
+        self._nodes = list(nodes)
+        self._statuses: List[Optional[st.Status]] = [None] * len(self._nodes)
+
+    def changed(self) -> List[Tuple[int, st.Status]]:
+        """Returns the index and status of every node whose status changed
+        since the last call."""
+        changed = []
+        for i, node in enumerate(self._nodes):
+            status = node.status
+            if status != self._statuses[i]:
+                self._statuses[i] = status
+                changed.append((i, status))
+        return changed
+
+
+class PlotlyGraphUpdater:
+    """Updates the node markers of a plotly graph with node status changes."""
+
+    def __init__(self, nodes: Sequence[Any], fig):
+        self._nodes = list(nodes)
+        self.fig = fig
+        self._tracker = _StatusTracker(self._nodes)
+        self.colors: List[Optional[str]] = [None] * len(self._nodes)
+        self.text: List[Optional[str]] = [None] * len(self._nodes)
+        self._refresh()
+
+    def _refresh(self) -> bool:
+        changed = self._tracker.changed()
+        for i, status in changed:
+            label, color = _STATUS_STYLES[status]
+            self.colors[i] = color
+            self.text[i] = "{} - {}".format(self._nodes[i].name, label)
+        return bool(changed)
+
+    def __call__(self) -> None:
+        if self._refresh() and self.fig is not None:
+            self.fig.update_traces(
+                marker=dict(color=self.colors),
+                text=self.text,
+                selector=dict(mode="markers"),
+            )
+
+
+class TileDBGraphUpdater:
+    """Updates a tiledb plot widget graph with node status changes.
+
+    The nodes, edges and positions of the graph do not change, so they are
+    serialized once; each render only refreshes the details of the nodes
+    whose status changed.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[str],
+        edges: Sequence[Tuple[str, str]],
+        positions: Dict[str, Any],
+        dag_nodes: Dict[str, Any],
+        fig,
+    ):
+        self._ids = list(dag_nodes)
+        self.fig = fig
+        self._tracker = _StatusTracker(dag_nodes.values())
+        self.node_details: Dict[str, Dict[str, str]] = {
+            node_id: dict(name=node.name) for node_id, node in dag_nodes.items()
+        }
+        self._refresh()
+        static = json.dumps(dict(nodes=nodes, edges=edges, positions=positions))
+        self._prefix = static[:-1] + ', "node_details": '
+
+    def _refresh(self) -> bool:
+        changed = self._tracker.changed()
+        for i, status in changed:
+            self.node_details[self._ids[i]]["status"] = str(status)
+        return bool(changed)
+
+    def data(self) -> str:
+        """The JSON data of the widget."""
+        return self._prefix + json.dumps(self.node_details) + "}"
+
+    def __call__(self) -> None:
+        if self._refresh() and self.fig is not None:
+            self.fig.setData(self.data())
+
+
+def build_summary_figure(stats: Dict[str, Any], notebook: bool = True):
+    """
+    Build a bar chart of node counts by status, for graphs too large to draw.
+
+    :param stats: node statistics, as returned by ``DAG.stats``
+    :param notebook: Is the visualization inside a jupyter notebook?
+    :return: figure
+    """
+    import plotly.graph_objects as go
+
+    labels = [_STATUS_STYLES[s][0] for s in _SUMMARY_KEYS]
+    colors = [_STATUS_STYLES[s][1] for s in _SUMMARY_KEYS]
+    fig_obj = go.FigureWidget if notebook else go.Figure
+    fig = fig_obj(
+        data=[
+            go.Bar(
+                x=labels,
+                y=_summary_counts(stats),
+                marker=dict(color=colors),
+            )
+        ],
+        layout=go.Layout(
+            title="{} nodes".format(stats["total_count"]),
+            showlegend=False,
+            margin=dict(b=20, l=5, r=5, t=40),
+        ),
+    )
+    return fig
+
+
+def update_summary_figure(stats: Dict[str, Any], fig) -> None:
+    """
+    Update a bar chart built by :func:`build_summary_figure`.
+
+    :param stats: node statistics, as returned by ``DAG.stats``
+    :param fig: figure
+    """
+    if fig is not None:
+        fig.update_traces(y=_summary_counts(stats))
+
+
+def _summary_counts(stats: Dict[str, Any]) -> List[int]:
+    return [stats[key] for key in _SUMMARY_KEYS.values()]
+
+
 def update_plotly_graph(nodes, fig=None):
     """
     Update a graph based on based node status and figure
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
 
 import tiledb
@@ -17,6 +18,8 @@ from tiledb.cloud.utilities import get_logger_wrapper
 from tiledb.cloud.utilities import run_dag
 
 DEFAULT_FILE_INGESTION_NAME = "file-ingestion"
+DEFAULT_INGEST_WORKERS = 16
+"""The number of files ingested concurrently by each ingestion task."""
 
 
 def add_arrays_to_group_udf(
@@ -68,27 +71,33 @@ def ingest_files_udf(
     *,
     acn: Optional[str] = None,
     namespace: Optional[str] = None,
+    max_workers: int = DEFAULT_INGEST_WORKERS,
     verbose: bool = False,
 ) -> List[str]:
     """
     Ingest files.
 
+    Files are created and registered concurrently, and their resulting URIs are
+    taken from the create responses rather than looked up afterwards.
+
     :param dataset_uri: The dataset URI.
     :param file_uris: An iterable of file URIs.
     :param acn: Access Credentials Name (ACN) registered in TileDB Cloud (ARN type),
         defaults to None
     :param namespace: TileDB-Cloud namespace, defaults to None.
+    :param max_workers: Number of files ingested concurrently,
+        defaults to DEFAULT_INGEST_WORKERS.
     :param verbose: Verbose logging, defaults to False.
     :return List[str]: A list of the ingested files' resulting URIs.
     """
     logger = get_logger_wrapper(verbose)
 
-    ingested = []
-    for file_uri in file_uris:
+    namespace = namespace or tiledb.cloud.user_profile().default_namespace_charged
+
+    def ingest_file(file_uri: str) -> Optional[str]:
         filename = file_utils.sanitize_filename(os.path.basename(file_uri))
         array_uri = f"tiledb://{namespace}/{filename}"
         filestore_array_uri = f"{dataset_uri}/{filename}"
-        namespace = namespace or tiledb.cloud.user_profile().default_namespace_charged
         logger.debug(
             """
             ---------------------------------------------
@@ -101,7 +110,7 @@ def ingest_files_udf(
         )
 
         try:
-            file_utils.create_file(
+            created = file_utils.create_file(
                 namespace=namespace,
                 name=filename,
                 input_uri=file_uri,
@@ -109,23 +118,29 @@ def ingest_files_udf(
                 access_credentials_name=acn,
             )
 
-            array_info = info(array_uri)
-            ingested.append(array_info.tiledb_uri)
+            # The registered name is returned on creation. Only look the array
+            # up if it is missing.
+            if created is not None and created.file_name:
+                return f"tiledb://{namespace}/{created.file_name}"
+            return info(array_uri).tiledb_uri
         except tiledb_cloud_error.TileDBCloudError as exc:
-            error_msg = repr(exc)
+            error_msg = str(exc)
             if "array already exists at location - Code: 8003" in error_msg:
                 logger.warning("Array '%s' already exists." % array_uri)
-                continue
+                return None
             elif f"array {array_uri} is not unique" in error_msg:
                 logger.warning(
                     "Array URI %s is not unique. Skipping %s ingestion"
                     % (array_uri, filename)
                 )
-                continue
+                return None
             else:
                 raise exc
 
-    return ingested
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(ingest_file, file_uris))
+
+    return [uri for uri in results if uri is not None]
 
 
 def ingest_files(
@@ -136,6 +151,7 @@ def ingest_files(
     ignore: Optional[str] = None,
     max_files: Optional[int] = None,
     batch_size: Optional[int] = file_udfs.DEFAULT_BATCH_SIZE,
+    batch_bytes: Optional[int] = None,
     acn: Optional[str] = None,
     config: Optional[dict] = None,
     namespace: Optional[str] = None,
@@ -156,6 +172,8 @@ def ingest_files(
     :param max_files: maximum number of File URIs to read/find,
         defaults to None (no limit)
     :param batch_size: Batch size for file ingestion, defaults to 100.
+    :param batch_bytes: Target total size of the files of each ingestion batch.
+        Batches are balanced by file size either way, defaults to None.
     :param acn: Access Credentials Name (ACN) registered in TileDB Cloud (ARN type),
         defaults to None
     :param config: Config dictionary, defaults to None
@@ -202,6 +220,7 @@ def ingest_files(
                 - Exclude: %s
             - Max Files: %s
             - Batch Size: %s
+            - Batch Bytes: %s
         - Namespace: %s
         - Group URI: %s
         - Taskgraph Name: %s
@@ -215,6 +234,7 @@ def ingest_files(
             ignore,
             max_files,
             batch_size,
+            batch_bytes,
             namespace,
             group_uri,
             taskgraph_name,
@@ -240,6 +260,7 @@ def ingest_files(
                 include=pattern,
                 exclude=ignore,
                 max_files=max_files,
+                include_sizes=True,
                 verbose=verbose,
                 name=f"Find file URIs ({idx})",
                 resources=ingest_resources,
@@ -253,6 +274,8 @@ def ingest_files(
         items=results,
         batch_size=batch_size,
         flatten_items=True,
+        sized_items=True,
+        batch_bytes=batch_bytes,
         verbose=verbose,
         name="Break Found Files in Chunks",
         resources=ingest_resources,
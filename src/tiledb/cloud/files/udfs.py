@@ -1,12 +1,13 @@
 import itertools
 from functools import partial
 from math import ceil
-from typing import Any, List, Mapping, Optional, Sequence, TypeVar
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
 
 from tiledb.cloud.files import utils as file_utils
 from tiledb.cloud.utilities import chunk
-from tiledb.cloud.utilities import find
 from tiledb.cloud.utilities import get_logger_wrapper
+from tiledb.cloud.utilities import iter_files
+from tiledb.cloud.utilities import partition_by_size
 
 DEFAULT_BATCH_SIZE = 100
 _T = TypeVar("_T")
@@ -19,8 +20,9 @@ def find_uris_udf(
     include: Optional[str] = None,
     exclude: Optional[str] = None,
     max_files: Optional[int] = None,
+    include_sizes: bool = False,
     verbose: bool = False,
-) -> Sequence[str]:
+) -> Sequence[Union[str, Tuple[str, int]]]:
     """
     Find URIs matching a pattern in the `search_uri` path.
 
@@ -31,6 +33,8 @@ def find_uris_udf(
     :param include: include pattern used in the search, defaults to None
     :param exclude: exclude pattern applied to the search results, defaults to None
     :param max_files: maximum number of URIs returned, defaults to None
+    :param include_sizes: return (URI, size in bytes) pairs, as listed,
+        defaults to False
     :param verbose: verbose logging, defaults to False
     :return: list of URIs
     """
@@ -45,7 +49,7 @@ def find_uris_udf(
         exclude = partial(file_utils.basename_match, pattern=exclude)
 
     results = list(
-        find(
+        iter_files(
             search_uri,
             include=include,
             exclude=exclude,
@@ -53,6 +57,8 @@ def find_uris_udf(
             config=config,
         )
     )
+    if not include_sizes:
+        results = [uri for uri, _ in results]
 
     logger.info("Found %s files." % len(results))
     return results
@@ -62,15 +68,27 @@ def chunk_udf(
     items: Sequence[_T],
     batch_size: Optional[int] = None,
     flatten_items: bool = False,
+    sized_items: bool = False,
+    batch_bytes: Optional[int] = None,
     verbose: bool = False,
 ) -> List[List[str]]:
     """
     Flatten and break an iterable into batches of a specified size.
 
+    With `sized_items`, the items are (item, size in bytes) pairs, such as
+    returned by `find_uris_udf(include_sizes=True)`. The items are then split
+    into batches of similar total size (see `partition_by_size`), holding at
+    most `batch_size` items and about `batch_bytes` each, and the sizes are
+    dropped from the result.
+
     :param items: An iterable to be split into chunks.
     :param batch_size: Resulting chunk size, defaults to None.
     :param flatten_items: If set to True, it will flatten the `items` iterable,
         defaults to False
+    :param sized_items: If set to True, the items are (item, size) pairs and the
+        chunks are balanced by size, defaults to False
+    :param batch_bytes: Target total size of each chunk of sized items,
+        defaults to None
     :param verbose: Verbose logging, defaults to False
     :return List[List[str]]: A list of chunks as lists.
     """
@@ -82,6 +100,17 @@ def chunk_udf(
         logger.debug("Flattened list of items to be chunked: %s" % items)
 
     batch_size = batch_size or DEFAULT_BATCH_SIZE
+
+    if sized_items:
+        chunked = partition_by_size(
+            [item for item, _ in items],
+            [size for _, size in items],
+            max_batch_items=batch_size,
+            target_batch_bytes=batch_bytes,
+        )
+        logger.info("Split results into %s size-balanced chunks." % len(chunked))
+        return chunked
+
     batch_size = min(batch_size, len(items))
     num_chunks = ceil(len(items) / batch_size)
     logger.info("Splitting results into %s chunks..." % num_chunks)
@@ -1,5 +1,11 @@
+import hashlib
+import inspect
+import io
+import itertools
+import json
 import math
 import os
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from functools import partial
 from typing import (
@@ -7,6 +13,7 @@ from typing import (
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
@@ -24,9 +31,10 @@ from tiledb.cloud.utilities import Profiler
 from tiledb.cloud.utilities import as_batch
 from tiledb.cloud.utilities import chunk
 from tiledb.cloud.utilities import create_log_array
-from tiledb.cloud.utilities import find
 from tiledb.cloud.utilities import get_logger_wrapper
+from tiledb.cloud.utilities import iter_files
 from tiledb.cloud.utilities import max_memory_usage
+from tiledb.cloud.utilities import partition_by_size
 from tiledb.cloud.utilities import run_dag
 
 DEFAULT_RESOURCES = {"cpu": "2", "memory": "2Gi"}
@@ -41,6 +49,10 @@ POINT_CLOUD_CHUNK_SIZE = 1_000_000
 GEOMETRY_CHUNK_SIZE = 100_000
 MAX_WORKERS = 40
 BATCH_SIZE = 10
+# Concurrent source files opened when loading metadata
+METADATA_WORKERS = 16
+# Bytes fetched per ranged read when parsing point cloud headers
+HEADER_READ_SIZE = 64 * 1024
 
 XYZBoundsTuple = Tuple[float, float, float, float, float, float]
 XYBoundsTuple = Tuple[float, float, float, float]
@@ -125,6 +137,129 @@ class GeoMetadata:
     geometry_schema: Optional[dict] = None
 
 
+def _metadata_cache_path(cache_uri: str, uri: str) -> str:
+    """Return the URI of the cached metadata entry for a source file."""
+    key = hashlib.sha256(uri.encode()).hexdigest()
+    return f"{cache_uri.rstrip('/')}/{key}.json"
+
+
+def _dump_cache_entry(size: int, meta: GeoMetadata) -> bytes:
+    """Serialize a metadata cache entry.
+
+    Entries are JSON rather than pickles, since the cache may be shared and
+    must not be able to run code when read. The CRS is stored as WKT.
+    """
+
+    def default(value: Any) -> Any:
+        # NumPy scalars, e.g. read from file headers.
+        if hasattr(value, "item"):
+            return value.item()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    fields = attrs.asdict(meta, recurse=False)
+    fields["extents"] = attrs.asdict(meta.extents)
+    fields["path"] = None if meta.path is None else str(meta.path)
+    if meta.crs is not None:
+        fields["crs"] = meta.crs if isinstance(meta.crs, str) else meta.crs.to_wkt()
+    if meta.geometry_schema is not None:
+        fields["geometry_schema"] = {
+            "geometry": meta.geometry_schema["geometry"],
+            "properties": list(meta.geometry_schema["properties"].items()),
+        }
+    entry = {"size": size, "metadata": fields}
+    return json.dumps(entry, default=default).encode()
+
+
+def _load_cache_entry(
+    data: bytes, crs_type: Optional[type] = None
+) -> Tuple[int, GeoMetadata]:
+    """Deserialize a metadata cache entry written by `_dump_cache_entry`.
+
+    :param data: the serialized entry
+    :param crs_type: CRS class to rebuild the CRS with from its WKT,
+        e.g. `rasterio.crs.CRS`
+    """
+    entry = json.loads(data)
+    fields = entry["metadata"]
+    fields["extents"] = BoundingBox(**fields["extents"])
+    for name in ("res", "scales", "offsets"):
+        if fields[name] is not None:
+            fields[name] = tuple(fields[name])
+    if fields["crs"] is not None and crs_type is not None:
+        fields["crs"] = crs_type.from_wkt(fields["crs"])
+    schema = fields["geometry_schema"]
+    if schema is not None:
+        fields["geometry_schema"] = {
+            "geometry": schema["geometry"],
+            "properties": dict(schema["properties"]),
+        }
+    return int(entry["size"]), GeoMetadata(**fields)
+
+
+def _load_metadata(
+    sources: Iterable[os.PathLike],
+    read_fn: Callable[[os.PathLike], GeoMetadata],
+    *,
+    vfs: tiledb.VFS,
+    logger,
+    cache_uri: Optional[str] = None,
+    max_workers: int = METADATA_WORKERS,
+    crs_type: Optional[type] = None,
+) -> List[GeoMetadata]:
+    """Load the metadata of source files concurrently.
+
+    When `cache_uri` is given, the metadata of each source is persisted there,
+    keyed by the source URI and its size in bytes. Sources whose size did not
+    change since they were cached are not opened again. A cached source still
+    costs a size request and a read of its small cache entry, in place of
+    opening and parsing the source.
+
+    :param sources: paths to process
+    :param read_fn: function returning the metadata of a single source
+    :param vfs: VFS used to access the sources and the cache
+    :param logger: logger
+    :param cache_uri: optional URI of the metadata cache directory
+    :param max_workers: maximum number of sources opened concurrently
+    :param crs_type: CRS class of the metadata returned by `read_fn`, which
+        cached CRSs are rebuilt with
+    :return: metadata for each source, in the same order as `sources`
+    """
+
+    def load(pth: os.PathLike) -> GeoMetadata:
+        if not cache_uri:
+            logger.debug("finding metadata for %r", pth)
+            return read_fn(pth)
+
+        size = vfs.file_size(str(pth))
+        entry_uri = _metadata_cache_path(cache_uri, str(pth))
+        try:
+            with vfs.open(entry_uri, "rb") as f:
+                cached_size, meta = _load_cache_entry(f.read(), crs_type)
+            if cached_size == size:
+                logger.debug("using cached metadata for %r", pth)
+                return meta
+        except Exception:
+            # A missing or unreadable entry is a cache miss.
+            pass
+
+        logger.debug("finding metadata for %r", pth)
+        meta = read_fn(pth)
+        try:
+            # Serialized first, so that a failure leaves no partial entry.
+            entry = _dump_cache_entry(size, meta)
+            with vfs.open(entry_uri, "wb") as f:
+                f.write(entry)
+        except Exception as e:
+            logger.warning("failed to cache metadata for %r: %s", pth, e)
+        return meta
+
+    if cache_uri and not vfs.is_dir(cache_uri):
+        vfs.create_dir(cache_uri)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(load, sources))
+
+
 def load_pointcloud_metadata(
     sources: Iterable[os.PathLike],
     *,
@@ -133,6 +268,8 @@ def load_pointcloud_metadata(
     id: str = "pointcloud_metadata",
     trace: bool = False,
     log_uri: Optional[str] = None,
+    cache_uri: Optional[str] = None,
+    max_workers: int = METADATA_WORKERS,
 ) -> Sequence[GeoMetadata]:
     """Return geospatial metadata for a sequence of input point cloud data files
 
@@ -141,6 +278,10 @@ def load_pointcloud_metadata(
     :param verbose: bool, enable verbose logging, default is False
     :param trace: bool, enable trace logging, default is False
     :param log_uri: Optional[str] = None,
+    :param cache_uri: Optional[str], URI to persist metadata of the sources,
+        default is None
+    :param max_workers: int, maximum number of files opened concurrently,
+        defaults to METADATA_WORKERS
     :Return: list[GeoMetadata], a list of populated GeoMetadata objects
     """
     import laspy
@@ -152,35 +293,34 @@ def load_pointcloud_metadata(
         vfs = tiledb.VFS()
         logger = get_logger_wrapper(verbose)
         with Profiler(array_uri=log_uri, id=id, trace=trace):
-            meta = []
-            mins = None
-            maxs = None
-
-            for f in sources:
-                logger.debug("finding metadata for %r", f)
-                with vfs.open(f, "rb") as src:
-                    # only open header
-                    las = laspy.open(src)
-                    hdr = las.header
-                    mins = _fold_in(min, mins, hdr.mins)
-                    maxs = _fold_in(max, maxs, hdr.maxs)
-                    meta.append(
-                        GeoMetadata(
-                            path=f,
-                            extents=BoundingBox(
-                                minx=hdr.mins[0],
-                                miny=hdr.mins[1],
-                                minz=hdr.mins[2],
-                                maxx=hdr.maxs[0],
-                                maxy=hdr.maxs[1],
-                                maxz=hdr.maxs[2],
-                            ),
-                            scales=tuple(hdr.scales),
-                            offsets=tuple(hdr.offsets),
-                        )
+
+            def read_metadata(f: os.PathLike) -> GeoMetadata:
+                with vfs.open(f, "rb") as raw:
+                    # only read the header, with as few ranged reads as possible
+                    src = io.BufferedReader(raw, buffer_size=HEADER_READ_SIZE)
+                    hdr = laspy.open(src, closefd=False).header
+                    return GeoMetadata(
+                        path=f,
+                        extents=BoundingBox(
+                            minx=hdr.mins[0],
+                            miny=hdr.mins[1],
+                            minz=hdr.mins[2],
+                            maxx=hdr.maxs[0],
+                            maxy=hdr.maxs[1],
+                            maxz=hdr.maxs[2],
+                        ),
+                        scales=tuple(hdr.scales),
+                        offsets=tuple(hdr.offsets),
                     )
 
-            return meta
+            return _load_metadata(
+                sources,
+                read_metadata,
+                vfs=vfs,
+                logger=logger,
+                cache_uri=cache_uri,
+                max_workers=max_workers,
+            )
 
 
 def load_geometry_metadata(
@@ -191,6 +331,8 @@ def load_geometry_metadata(
     id: str = "pointcloud_metadata",
     trace: bool = False,
     log_uri: Optional[str] = None,
+    cache_uri: Optional[str] = None,
+    max_workers: int = METADATA_WORKERS,
 ) -> Sequence[GeoMetadata]:
     """Return geospatial metadata for a sequence of input geometry data files
 
@@ -199,6 +341,10 @@ def load_geometry_metadata(
     :param verbose: bool, enable verbose logging, default is False
     :param trace: bool, enable trace logging, default is False
     :param log_uri: Optional[str] = None,
+    :param cache_uri: Optional[str], URI to persist metadata of the sources,
+        default is None
+    :param max_workers: int, maximum number of files opened concurrently,
+        defaults to METADATA_WORKERS
     :Return: list[GeoMetadata], a list of populated GeoMetadata objects
     """
     # note this will be refactored to use /vsipyopener in fiona
@@ -216,9 +362,7 @@ def load_geometry_metadata(
         with Profiler(array_uri=log_uri, id=id, trace=trace):
             # for geometries we need the maximum extents
             # and to check geometry types / crs are the same
-            meta = []
-            for pth in sources:
-                logger.debug("finding metadata for %r", pth)
+            def read_metadata(pth: os.PathLike) -> GeoMetadata:
                 with fiona.open(pth, opener=vfs.open) as src:
                     # 2.5 is supported internally but not needed for ingest
                     extents = BoundingBox(
@@ -227,16 +371,22 @@ def load_geometry_metadata(
                         maxx=src.bounds[2],
                         maxy=src.bounds[3],
                     )
-                    meta.append(
-                        GeoMetadata(
-                            extents=extents,
-                            crs=src.crs,
-                            path=pth,
-                            geometry_schema=src.schema,
-                        )
+                    return GeoMetadata(
+                        extents=extents,
+                        crs=src.crs,
+                        path=pth,
+                        geometry_schema=src.schema,
                     )
 
-            return meta
+            return _load_metadata(
+                sources,
+                read_metadata,
+                vfs=vfs,
+                logger=logger,
+                cache_uri=cache_uri,
+                max_workers=max_workers,
+                crs_type=fiona.crs.CRS,
+            )
 
 
 def load_raster_metadata(
@@ -247,6 +397,8 @@ def load_raster_metadata(
     id: str = "raster_metadata",
     trace: bool = False,
     log_uri: Optional[str] = None,
+    cache_uri: Optional[str] = None,
+    max_workers: int = METADATA_WORKERS,
 ) -> Sequence[GeoMetadata]:
     """Return geospatial metadata for a sequence of input raster data files
 
@@ -256,6 +408,10 @@ def load_raster_metadata(
     :param trace: bool, enable trace logging, default is False
     :param id: str, ID for logging
     :param log_uri: Optional[str] = None,
+    :param cache_uri: Optional[str], URI to persist metadata of the sources,
+        default is None
+    :param max_workers: int, maximum number of files opened concurrently,
+        defaults to METADATA_WORKERS
     :Return: list[GeoMetadata]: list of populated GeoMetadata objects
     """
     import rasterio
@@ -267,11 +423,9 @@ def load_raster_metadata(
 
     with tiledb.scope_ctx(config):
         with Profiler(array_uri=log_uri, id=id, trace=trace):
-            meta = []
             vfs = tiledb.VFS(config=config)
 
-            for pth in sources:
-                logger.debug("Including %r", pth)
+            def read_metadata(pth: os.PathLike) -> GeoMetadata:
                 with rasterio.open(pth, opener=vfs.open) as src:
                     extents = BoundingBox(
                         minx=src.bounds[0],
@@ -281,7 +435,7 @@ def load_raster_metadata(
                     )
 
                     logger.debug("Extents for %r %r", pth, extents)
-                    m = GeoMetadata(
+                    return GeoMetadata(
                         extents=extents,
                         crs=src.crs,
                         path=pth,
@@ -290,7 +444,16 @@ def load_raster_metadata(
                         band_count=src.count,
                         nodata=src.nodata,
                     )
-                    meta.append(m)
+
+            meta = _load_metadata(
+                sources,
+                read_metadata,
+                vfs=vfs,
+                logger=logger,
+                cache_uri=cache_uri,
+                max_workers=max_workers,
+                crs_type=rasterio.crs.CRS,
+            )
 
             if not meta:
                 raise ValueError("Raster datasets not found")
@@ -298,6 +461,67 @@ def load_raster_metadata(
             return meta
 
 
+_ItemT = TypeVar("_ItemT")
+
+
+def _prefetch(items: Iterable[_ItemT]) -> Iterator[_ItemT]:
+    """Iterate while producing the next item in a background thread.
+
+    At most one item is produced ahead of the consumer, so the work done by
+    the iterator (e.g. reading and decoding) overlaps with the work done by
+    the consumer (e.g. writing) with bounded memory.
+
+    :param items: iterable to consume
+    :return: iterator over the same items
+    """
+    items = iter(items)
+    done = object()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(next, items, done)
+        while True:
+            item = pending.result()
+            if item is done:
+                return
+            pending = executor.submit(next, items, done)
+            yield item
+
+
+def _point_array(chunk, size: int):
+    """Allocate a reusable point buffer with float64 X/Y/Z for laspy chunks.
+
+    :param chunk: laspy ScaleAwarePointRecord used as a template
+    :param size: number of points the buffer holds
+    :return: structured NumPy array
+    """
+    import numpy as np
+
+    dtype = np.dtype(
+        [("X", "float64"), ("Y", "float64"), ("Z", "float64")]
+        + chunk.array.dtype.descr[3:]
+    )
+    return np.empty(size, dtype=dtype)
+
+
+def _fill_point_array(buffer, chunk) -> int:
+    """Copy a laspy chunk into a point buffer, scaling X/Y/Z in place.
+
+    :param buffer: array returned by _point_array
+    :param chunk: laspy ScaleAwarePointRecord
+    :return: number of points written to the start of the buffer
+    """
+    import numpy as np
+
+    n = len(chunk)
+    arr = buffer[:n]
+    for name in buffer.dtype.names[3:]:
+        arr[name] = chunk.array[name]
+    for i, dim in enumerate(("X", "Y", "Z")):
+        out = arr[dim]
+        np.multiply(chunk.array[dim], chunk.scales[i], out=out)
+        out += chunk.offsets[i]
+    return n
+
+
 def ingest_geometry_udf(
     *,
     dataset_uri: str,
@@ -479,7 +703,6 @@ def ingest_point_cloud_udf(
     :return: if not appending then a sequence of file paths
     """
     import laspy
-    import numpy as np
     import pdal
 
     if not append and args:
@@ -527,16 +750,30 @@ def ingest_point_cloud_udf(
             vfs = tiledb.VFS()
             logger = get_logger_wrapper(verbose)
 
-            def get_pc_array(chunk):
-                new_dt = np.dtype(
-                    [("X", "float64"), ("Y", "float64"), ("Z", "float64")]
-                    + chunk.array.dtype.descr[3:]
-                )
-                arr = np.array(chunk.array, dtype=new_dt)
-                arr["X"] = chunk.x
-                arr["Y"] = chunk.y
-                arr["Z"] = chunk.z
-                return arr
+            # Stream chunks into a single writer per file when PDAL supports
+            # populating input buffers from a callback (python-pdal >= 3.4).
+            streaming = "stream_handlers" in inspect.signature(pdal.Pipeline).parameters
+
+            def write_chunks(chunks: Iterator, buffer) -> None:
+                """Append point cloud chunks to the dataset through a buffer."""
+                if streaming:
+
+                    def load_next_chunk() -> int:
+                        c = next(chunks, None)
+                        return 0 if c is None else _fill_point_array(buffer, c)
+
+                    pipeline = pdal.Writer.tiledb(
+                        array_name=dataset_uri, stats=stats, append=True
+                    ).pipeline()
+                    pipeline.inputs = [(buffer, load_next_chunk)]
+                    pipeline.execute_streaming(chunk_size)
+                else:
+                    for c in chunks:
+                        n = _fill_point_array(buffer, c)
+                        pipeline = pdal.Writer.tiledb(
+                            array_name=dataset_uri, stats=stats, append=True
+                        ).pipeline(buffer[:n])
+                        pipeline.execute()
 
             try:
                 if append:
@@ -544,14 +781,15 @@ def ingest_point_cloud_udf(
                         logger.debug("ingesting point cloud %r", f)
                         with vfs.open(f, "rb") as src:
                             las = laspy.open(src)
-                            chunk_itr = las.chunk_iterator(chunk_size)
-
-                            for c in chunk_itr:
-                                arr = get_pc_array(c)
-                                pipeline = pdal.Writer.tiledb(
-                                    array_name=dataset_uri, stats=stats, append=append
-                                ).pipeline(arr)
-                                pipeline.execute()
+                            chunk_itr = _prefetch(las.chunk_iterator(chunk_size))
+                            first_chunk = next(chunk_itr, None)
+                            if first_chunk is None:
+                                continue
+
+                            buffer = _point_array(first_chunk, chunk_size)
+                            write_chunks(
+                                itertools.chain([first_chunk], chunk_itr), buffer
+                            )
                     return
 
                 if extents:
@@ -559,9 +797,10 @@ def ingest_point_cloud_udf(
                     logger.debug("creating point cloud schema from %r", template_sample)
                     with vfs.open(template_sample, "rb") as src:
                         las = laspy.open(src)
-                        chunk_itr = las.chunk_iterator(chunk_size)
+                        chunk_itr = _prefetch(las.chunk_iterator(chunk_size))
                         first_chunk = next(chunk_itr)
-                        arr = get_pc_array(first_chunk)
+                        buffer = _point_array(first_chunk, chunk_size)
+                        arr = buffer[: _fill_point_array(buffer, first_chunk)]
                         if offsets and scales:
                             pipeline = pdal.Writer.tiledb(
                                 array_name=dataset_uri,
@@ -593,12 +832,7 @@ def ingest_point_cloud_udf(
 
                         pipeline.execute()
 
-                        for c in chunk_itr:
-                            arr = get_pc_array(c)
-                            pipeline = pdal.Writer.tiledb(
-                                array_name=dataset_uri, stats=stats, append=True
-                            ).pipeline(arr)
-                            pipeline.execute()
+                        write_chunks(chunk_itr, buffer)
 
                     return [{"sources": s} for s in chunk(sources[1:], batch_size)]
                 else:
@@ -827,7 +1061,11 @@ def ingest_raster_udf(
                     resampling = rasterio.enums.Resampling[resampling.lower()]
 
                 with rasterio.open(dataset_uri, mode="r+", driver="TileDB") as dst:
-                    for c in sources:
+                    indexes = list(dst.indexes)
+                    dst_transform = dst.transform
+
+                    def merge_block(c: GeoBlockMetadata):
+                        """Read and merge all bands of a block in one pass."""
                         input_datasets = [
                             rasterio.open(f, opener=vfs.open, STATS=stats)
                             for f in c.files
@@ -842,29 +1080,33 @@ def ingest_raster_udf(
                                 c.ranges[0][1] - row_off,
                             )
                             chunk_bounds = rasterio.windows.bounds(
-                                chunk_window, dst.transform
+                                chunk_window, dst_transform
                             )
-
-                            for bidx in dst.indexes:
-                                chunk_arr, _ = rasterio.merge.merge(
-                                    input_datasets,
-                                    bounds=chunk_bounds,
-                                    nodata=nodata,
-                                    indexes=[bidx],
-                                )
-                                dst.write(
-                                    chunk_arr, indexes=[bidx], window=chunk_window
-                                )
-
-                            logger.debug(
-                                "Written %r coords %r bounds to %r",
-                                chunk_window,
-                                chunk_bounds,
-                                dataset_uri,
+                            chunk_arr, _ = rasterio.merge.merge(
+                                input_datasets,
+                                bounds=chunk_bounds,
+                                nodata=nodata,
+                                indexes=indexes,
                             )
+                            return chunk_window, chunk_bounds, chunk_arr
                         finally:
                             for s in input_datasets:
                                 s.close()
+
+                    def write_block(merged) -> None:
+                        chunk_window, chunk_bounds, chunk_arr = merged
+                        dst.write(chunk_arr, indexes=indexes, window=chunk_window)
+                        logger.debug(
+                            "Written %r coords %r bounds to %r",
+                            chunk_window,
+                            chunk_bounds,
+                            dataset_uri,
+                        )
+
+                    # Merge the next block while the current one is written,
+                    # keeping at most two blocks in memory.
+                    for merged in _prefetch(map(merge_block, sources)):
+                        write_block(merged)
                 return
             finally:
                 logger.info(
@@ -1033,6 +1275,7 @@ def build_file_list_udf(
                 },
             }
 
+            sizes = []
             if dataset_list_uri:
                 sources = read_uris(
                     dataset_list_uri,
@@ -1050,18 +1293,26 @@ def build_file_list_udf(
                 if ignore:
                     ignore = partial(file_utils.basename_match, pattern=ignore)
 
-                sources = find(
+                sources = []
+                for source, size in iter_files(
                     search_uri,
                     config=config,
                     exclude=ignore,
                     include=pattern,
                     max_count=max_files,
-                )
+                ):
+                    sources.append(source)
+                    sizes.append(size)
 
             if not sources:
                 raise ValueError(f"No {dataset_type.name} datasets found")
 
-            return list(chunk(list(sources), BATCH_SIZE))
+            # Dataset lists carry no sizes, which balances batches by count.
+            return partition_by_size(
+                list(sources),
+                sizes or [0] * len(sources),
+                max_batch_items=BATCH_SIZE,
+            )
         finally:
             logger.info("max memory usage: %.3f GiB", max_memory_usage() / (1 << 30))
 
@@ -1078,6 +1329,7 @@ def build_inputs_udf(
     nodata: Optional[float] = None,
     resampling: Optional[str] = "bilinear",
     res: Tuple[float, float] = None,
+    metadata_cache_uri: Optional[str] = None,
     verbose: bool = False,
     trace: bool = False,
     log_uri: Optional[str] = None,
@@ -1097,6 +1349,8 @@ def build_inputs_udf(
     :param resampling: string, resampling method,
         one of None, bilinear, cubic, nearest and average
     :param res: Tuple[float, float], output resolution in x/y
+    :param metadata_cache_uri: URI to persist the metadata of the sources,
+        so unchanged sources are not opened again, defaults to None
     :param verbose: verbose logging, defaults to False
     :param trace: bool, enabling log tracing,    to False
     :param log_uri: log array URI
@@ -1120,7 +1374,9 @@ def build_inputs_udf(
 
             kwargs = {}
 
-            meta = fns[dataset_type]["meta_fn"](sources, config=config)
+            meta = fns[dataset_type]["meta_fn"](
+                sources, config=config, cache_uri=metadata_cache_uri
+            )
 
             if dataset_type == DatasetType.POINTCLOUD:
                 kwargs.update(
@@ -1178,6 +1434,7 @@ def ingest_datasets_dag(
     nodata: Optional[float] = None,
     resampling: Optional[str] = "bilinear",
     res: Tuple[float, float] = None,
+    metadata_cache_uri: Optional[str] = None,
     stats: bool = False,
     verbose: bool = False,
     trace: bool = False,
@@ -1215,6 +1472,9 @@ def ingest_datasets_dag(
     :param resampling: string, resampling method,
         one of None, bilinear, cubic, nearest and average
     :param res: Tuple[float, float], output resolution in x/y
+    :param metadata_cache_uri: URI to persist the metadata of the sources,
+        so re-ingesting or appending does not open unchanged sources again,
+        defaults to None
     :param stats: bool, print TileDB stats to stdout
     :param verbose: verbose logging, defaults to False
     :param trace: bool, enabling log tracing, defaults to False
@@ -1281,6 +1541,7 @@ def ingest_datasets_dag(
         nodata=nodata,
         resampling=resampling,
         res=res,
+        metadata_cache_uri=metadata_cache_uri,
         verbose=verbose,
         trace=trace,
         log_uri=log_uri,
@@ -1465,6 +1726,7 @@ def ingest_datasets(
     chunk_size: int = POINT_CLOUD_CHUNK_SIZE,
     nodata: Optional[float] = None,
     res: Tuple[float, float] = None,
+    metadata_cache_uri: Optional[str] = None,
     stats: bool = False,
     verbose: bool = False,
     trace: bool = False,
@@ -1500,6 +1762,9 @@ def ingest_datasets(
     :param chunk_size: for point cloud this is the PDAL chunk size, defaults to 1000000
     :param nodata: NODATA value for rasters
     :param res: Tuple[float, float], output resolution in x/y
+    :param metadata_cache_uri: URI to persist the metadata of the sources,
+        so re-ingesting or appending does not open unchanged sources again,
+        defaults to None
     :param stats: bool, print TileDB stats to stdout
     :param verbose: verbose logging, defaults to False
     :param trace: bool, enable trace for logging, defaults to False
@@ -1542,6 +1807,7 @@ def ingest_datasets(
         chunk_size=chunk_size,
         nodata=nodata,
         res=res,
+        metadata_cache_uri=metadata_cache_uri,
         stats=stats,
         verbose=verbose,
         trace=trace,
@@ -0,0 +1,284 @@
+"""Instrumentation of the HTTP requests made to TileDB Cloud.
+
+Every request the REST API clients send goes through
+:class:`tiledb.cloud.pool_manager_wrapper._PoolManagerWrapper`, which reports
+a :class:`RequestEvent` to the :class:`Instrumentation` of its
+:class:`tiledb.cloud.client.Client`. The instrumentation keeps latency
+histograms and counters per endpoint, and passes each event to the hooks
+registered with :meth:`Instrumentation.add_hook`, e.g. an
+:class:`OpenTelemetryExporter`::
+
+    from tiledb.cloud import client
+    from tiledb.cloud import instrumentation
+
+    client.client.instrumentation.add_hook(instrumentation.OpenTelemetryExporter())
+    ...
+    for endpoint, stats in client.client.instrumentation.stats().items():
+        print(endpoint, stats.requests, stats.latency.quantile(0.99))
+"""
+
+import bisect
+import contextlib
+import contextvars
+import copy
+import logging
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import attrs
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+"""Upper bounds (in seconds) of the request latency histogram buckets."""
+
+_endpoint: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar(
+    "tiledb_cloud_endpoint", default=None
+)
+
+
+@contextlib.contextmanager
+def endpoint(path_template: str) -> Iterator[None]:
+    """Names the endpoint of the requests sent within the context.
+
+    The API client sets this to the path template of the operation (e.g.
+    ``/arrays/{namespace}/{array}``), so requests for different arrays are
+    counted under the same endpoint.
+    """
+    token = _endpoint.set(path_template)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def current_endpoint() -> Optional[str]:
+    """The endpoint named by the innermost :func:`endpoint` context, if any."""
+    return _endpoint.get()
+
+
+@attrs.define(frozen=True)
+class RequestEvent:
+    """A completed (or failed) HTTP request."""
+
+    method: str
+    """The HTTP method."""
+    endpoint: str
+    """The path template of the API operation, or the URL path if unknown."""
+    host: str
+    """The host the request was sent to, after applying cached redirects."""
+    status: Optional[int]
+    """The HTTP status of the response, or None if no response was received."""
+    duration_sec: float
+    """The time from sending the request to receiving the response headers
+    (and the body, if it was preloaded)."""
+    request_bytes: int
+    """The size of the request body."""
+    response_bytes: int
+    """The size of the response body, if known."""
+    retries: int
+    """The number of times the request was retried (excluding redirects)."""
+    redirect_cached: bool
+    """True if the request was sent to a cached redirect location."""
+    error: Optional[str] = None
+    """The type of the exception raised by the request, if any."""
+
+
+class Histogram:
+    """A fixed-bucket histogram of observed values. Not thread-safe."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        """Upper bounds of the buckets; the last bucket is unbounded."""
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        """Number of values observed in each bucket."""
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+@attrs.define
+class EndpointStats:
+    """Aggregated statistics of the requests to one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    """Requests that raised an exception or got a 4xx/5xx response."""
+    retries: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    latency: Histogram = attrs.field(factory=Histogram)
+    """Request durations, in seconds."""
+
+    def add(self, event: RequestEvent) -> None:
+        self.requests += 1
+        if event.error or (event.status or 0) >= 400:
+            self.errors += 1
+        self.retries += event.retries
+        self.request_bytes += event.request_bytes
+        self.response_bytes += event.response_bytes
+        self.latency.observe(event.duration_sec)
+
+
+RequestHook = Callable[[RequestEvent], None]
+"""A function called with every request event."""
+
+
+class Instrumentation:
+    """Collects statistics about HTTP requests and dispatches them to hooks.
+
+    All methods are thread-safe. Hooks are called on the thread that made the
+    request, so they should be fast; exceptions they raise are logged and
+    otherwise ignored.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hooks: Tuple[RequestHook, ...] = ()
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._redirect_hits = 0
+        self._redirect_misses = 0
+
+    def add_hook(self, hook: RequestHook) -> Callable[[], None]:
+        """Registers a hook to be called with every request event.
+
+        :return: A function that removes the hook.
+        """
+        with self._lock:
+            self._hooks += (hook,)
+
+        def remove() -> None:
+            with self._lock:
+                self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+        return remove
+
+    def record(self, event: RequestEvent) -> None:
+        """Records a request event. Called by the pool manager wrapper."""
+        key = (event.method, event.endpoint)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.add(event)
+            if event.redirect_cached:
+                self._redirect_hits += 1
+            else:
+                self._redirect_misses += 1
+            hooks = self._hooks
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("Request hook %r failed", hook)
+
+    def stats(self) -> Dict[str, EndpointStats]:
+        """Returns a snapshot of the statistics of each ``"METHOD endpoint"``."""
+        with self._lock:
+            return {
+                f"{method} {endpoint}": copy.deepcopy(stats)
+                for (method, endpoint), stats in self._stats.items()
+            }
+
+    @property
+    def redirect_cache_hit_rate(self) -> float:
+        """The fraction of requests sent straight to a cached redirect host."""
+        with self._lock:
+            total = self._redirect_hits + self._redirect_misses
+            return self._redirect_hits / total if total else 0.0
+
+    def reset(self) -> None:
+        """Clears all statistics. Hooks stay registered."""
+        with self._lock:
+            self._stats.clear()
+            self._redirect_hits = 0
+            self._redirect_misses = 0
+
+
+class OpenTelemetryExporter:
+    """A request hook recording request metrics with OpenTelemetry.
+
+    Requires the ``opentelemetry-api`` package (the ``otel`` extra). Metrics
+    go to the global meter provider unless another one is given, and are
+    attributed with the HTTP method, endpoint, status and host:
+
+    - ``tiledb.cloud.http.client.duration``: histogram of durations, in seconds
+    - ``tiledb.cloud.http.client.request.size``: counter of request bytes
+    - ``tiledb.cloud.http.client.response.size``: counter of response bytes
+    - ``tiledb.cloud.http.client.retries``: counter of retries
+    """
+
+    def __init__(self, meter_provider=None):
+        try:
+            from opentelemetry import metrics
+        except ImportError as ie:
+            raise ImportError(
+                "OpenTelemetryExporter requires the opentelemetry-api package"
+            ) from ie
+
+        meter = metrics.get_meter("tiledb.cloud", meter_provider=meter_provider)
+        self._duration = meter.create_histogram(
+            "tiledb.cloud.http.client.duration",
+            unit="s",
+            description="Duration of HTTP requests to TileDB Cloud",
+        )
+        self._request_size = meter.create_counter(
+            "tiledb.cloud.http.client.request.size", unit="By"
+        )
+        self._response_size = meter.create_counter(
+            "tiledb.cloud.http.client.response.size", unit="By"
+        )
+        self._retries = meter.create_counter("tiledb.cloud.http.client.retries")
+
+    def __call__(self, event: RequestEvent) -> None:
+        attributes = {
+            "http.request.method": event.method,
+            "http.route": event.endpoint,
+            "server.address": event.host,
+        }
+        if event.status is not None:
+            attributes["http.response.status_code"] = event.status
+        if event.error:
+            attributes["error.type"] = event.error
+        self._duration.record(event.duration_sec, attributes)
+        self._request_size.add(event.request_bytes, attributes)
+        self._response_size.add(event.response_bytes, attributes)
+        if event.retries:
+            self._retries.add(event.retries, attributes)
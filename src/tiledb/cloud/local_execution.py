@@ -0,0 +1,276 @@
+"""Client-side execution of small array UDF requests.
+
+Every :func:`tiledb.cloud.array.apply` call normally runs on the server, so
+even a read of a few cells pays the full latency of a remote UDF. With local
+execution enabled, each request's result size is estimated from the array
+schema and non-empty domain, and requests small enough are instead run on
+the client: the slice is read with TileDB-Py (through a cached open array)
+and passed to the function directly::
+
+    from tiledb.cloud import client
+    from tiledb.cloud import local_execution
+
+    client.client.local_execution = local_execution.LocalExecution(
+        max_bytes=1024 * 1024
+    )
+
+Only requests that the server would return the same result for run locally:
+Python functions (not registered UDFs) with NATIVE results, whose results
+are not stored and whose arguments have no stored parameters. (ARROW results
+are converted to a table by the server, so they always run there.) The
+function runs in the local Python environment instead of the UDF image.
+
+Each decision is logged at DEBUG level, with its estimate, for tuning
+``max_bytes``.
+"""
+
+import collections
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy
+
+import tiledb
+from tiledb.cloud import client
+from tiledb.cloud._results import results
+from tiledb.cloud.rest_api import models
+
+logger = logging.getLogger(__name__)
+
+LOCAL_RESULT_FORMATS = frozenset((models.ResultFormat.NATIVE,))
+"""Result formats whose decoded results are the same as the local results."""
+
+VAR_CELL_BYTES = 32
+"""The assumed size of a cell of a variable-sized attribute or dimension."""
+
+_ORDERS = {"R": "C", "C": "F", "G": "G", "U": "U"}
+"""TileDB-Py ``order``s of the ``layout``s of :func:`array.apply`."""
+
+
+class LocalExecution:
+    """Decides which array UDF requests to run locally, and runs them.
+
+    :param max_bytes: Requests estimated to read at most this many bytes
+        run locally, defaults to 4 MiB.
+    :param max_open_arrays: The number of open arrays to keep, defaults to 16.
+    :param max_staleness_sec: Open arrays are reopened (to see new writes)
+        when they are older than this, defaults to 10.
+    :param ctx: The TileDB context to open arrays with, defaults to one
+        built from the current login when first needed.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 4 * 1024 * 1024,
+        *,
+        max_open_arrays: int = 16,
+        max_staleness_sec: float = 10,
+        ctx: Optional[tiledb.Ctx] = None,
+    ):
+        self.max_bytes = max_bytes
+        self._max_open_arrays = max_open_arrays
+        self._max_staleness_sec = max_staleness_sec
+        self._ctx = ctx
+        self._lock = threading.Lock()
+        self._arrays: "collections.OrderedDict[str, _OpenArray]" = (
+            collections.OrderedDict()
+        )
+        self.local_runs = 0
+        """Requests that ran locally."""
+        self.remote_runs = 0
+        """Requests that were left to run on the server."""
+
+    def apply(
+        self,
+        uri: str,
+        func: Callable[..., Any],
+        ranges: List[List[Any]],
+        attrs: Sequence[str],
+        layout: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> Optional[results.LocalResult]:
+        """Runs the request locally, if it is small enough.
+
+        :param ranges: The ranges, as returned by ``array.parse_ranges``.
+        :return: The result, or None if the request should run remotely.
+        """
+        try:
+            opened = self._open(uri)
+            with opened.lock:
+                estimate = estimate_bytes(
+                    opened.array.schema, opened.nonempty, ranges, attrs
+                )
+                local = estimate is not None and estimate <= self.max_bytes
+                logger.debug(
+                    "apply on %s: estimated %s bytes (max %d); running %s",
+                    uri,
+                    estimate,
+                    self.max_bytes,
+                    "locally" if local else "remotely",
+                )
+                if local:
+                    data = _read(opened, ranges, attrs, layout)
+        except Exception as exc:
+            # Whatever fails here (e.g. an unknown layout) is left to the
+            # server, which fails it as usual; the function runs below.
+            logger.debug("apply on %s: running remotely: %s", uri, exc)
+            local = False
+        with self._lock:
+            if local:
+                self.local_runs += 1
+            else:
+                self.remote_runs += 1
+        if not local:
+            return None
+        return results.LocalResult(func(data, **kwargs))
+
+    def close(self) -> None:
+        """Closes all the open arrays."""
+        with self._lock:
+            arrays = tuple(self._arrays.values())
+            self._arrays.clear()
+        for opened in arrays:
+            with opened.lock:
+                opened.array.close()
+
+    def _open(self, uri: str) -> "_OpenArray":
+        with self._lock:
+            opened = self._arrays.get(uri)
+            if opened is not None:
+                if time.monotonic() - opened.opened <= self._max_staleness_sec:
+                    self._arrays.move_to_end(uri)
+                    return opened
+                del self._arrays[uri]
+            if self._ctx is None:
+                self._ctx = client.Ctx()
+            ctx = self._ctx
+        # Opening talks to the server, so don't block other arrays meanwhile.
+        if opened is not None:
+            with opened.lock:
+                opened.array.close()
+        opened = _OpenArray(tiledb.open(uri, ctx=ctx))
+        with self._lock:
+            existing = self._arrays.get(uri)
+            if existing is None:
+                self._arrays[uri] = opened
+                while len(self._arrays) > self._max_open_arrays:
+                    _, evicted = self._arrays.popitem(last=False)
+                    with evicted.lock:
+                        evicted.array.close()
+        if existing is not None:
+            # Another thread opened it meanwhile; keep that one.
+            opened.array.close()
+            return existing
+        return opened
+
+
+class _OpenArray:
+    """An array open for reading, and what is known about it."""
+
+    def __init__(self, array: tiledb.Array):
+        self.array = array
+        self.lock = threading.Lock()
+        """Guards queries, which should not run concurrently on one array."""
+        self.opened = time.monotonic()
+        self.nonempty = array.nonempty_domain()
+
+
+def estimate_bytes(
+    schema: tiledb.ArraySchema,
+    nonempty: Optional[Sequence[Tuple[Any, Any]]],
+    ranges: List[List[Any]],
+    attrs: Sequence[str] = (),
+) -> Optional[int]:
+    """Estimates an upper bound on the bytes a query will read.
+
+    The number of cells is that of the queried box, clipped to the non-empty
+    domain; for sparse arrays, this is an upper bound.
+
+    :param nonempty: The non-empty domain of the array.
+    :param ranges: The ranges, as returned by ``array.parse_ranges``.
+    :param attrs: The attributes and dimensions to read, defaults to all
+        the attributes.
+    :return: The estimate, or None if the number of cells cannot be bounded
+        (i.e. ranges over float or string dimensions).
+    """
+    if nonempty is None:
+        return 0
+    cells = 1
+    for idx, dim in enumerate(schema.domain):
+        lo, hi = nonempty[idx]
+        pairs = _pairs(ranges[idx] if idx < len(ranges) else ()) or [(lo, hi)]
+        if _is_integral(dim.dtype):
+            lo, hi = _to_int(lo), _to_int(hi)
+            cells *= sum(
+                max(0, min(_to_int(end), hi) - max(_to_int(start), lo) + 1)
+                for start, end in pairs
+            )
+        elif all(start == end for start, end in pairs):
+            cells *= len(pairs)
+        else:
+            return None
+        if not cells:
+            return 0
+
+    names = attrs or [schema.attr(i).name for i in range(schema.nattr)]
+    cell_bytes = 0
+    for name in names:
+        if schema.has_attr(name):
+            field = schema.attr(name)
+        else:
+            field = schema.domain.dim(name)
+        if field.isvar:
+            cell_bytes += VAR_CELL_BYTES
+        else:
+            cell_bytes += field.dtype.itemsize * getattr(field, "ncells", 1)
+    return cells * cell_bytes
+
+
+def _read(
+    opened: _OpenArray,
+    ranges: List[List[Any]],
+    attrs: Sequence[str],
+    layout: Optional[str],
+) -> Any:
+    """Reads the slice that the server would pass to the function."""
+    array = opened.array
+    schema = array.schema
+    query_kwargs: Dict[str, Any] = {}
+    if layout:
+        query_kwargs["order"] = _ORDERS[layout.upper()]
+    if attrs:
+        query_kwargs["attrs"] = [a for a in attrs if schema.has_attr(a)]
+        query_kwargs["dims"] = [a for a in attrs if not schema.has_attr(a)] or False
+    subscript = []
+    for idx, dim in enumerate(schema.domain):
+        pairs = _pairs(ranges[idx] if idx < len(ranges) else ())
+        if not pairs:
+            bounds = opened.nonempty[idx] if opened.nonempty else dim.domain
+            pairs = [bounds]
+        if numpy.issubdtype(dim.dtype, numpy.datetime64):
+            # parse_ranges converts datetimes to integers.
+            pairs = [(_to_dim(dim, start), _to_dim(dim, end)) for start, end in pairs]
+        subscript.append([slice(start, end) for start, end in pairs])
+    return array.query(**query_kwargs).multi_index[tuple(subscript)]
+
+
+def _pairs(flat: Sequence[Any]) -> List[Tuple[Any, Any]]:
+    return list(zip(flat[::2], flat[1::2]))
+
+
+def _is_integral(dtype: numpy.dtype) -> bool:
+    return numpy.issubdtype(dtype, numpy.integer) or numpy.issubdtype(
+        dtype, numpy.datetime64
+    )
+
+
+def _to_dim(dim: tiledb.Dim, value: Any) -> Any:
+    return numpy.int64(value).astype(dim.dtype)
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, numpy.datetime64):
+        return int(value.astype("int64"))
+    return int(value)
@@ -3,11 +3,13 @@ Python support for notebook I/O on Tiledb Cloud. All notebook JSON content
 is assumed to be encoded as UTF-8.
 
 """
+
 import datetime
 import enum
+import hashlib
 import posixpath
 import time
-from typing import Optional, Tuple, Union
+from typing import Callable, List, Optional, Tuple, TypeVar, Union
 
 import numpy
 
@@ -22,6 +24,30 @@ from tiledb.cloud.rest_api import ApiException as GenApiException
 RESERVED_NAMESPACES = frozenset(["cloud", "owned", "public", "shared"])
 CHARACTER_ENCODING = "utf-8"
 
+CONSOLIDATE_AFTER_FRAGMENTS = 16
+"""Fragment count at which incremental saves consolidate the notebook array."""
+
+# Content-defined chunking parameters, used by incremental saves to find the
+# parts of a notebook that changed. A chunk ends where a hash of the last
+# _CHUNK_WINDOW bytes has all _CHUNK_MASK bits clear, so boundaries depend on
+# the content around them rather than on byte offsets.
+_CHUNK_WINDOW = 64
+_CHUNK_MASK = (1 << 13) - 1  # About 8 KiB chunks on average.
+_CHUNK_MIN_SIZE = 2 << 10
+_CHUNK_MAX_SIZE = 64 << 10
+_CHUNK_GEAR = numpy.random.default_rng(0x7E57).integers(
+    0, 1 << 63, size=256, dtype=numpy.uint64
+)
+_CHUNKS_META_KEY = "content_chunks"
+"""Array metadata key of the chunk list of the stored notebook contents."""
+
+# Registration of a newly created array may lag behind its creation, so the
+# follow-up calls are retried with jittered backoff from this delay.
+_REGISTRATION_ATTEMPTS = 6
+_REGISTRATION_DELAY = 0.05
+
+_T = TypeVar("_T")
+
 
 class OnExists(enum.Enum):
     """Action to take if the array already exists."""
@@ -112,6 +138,7 @@ def upload_notebook_from_file(
     storage_path: Optional[str] = None,
     storage_credential_name: Optional[str] = None,
     on_exists: OnExists = OnExists.FAIL,
+    incremental: bool = False,
 ) -> str:
     """
     Uploads a local-disk notebook file to TileDB Cloud.
@@ -127,6 +154,8 @@ def upload_notebook_from_file(
     :param storage_credential_name: such as "janedoe-creds", typically from the
       user's account settings.
     :param on_exists: such as OnExists.FAIL (default), OVERWRITE or AUTO-INCREMENT
+    :param incremental: only write the parts of the notebook that changed since
+      it was last uploaded; see upload_notebook_contents.
     :return: TileDB array name, such as "tiledb://janedoe/testing-upload".
     """
 
@@ -142,6 +171,7 @@ def upload_notebook_from_file(
         storage_path=storage_path,
         storage_credential_name=storage_credential_name,
         on_exists=on_exists,
+        incremental=incremental,
     )
 
 
@@ -154,9 +184,19 @@ def upload_notebook_contents(
     storage_path: Optional[str] = None,
     storage_credential_name: Optional[str] = None,
     on_exists: OnExists,
+    incremental: bool = False,
+    consolidate_after: Optional[int] = CONSOLIDATE_AFTER_FRAGMENTS,
 ) -> str:
     """
     Uploads a notebook file to TileDB Cloud.
+
+    With ``incremental``, only the parts of the notebook that changed since it
+    was last uploaded are written, which keeps repeated saves of a large
+    notebook small. Once the notebook array has ``consolidate_after``
+    fragments, they are consolidated on a background thread. Consolidated
+    fragments are not vacuumed, so earlier versions stay readable by
+    timestamp.
+
     :param ipynb_file_contents: The contents of the notebook file as a string,
       nominally in JSON format.
     :param dest_uri: The destination URI to upload the notebook to,
@@ -169,6 +209,9 @@ def upload_notebook_contents(
     :param storage_credential_name: such as "janedoe-creds", typically from the
       user's account settings.
     :param on_exists: such as OnExists.FAIL (default), OVERWRITE or AUTO-INCREMENT
+    :param incremental: only write the parts of the notebook that changed.
+    :param consolidate_after: fragment count at which incremental uploads
+      consolidate the notebook array, or None to never consolidate.
     :return: TileDB array name, such as "tiledb://janedoe/testing-upload".
     """
 
@@ -217,7 +260,16 @@ def upload_notebook_contents(
             namespace,
             ctx,
         )
-    _write_notebook_to_array(tiledb_uri, ipynb_file_contents, ctx)
+    _write_notebook_to_array(
+        tiledb_uri,
+        ipynb_file_contents,
+        ctx,
+        incremental=incremental and already_exists,
+    )
+    if incremental and already_exists and consolidate_after:
+        utils.ephemeral_thread(_consolidate_notebook_array)(
+            tiledb_uri, ctx, consolidate_after
+        )
 
     return tiledb_uri
 
@@ -260,6 +312,8 @@ def _create_notebook_array(
         ctx=ctx,
     )
 
+    policy = client.client.retry_policy
+    delay = 0.0
     tries = 1 + retries  # 1st + rest
     while True:
         try:
@@ -284,8 +338,10 @@ def _create_notebook_array(
                 )
             # Retry other TileDB errors
             tries -= 1
-            if tries <= 0:
+            if tries <= 0 or not policy.acquire_retry():
                 raise tiledb_cloud_error.maybe_wrap(e) from None
+            delay = policy.backoff(delay)
+            time.sleep(delay)
 
 
 def _create_notebook_array_retry_helper(
@@ -320,11 +376,12 @@ def _create_notebook_array_retry_helper(
     # Create the (empty) array on disk.
     tiledb.Array.create(tiledb_uri_s3, schema)
     tiledb_uri = "tiledb://" + posixpath.join(namespace, array_name)
-    time.sleep(0.25)
 
     file_properties = {}
 
-    array.update_info(uri=tiledb_uri, array_name=array_name)
+    _retry_until_registered(
+        lambda: array.update_info(uri=tiledb_uri, array_name=array_name)
+    )
 
     array.update_file_properties(
         uri=tiledb_uri,
@@ -336,14 +393,122 @@ def _create_notebook_array_retry_helper(
     return tiledb_uri, array_name
 
 
+def _retry_until_registered(func: Callable[[], _T]) -> _T:
+    """Calls ``func``, retrying with backoff while the array is not registered."""
+    policy = client.client.retry_policy
+    delay = 0.0
+    for attempt in range(_REGISTRATION_ATTEMPTS):
+        try:
+            return func()
+        except tiledb_cloud_error.TileDBCloudError:
+            if attempt + 1 == _REGISTRATION_ATTEMPTS or not policy.acquire_retry():
+                raise
+            delay = policy.backoff(delay, base=_REGISTRATION_DELAY)
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def _content_chunks(contents: numpy.ndarray) -> List[Tuple[int, int, str]]:
+    """Splits bytes into content-defined chunks.
+
+    :param contents: uint8 array of the bytes to split.
+    :return: list of (offset, length, digest) of each chunk.
+    """
+    size = len(contents)
+    candidates: numpy.ndarray = numpy.empty(0, dtype=numpy.int64)
+    if size > _CHUNK_WINDOW:
+        # Sum of per-byte random values over a sliding window, computed from
+        # the running sum (wrapping around at 2**64).
+        running = numpy.cumsum(_CHUNK_GEAR[contents], dtype=numpy.uint64)
+        window = running[_CHUNK_WINDOW - 1 :].copy()
+        window[1:] -= running[:-_CHUNK_WINDOW]
+        # The high bits of the sum are the best mixed.
+        hits = (window >> numpy.uint64(40)) & numpy.uint64(_CHUNK_MASK) == 0
+        candidates = numpy.flatnonzero(hits) + _CHUNK_WINDOW
+
+    ends = []
+    start = 0
+    for end in [*candidates.tolist(), size]:
+        while end - start > _CHUNK_MAX_SIZE:
+            start += _CHUNK_MAX_SIZE
+            ends.append(start)
+        if end - start >= _CHUNK_MIN_SIZE or (end == size and end > start):
+            ends.append(end)
+            start = end
+
+    chunks = []
+    start = 0
+    for end in ends:
+        digest = hashlib.blake2b(contents[start:end], digest_size=8).hexdigest()
+        chunks.append((start, end - start, digest))
+        start = end
+    return chunks
+
+
+def _encode_chunks(chunks: List[Tuple[int, int, str]]) -> str:
+    """Encodes a chunk list as an array metadata string."""
+    return ";".join(f"{length}:{digest}" for _, length, digest in chunks)
+
+
+def _decode_chunks(encoded: str) -> List[Tuple[int, int, str]]:
+    """Decodes a chunk list encoded by _encode_chunks."""
+    chunks = []
+    offset = 0
+    for item in filter(None, encoded.split(";")):
+        length, digest = item.split(":")
+        chunks.append((offset, int(length), digest))
+        offset += int(length)
+    return chunks
+
+
+def _changed_ranges(
+    previous: List[Tuple[int, int, str]], current: List[Tuple[int, int, str]]
+) -> List[Tuple[int, int]]:
+    """Finds the byte ranges of ``current`` that differ from ``previous``.
+
+    A chunk is unchanged if the previous contents had the same chunk at the
+    same offset. Adjacent changed chunks are merged into one range.
+    """
+    unchanged = set(previous)
+    ranges: List[Tuple[int, int]] = []
+    for chunk in current:
+        if chunk in unchanged:
+            continue
+        offset, length, _ = chunk
+        if ranges and ranges[-1][1] == offset:
+            ranges[-1] = (ranges[-1][0], offset + length)
+        else:
+            ranges.append((offset, offset + length))
+    return ranges
+
+
+def _consolidate_notebook_array(
+    tiledb_uri: str, ctx: tiledb.Ctx, min_fragments: int
+) -> None:
+    """Consolidates the fragments of a notebook array once there are enough.
+    :param tiledb_uri: such as "tiledb://TileDB-Inc/quickstart_dense".
+    :param ctx: cloud context for the operation.
+    :param min_fragments: fragment count from which to consolidate.
+    """
+    if len(tiledb.array_fragments(tiledb_uri, ctx=ctx)) < min_fragments:
+        return
+    tiledb.consolidate(tiledb_uri, ctx=ctx)
+
+
 def _write_notebook_to_array(
-    tiledb_uri: str, ipynb_file_contents: str, ctx: tiledb.Ctx
+    tiledb_uri: str,
+    ipynb_file_contents: str,
+    ctx: tiledb.Ctx,
+    *,
+    incremental: bool = False,
 ) -> None:
     """Writes the given bytes to the array.
     :param tiledb_uri: such as "tiledb://TileDB-Inc/quickstart_dense".
     :param ipnyb_file_contents: The contents of the notebook file as a string,
       nominally in JSON format.
     :param ctx: cloud context for the operation.
+    :param incremental: only write the chunks of the contents which differ from
+      the chunks recorded by the previous write.
     """
 
     # Note: every array is opened at a particular timestamp.  Data and metadata
@@ -356,10 +521,23 @@ def _write_notebook_to_array(
     # contents as an array of bytes, so we need the encoding to get the right
     # byte-count for the file-contents string.
 
-    contents_as_array = numpy.array(bytearray(ipynb_file_contents, CHARACTER_ENCODING))
+    contents_as_array = numpy.frombuffer(
+        ipynb_file_contents.encode(CHARACTER_ENCODING), dtype=numpy.uint8
+    )
+    chunks = _content_chunks(contents_as_array)
+
+    ranges = [(0, len(contents_as_array))]
+    if incremental:
+        with tiledb.open(tiledb_uri, mode="r", ctx=ctx) as arr:
+            previous = arr.meta.get(_CHUNKS_META_KEY)
+        if previous is not None:
+            ranges = _changed_ranges(_decode_chunks(previous), chunks)
 
     with tiledb.open(tiledb_uri, mode="w", ctx=ctx) as arr:
-        arr[0 : len(contents_as_array)] = {"contents": contents_as_array}
+        for start, end in ranges:
+            if end > start:
+                arr[start:end] = {"contents": contents_as_array[start:end]}
         arr.meta["file_size"] = len(contents_as_array)
         arr.meta["type"] = rest_api.FileType.NOTEBOOK
         arr.meta["format"] = "json"
+        arr.meta[_CHUNKS_META_KEY] = _encode_chunks(chunks)
@@ -1,5 +1,13 @@
+import time
 import urllib
-from typing import Dict
+from typing import Dict, Iterable, Optional
+
+import urllib3
+
+from tiledb.cloud import instrumentation as instr
+from tiledb.cloud import request_compression as rc
+from tiledb.cloud import retry_policy as rp
+from tiledb.cloud.region import routing
 
 
 class _PoolManagerWrapper:
@@ -10,10 +18,30 @@ class _PoolManagerWrapper:
     It can be used to replace tiledb.cloud.rest_api.rest.RESTClientObject.pool_manager
     at runtime in order to cache HTTP redirects and work around
     https://github.com/urllib3/urllib3/issues/2475
+
+    If given a RouteCache, it also remembers there where requests to each
+    host are redirected, so that requests to new URLs on the same host also
+    go straight to the redirect location.
+
+    If given an Instrumentation, every request is reported to it.
+    If given a RequestCompression, large request bodies are compressed.
+    If given a RetryPolicy, retries are subject to it, and requests to
+    endpoints that keep failing are rejected by its circuit breakers.
     """
 
-    def __init__(self, pool_manager):
+    def __init__(
+        self,
+        pool_manager,
+        instrumentation: Optional[instr.Instrumentation] = None,
+        compression: Optional[rc.RequestCompression] = None,
+        routes: Optional[routing.RouteCache] = None,
+        retry_policy: Optional[rp.RetryPolicy] = None,
+    ):
         self._pool = pool_manager
+        self._instrumentation = instrumentation
+        self._compression = compression
+        self._routes = routes
+        self._retry_policy = retry_policy
         # The cache key is the URL without the query string, while
         # the cache value is the FQDN (netloc) of the redirect location
         # For example:
@@ -21,7 +49,12 @@ class _PoolManagerWrapper:
         self._redirect_cache: Dict[str, str] = {}
 
     def request(self, method, url, **kwargs):
-        kwargs["retries"] = self._pool.connection_pool_kw.get("retries")
+        retries = self._pool.connection_pool_kw.get("retries")
+        if self._retry_policy and isinstance(retries, urllib3.Retry):
+            retries = rp.PolicyRetry.wrap(retries, self._retry_policy)
+        kwargs["retries"] = retries
+        if self._compression:
+            kwargs = self._compression.apply(kwargs)
 
         parsed_url = urllib.parse.urlparse(url)
         cacheable_url = urllib.parse.urljoin(
@@ -30,16 +63,90 @@ class _PoolManagerWrapper:
         )
 
         cached_netloc = self._redirect_cache.get(cacheable_url)
+        if not cached_netloc and self._routes:
+            cached_netloc = self._routes.get(parsed_url.netloc)
         if cached_netloc:
             url = parsed_url._replace(netloc=cached_netloc).geturl()
 
-        resp = self._pool.request(method, url, **kwargs)
+        circuit = parsed_url.netloc + (instr.current_endpoint() or parsed_url.path)
+        if self._retry_policy:
+            self._retry_policy.before_request(circuit)
+        available = False
+        try:
+            if self._instrumentation is None:
+                resp = self._pool.request(method, url, **kwargs)
+            else:
+                resp = self._instrumented_request(
+                    method, url, parsed_url, cached_netloc, **kwargs
+                )
+            available = (
+                self._retry_policy is None or resp.status not in rp.UNAVAILABLE_STATUSES
+            )
+        finally:
+            if self._retry_policy:
+                self._retry_policy.record(circuit, available)
 
         for retry in reversed(resp.retries.history):
             if retry.redirect_location:
-                redirect_netloc = urllib.parse.urlparse(retry.redirect_location).netloc
-                self._redirect_cache[cacheable_url] = redirect_netloc
+                redirect = urllib.parse.urlparse(retry.redirect_location)
+                self._redirect_cache[cacheable_url] = redirect.netloc
+                # Only a redirect of the same request from the original host
+                # says where that host's requests are served (rather than,
+                # e.g., a download link, or a resource in another region).
+                if (
+                    self._routes
+                    and not cached_netloc
+                    and redirect.scheme == parsed_url.scheme
+                    and redirect.path == parsed_url.path
+                ):
+                    self._routes.set(parsed_url.netloc, redirect.netloc)
 
                 break
 
         return resp
+
+    def warm_up(self, urls: Iterable[str], timeout: float = 5):
+        """Opens connections to the given hosts; see :func:`routing.probe`."""
+        return routing.probe(self._pool, urls, timeout)
+
+    def _instrumented_request(self, method, url, parsed_url, cached_netloc, **kwargs):
+        assert self._instrumentation
+        body = kwargs.get("body")
+        event = dict(
+            method=method,
+            endpoint=instr.current_endpoint() or parsed_url.path,
+            host=cached_netloc or parsed_url.netloc,
+            request_bytes=len(body) if isinstance(body, (str, bytes)) else 0,
+            redirect_cached=bool(cached_netloc),
+        )
+        start = time.perf_counter()
+        try:
+            resp = self._pool.request(method, url, **kwargs)
+        except Exception as exc:
+            self._instrumentation.record(
+                instr.RequestEvent(
+                    status=None,
+                    duration_sec=time.perf_counter() - start,
+                    response_bytes=0,
+                    retries=0,
+                    error=type(exc).__name__,
+                    **event,
+                )
+            )
+            raise
+
+        history = resp.retries.history if resp.retries else ()
+        try:
+            response_bytes = int(resp.headers.get("Content-Length") or 0)
+        except ValueError:
+            response_bytes = 0
+        self._instrumentation.record(
+            instr.RequestEvent(
+                status=resp.status,
+                duration_sec=time.perf_counter() - start,
+                response_bytes=response_bytes,
+                retries=sum(1 for r in history if not r.redirect_location),
+                **event,
+            )
+        )
+        return resp
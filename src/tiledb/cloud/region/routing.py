@@ -0,0 +1,183 @@
+"""Routing of API requests to regional hosts.
+
+The generic API host redirects requests to the regional host that serves
+them. :class:`RouteCache` remembers, per host, where requests were last
+redirected, so that later requests (even to different endpoints, and from
+other processes) go straight there. This relies on the regional hosts
+redirecting requests for resources that live in another region, as the
+generic host does.
+
+Routing by host is off by default. It is enabled per client::
+
+    from tiledb.cloud import client
+    from tiledb.cloud import config
+    from tiledb.cloud.region import routing
+
+    client.client.set_routes(routing.RouteCache(config.default_routes_file))
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent import futures
+from typing import Dict, Iterable, Optional, Tuple
+
+import urllib3
+
+from tiledb.cloud.region import AWS
+
+DEFAULT_TTL_SEC = 24 * 60 * 60
+"""How long a learned route is used before it must be learned again."""
+
+
+def hosts() -> Tuple[str, ...]:
+    """The base URLs of all the regional API hosts."""
+    return tuple(v for k, v in vars(AWS).items() if not k.startswith("_"))
+
+
+class RouteCache:
+    """A thread-safe map from API hosts to the hosts that serve them.
+
+    Hosts are given as netlocs (``host[:port]``). If given a path, routes are
+    loaded from it when first needed and saved to it whenever they change,
+    merging with routes saved by other processes. Failing to read or write
+    the file is not an error; the cache just works in memory.
+
+    :param path: The JSON file to persist routes to, defaults to none.
+    :param ttl_sec: How long a route is valid after it is learned.
+    """
+
+    def __init__(
+        self,
+        path: Optional[os.PathLike] = None,
+        ttl_sec: float = DEFAULT_TTL_SEC,
+    ):
+        self._path = path
+        self._ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Tuple[str, float]] = {}
+        self._loaded = path is None
+
+    def get(self, netloc: str) -> Optional[str]:
+        """Returns the host to send requests for ``netloc`` to, if known."""
+        with self._lock:
+            self._ensure_loaded()
+            route = self._routes.get(netloc)
+            if route is None:
+                return None
+            target, learned = route
+            if time.time() - learned > self._ttl_sec:
+                del self._routes[netloc]
+                return None
+            return target
+
+    def set(self, netloc: str, target: str) -> None:
+        """Routes requests for ``netloc`` to ``target``."""
+        with self._lock:
+            self._ensure_loaded()
+            current = self._routes.get(netloc)
+            self._routes[netloc] = (target, time.time())
+            if current is None or current[0] != target:
+                self._save()
+
+    def clear(self) -> None:
+        """Forgets all routes, including the persisted ones."""
+        with self._lock:
+            self._routes.clear()
+            self._loaded = True
+            self._save(merge=False)
+
+    def _ensure_loaded(self) -> None:
+        """Loads persisted routes, if not yet done. Must hold the lock."""
+        if self._loaded:
+            return
+        self._loaded = True
+        for netloc, route in self._read().items():
+            self._routes.setdefault(netloc, route)
+
+    def _read(self) -> Dict[str, Tuple[str, float]]:
+        if self._path is None:
+            return {}
+        try:
+            with open(self._path) as f:
+                saved = json.load(f)
+            return {
+                netloc: (str(route["netloc"]), float(route["time"]))
+                for netloc, route in saved["routes"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save(self, merge: bool = True) -> None:
+        """Writes routes to the file. Must hold the lock.
+
+        :param merge: If true, routes learned more recently by other
+            processes are kept (and adopted by this cache).
+        """
+        if self._path is None:
+            return
+        if merge:
+            for netloc, route in self._read().items():
+                ours = self._routes.get(netloc)
+                if ours is None or ours[1] < route[1]:
+                    self._routes[netloc] = route
+        now = time.time()
+        saved = {
+            "routes": {
+                netloc: {"netloc": target, "time": learned}
+                for netloc, (target, learned) in self._routes.items()
+                if now - learned <= self._ttl_sec
+            }
+        }
+        directory = os.path.dirname(os.path.abspath(self._path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(saved, f, indent=4, sort_keys=True)
+                os.replace(tmp, self._path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass
+
+
+def probe(
+    pool_manager: urllib3.PoolManager,
+    urls: Iterable[str],
+    timeout: float = 5,
+) -> Dict[str, Optional[float]]:
+    """Connects to each host and measures the latency of a request.
+
+    Each host gets a ``HEAD /`` request over a connection from the pool
+    manager, which stays open in the pool for later requests.
+
+    :param pool_manager: The pool manager to open connections in.
+    :param urls: The base URLs of the hosts to connect to.
+    :param timeout: How long to wait for each host, in seconds.
+    :return: The seconds each request took (including connecting and the
+        TLS handshake), or None for hosts that could not be reached.
+    """
+    urls = tuple(dict.fromkeys(urls))
+    if not urls:
+        return {}
+
+    def one(url: str) -> Optional[float]:
+        parsed = urllib.parse.urlparse(url)
+        pool = pool_manager.connection_from_url(f"{parsed.scheme}://{parsed.netloc}")
+        start = time.perf_counter()
+        try:
+            pool.urlopen("HEAD", "/", retries=False, redirect=False, timeout=timeout)
+        except urllib3.exceptions.HTTPError:
+            return None
+        return time.perf_counter() - start
+
+    with futures.ThreadPoolExecutor(
+        len(urls), thread_name_prefix="tiledb-probe-"
+    ) as executor:
+        return dict(zip(urls, executor.map(one, urls)))
@@ -0,0 +1,92 @@
+"""Compression of large HTTP request bodies sent to TileDB Cloud.
+
+Request compression is off by default. It is enabled per client, and applies
+to every request whose body is larger than a threshold::
+
+    from tiledb.cloud import client
+    from tiledb.cloud import request_compression
+
+    client.client.set_request_compression(
+        request_compression.RequestCompression("zstd", min_bytes=256 * 1024)
+    )
+
+Compressed bodies are sent with a ``Content-Encoding`` header. Bodies that do
+not get smaller (e.g. already-compressed data) are sent as-is.
+"""
+
+import gzip
+from typing import Any, Dict, Optional, Union
+
+import attrs
+
+ALGORITHMS = ("gzip", "zstd")
+"""The supported compression algorithms (``Content-Encoding`` values)."""
+
+_DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+
+
+@attrs.define(frozen=True)
+class RequestCompression:
+    """How to compress request bodies.
+
+    :param algorithm: One of :data:`ALGORITHMS`. ``zstd`` requires the
+        ``zstandard`` package (the ``zstd`` extra).
+    :param min_bytes: Bodies smaller than this are sent uncompressed,
+        defaults to 64 KiB.
+    :param level: The compression level, defaults to 6 for gzip
+        and 3 for zstd.
+    """
+
+    algorithm: str = attrs.field(
+        default="gzip", validator=attrs.validators.in_(ALGORITHMS)
+    )
+    min_bytes: int = 64 * 1024
+    level: Optional[int] = None
+
+    def __attrs_post_init__(self) -> None:
+        if self.algorithm == "zstd":
+            _zstandard()  # Fail early if it is not installed.
+
+    def compress(self, body: Union[str, bytes]) -> Optional[bytes]:
+        """Compresses a request body.
+
+        :return: The compressed body, or None if it should be sent as-is.
+        """
+        if len(body) < self.min_bytes:
+            return None
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        level = _DEFAULT_LEVELS[self.algorithm] if self.level is None else self.level
+        if self.algorithm == "zstd":
+            compressed = _zstandard().ZstdCompressor(level=level).compress(body)
+        else:
+            compressed = gzip.compress(body, compresslevel=level, mtime=0)
+        return compressed if len(compressed) < len(body) else None
+
+    def apply(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Compresses the body of the arguments to ``PoolManager.request``.
+
+        :return: The arguments to send instead. The given ones are not modified.
+        """
+        body = kwargs.get("body")
+        if not isinstance(body, (str, bytes)):
+            return kwargs
+        headers = kwargs.get("headers") or {}
+        if any(k.lower() == "content-encoding" for k in headers):
+            return kwargs
+        compressed = self.compress(body)
+        if compressed is None:
+            return kwargs
+        new_headers = dict(headers)
+        new_headers["Content-Encoding"] = self.algorithm
+        return dict(kwargs, body=compressed, headers=new_headers)
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as ie:
+        raise ImportError(
+            "zstd request compression requires the zstandard package"
+        ) from ie
+    return zstandard
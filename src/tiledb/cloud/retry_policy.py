@@ -0,0 +1,263 @@
+"""A retry policy shared by every retry loop of a client.
+
+Without coordination, an outage makes every thread retry every request as
+fast as its own backoff allows. A :class:`RetryPolicy` bounds that:
+
+- Retries draw from a shared token bucket (the retry budget), which refills
+  over time and with successful requests. When it is empty, requests fail
+  instead of retrying.
+- Backoff delays use decorrelated jitter, so that clients that failed at the
+  same time do not retry at the same time.
+- A circuit breaker per endpoint fails requests immediately, without sending
+  them, after too many consecutive failures of the server to respond.
+
+The policy of :data:`tiledb.cloud.client.client` is applied to HTTP requests
+(through :class:`PolicyRetry`), the status polling of batch task graphs, and
+the retries of notebook uploads.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import attrs
+import urllib3
+from urllib3.exceptions import MaxRetryError
+from urllib3.exceptions import ResponseError
+
+UNAVAILABLE_STATUSES = frozenset((502, 503, 504))
+"""Response statuses that count as failures for the circuit breaker.
+
+Other errors (e.g. a 500 from a failing UDF) say nothing about whether the
+server is up, so they don't trip the breaker.
+"""
+
+
+class CircuitOpenError(urllib3.exceptions.HTTPError):
+    """Raised instead of sending a request to an endpoint that is failing."""
+
+
+@attrs.define
+class RetryMetrics:
+    """Counts of what a retry policy did."""
+
+    retries: int = 0
+    """Retries allowed by the budget."""
+    denied: int = 0
+    """Retries not made because the budget was exhausted."""
+    circuit_opened: int = 0
+    """How many times a circuit breaker opened."""
+    rejected: int = 0
+    """Requests failed by an open circuit breaker without being sent."""
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    :param capacity: The maximum number of tokens (and the initial number).
+    :param refill_per_sec: Tokens added per second.
+    """
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec
+        )
+        self._updated = now
+
+    def take(self, tokens: float = 1) -> bool:
+        """Takes tokens if there are enough. Returns whether it did."""
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def put(self, tokens: float) -> None:
+        """Adds tokens, up to the capacity."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "probing")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class RetryPolicy:
+    """Decides whether and when to retry, across all the retry loops.
+
+    :param budget: Maximum number of retries in a burst, defaults to 100.
+    :param budget_refill_per_sec: Retries added to the budget every second,
+        defaults to 2.
+    :param budget_per_success: Retries added to the budget by every request
+        that succeeds, defaults to 0.1 (i.e. a steady state of at most one
+        retry per ten requests).
+    :param backoff_base_sec: The minimum backoff delay, defaults to 0.25.
+    :param backoff_max_sec: The maximum backoff delay, defaults to 30.
+    :param failure_threshold: Consecutive failures of an endpoint that open
+        its circuit, defaults to 10.
+    :param reset_sec: How long a circuit stays open before a request is let
+        through to test the endpoint, defaults to 10.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget: float = 100,
+        budget_refill_per_sec: float = 2,
+        budget_per_success: float = 0.1,
+        backoff_base_sec: float = 0.25,
+        backoff_max_sec: float = 30,
+        failure_threshold: int = 10,
+        reset_sec: float = 10,
+    ):
+        self.budget = TokenBucket(budget, budget_refill_per_sec)
+        self._budget_per_success = budget_per_success
+        self._backoff_base_sec = backoff_base_sec
+        self._backoff_max_sec = backoff_max_sec
+        self._failure_threshold = failure_threshold
+        self._reset_sec = reset_sec
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+        self._metrics = RetryMetrics()
+
+    def acquire_retry(self) -> bool:
+        """Takes one retry from the budget. Returns whether it may be made."""
+        allowed = self.budget.take()
+        with self._lock:
+            if allowed:
+                self._metrics.retries += 1
+            else:
+                self._metrics.denied += 1
+        return allowed
+
+    def backoff(self, previous: float = 0, base: Optional[float] = None) -> float:
+        """Returns the delay before the next retry, with decorrelated jitter.
+
+        :param previous: The previous delay, or 0 before the first retry.
+        :param base: The minimum delay, defaults to the policy's.
+        """
+        base = self._backoff_base_sec if base is None else base
+        return min(self._backoff_max_sec, random.uniform(base, max(base, previous * 3)))
+
+    def before_request(self, endpoint: str) -> None:
+        """Raises :class:`CircuitOpenError` if the endpoint's circuit is open.
+
+        When the circuit has been open for long enough, one request is let
+        through to find out whether the endpoint is back.
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if circuit is None or circuit.opened_at is None:
+                return
+            waited = time.monotonic() - circuit.opened_at
+            if waited >= self._reset_sec and not circuit.probing:
+                circuit.probing = True
+                return
+            self._metrics.rejected += 1
+        raise CircuitOpenError(
+            f"{endpoint} failed {circuit.failures} times in a row;"
+            f" not retrying for {max(0, self._reset_sec - waited):.1f} sec"
+        )
+
+    def record(self, endpoint: str, success: bool) -> None:
+        """Records the outcome of a request (after all its retries)."""
+        if success:
+            self.budget.put(self._budget_per_success)
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if success:
+                if circuit is not None:
+                    del self._circuits[endpoint]
+                return
+            if circuit is None:
+                circuit = self._circuits[endpoint] = _Circuit()
+            circuit.failures += 1
+            if circuit.probing or (
+                circuit.opened_at is None
+                and circuit.failures >= self._failure_threshold
+            ):
+                if circuit.opened_at is None:
+                    self._metrics.circuit_opened += 1
+                circuit.opened_at = time.monotonic()
+                circuit.probing = False
+
+    def open_circuits(self) -> Dict[str, int]:
+        """The endpoints whose circuits are open, with their failure counts."""
+        with self._lock:
+            return {
+                endpoint: circuit.failures
+                for endpoint, circuit in self._circuits.items()
+                if circuit.opened_at is not None
+            }
+
+    def metrics(self) -> RetryMetrics:
+        """A snapshot of what the policy has done so far."""
+        with self._lock:
+            return attrs.evolve(self._metrics)
+
+
+class PolicyRetry(urllib3.Retry):
+    """A ``urllib3.Retry`` whose retries are subject to a :class:`RetryPolicy`.
+
+    Each retry (but not a redirect) takes from the policy's budget, and the
+    backoff between retries is the policy's jittered backoff. All other
+    behavior is that of the wrapped ``Retry``.
+    """
+
+    policy: RetryPolicy
+    _backoff: float = 0
+
+    @classmethod
+    def wrap(cls, retry: urllib3.Retry, policy: RetryPolicy) -> "PolicyRetry":
+        """Makes a copy of ``retry`` that follows ``policy``."""
+        wrapped = cls.__new__(cls)
+        wrapped.__dict__.update(vars(retry))
+        wrapped.policy = policy
+        return wrapped
+
+    def new(self, **kw) -> "PolicyRetry":
+        new = super().new(**kw)
+        new.policy = self.policy
+        new._backoff = self._backoff
+        return new
+
+    def increment(self, method=None, url=None, *args, **kwargs) -> "PolicyRetry":
+        new = super().increment(method, url, *args, **kwargs)
+        if new.history and new.history[-1].redirect_location:
+            return new
+        if not self.policy.acquire_retry():
+            error = kwargs.get("error") or ResponseError("retry budget exhausted")
+            raise MaxRetryError(kwargs.get("_pool"), url, error)
+        new._backoff = self.policy.backoff(self._backoff)
+        return new
+
+    def get_backoff_time(self) -> float:
+        # Like urllib3, retry the first error immediately.
+        errors = 0
+        for entry in reversed(self.history):
+            if entry.redirect_location:
+                break
+            errors += 1
+        return self._backoff if errors > 1 else 0
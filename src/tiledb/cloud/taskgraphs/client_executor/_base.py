@@ -10,6 +10,7 @@ import attrs
 from tiledb.cloud import client
 from tiledb.cloud import rest_api
 from tiledb.cloud._common import futures
+from tiledb.cloud._common import timing
 from tiledb.cloud.taskgraphs import executor
 
 Status = executor.Status
@@ -78,6 +79,8 @@ class Node(executor.Node[ET, _T], metaclass=abc.ABCMeta):
         by methods like `.exception()` rather than returned.
         """
         self._callback_runner = futures.CallbackRunner(self)
+        self.times = timing.NodeTimes()
+        """Timestamps of this Node's lifecycle events (of its latest attempt)."""
 
     #
     # External API.
@@ -172,6 +175,9 @@ class Node(executor.Node[ET, _T], metaclass=abc.ABCMeta):
             # Make sure we're still in a runnable state (weren't just cancelled)
             if not self._set_status_if_can_start(Status.RUNNING):
                 return
+        # Remote nodes mark "submitted" again when they send their request.
+        self.times.mark("started")
+        self.times.mark("submitted", self.times.started)
 
         try:
             self._exec_impl(
@@ -180,6 +186,7 @@ class Node(executor.Node[ET, _T], metaclass=abc.ABCMeta):
                 default_download_results=default_download_results,
             )
         except Exception as ex:
+            self.times.mark("completed")
             with self._lifecycle_condition:
                 self._set_status_notify(Status.FAILED)
                 self._result_exception = ex
@@ -187,6 +194,7 @@ class Node(executor.Node[ET, _T], metaclass=abc.ABCMeta):
                 cbs = self._callbacks()
             raise
         else:
+            self.times.mark("completed")
             with self._lifecycle_condition:
                 self._set_status_notify(Status.SUCCEEDED)
                 self._result_exception = None
@@ -286,6 +294,7 @@ class Node(executor.Node[ET, _T], metaclass=abc.ABCMeta):
             self._set_status_notify(Status.WAITING)
             self._lifecycle_exception = None
             self._result_exception = None
+            self.times = timing.NodeTimes()
 
     def _to_log_metadata(
         self,
@@ -14,7 +14,7 @@ from tiledb.cloud import client
 from tiledb.cloud import rest_api
 from tiledb.cloud._common import futures
 from tiledb.cloud._common import ordered
-from tiledb.cloud._common import utils
+from tiledb.cloud._common import timing
 from tiledb.cloud.taskgraphs import executor
 from tiledb.cloud.taskgraphs.client_executor import _base
 from tiledb.cloud.taskgraphs.client_executor import array_node
@@ -225,6 +225,21 @@ class LocalExecutor(_base.IClientExecutor):
         with self._done_condition:
             return self._server_graph_uuid
 
+    def timing_report(self) -> timing.TimingReport:
+        """Reports where the time of the graph's execution went.
+
+        See :meth:`tiledb.cloud.dag.DAG.timing_report`.
+        """
+        return timing.TimingReport.build(
+            timing.NodeTiming(
+                id=str(node.id),
+                name=node.display_name,
+                parents=tuple(str(p.id) for p in self._deps.parents_of(node)),
+                times=node.times,
+            )
+            for node in self._deps
+        )
+
     def _make_node(
         self,
         uid: uuid.UUID,
@@ -335,6 +350,7 @@ class LocalExecutor(_base.IClientExecutor):
             return
         self._unstarted_nodes.discard(node)
         self._running_nodes.add(node)
+        node.times.mark("queued")
         self._pool.submit(
             lambda: node._exec(
                 parents=parents,
@@ -459,11 +475,9 @@ class LocalExecutor(_base.IClientExecutor):
             warnings.warn(UserWarning(f"Task graph ended in invalid state {st!r}"))
             return
 
-        do_update = utils.ephemeral_thread(
+        client.client.reporter.submit(
+            ("task_graph", self._server_graph_uuid),
             client.build(rest_api.TaskGraphLogsApi).update_task_graph_log,
-            name=self._prefix + "-reporter",
-        )
-        do_update(
             id=str(self._server_graph_uuid),
             namespace=self.namespace,
             log=rest_api.TaskGraphLog(status=api_st),
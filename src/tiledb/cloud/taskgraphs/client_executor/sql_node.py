@@ -57,6 +57,7 @@ class SQLNode(_base.Node[_base.ET, _T]):
             default_download_results if download_override is None else download_override
         )
 
+        self.times.mark("submitted")
         try:
             resp = self.owner._client.build(rest_api.SqlApi).run_sql(
                 namespace=namespace,
@@ -76,10 +77,12 @@ class SQLNode(_base.Node[_base.ET, _T]):
         except rest_api.ApiException as apix:
             self._task_id = results.extract_task_id(apix)
             raise
+        self.times.mark("accepted")
         try:
             self._task_id = results.extract_task_id(resp)
             if download_results or not self._task_id:
                 self._result = codecs.BinaryBlob.from_response(resp)
+                self.times.mark("downloaded")
             else:
                 self._result = tg_results.LazyResult(self.owner._client, self._task_id)
         finally:
@@ -167,6 +167,7 @@ class UDFNode(_base.Node[_base.ET, _T]):
 
         # Actually make the call.
         api = self.owner._client.build(rest_api.UdfApi)
+        self.times.mark("submitted")
         try:
             resp: urllib3.HTTPResponse = api.submit_multi_array_udf(
                 namespace=self._environment.get("namespace") or self.owner.namespace,
@@ -187,6 +188,7 @@ class UDFNode(_base.Node[_base.ET, _T]):
 
         udf_call.stored_param_uuids = []
         udf_call.arguments_json = values_replacer.visit(self._arguments)
+        self.times.mark("submitted")
         try:
             resp = api.submit_generic_udf(
                 namespace=self.owner.namespace,
@@ -205,10 +207,12 @@ class UDFNode(_base.Node[_base.ET, _T]):
 
         This includes draining and releasing the HTTP connection.
         """
+        self.times.mark("accepted")
         try:
             self._task_id = results.extract_task_id(resp)
             if download_results or not self._task_id:
                 self._result = codecs.BinaryBlob.from_response(resp)
+                self.times.mark("downloaded")
             else:
                 self._result = tg_results.LazyResult(self.owner._client, self._task_id)
         finally:
@@ -3,21 +3,28 @@
 from ._common import as_batch
 from ._common import chunk
 from ._common import find
+from ._common import iter_files
 from ._common import max_memory_usage
+from ._common import partition_by_size
 from ._common import process_stream
 from ._common import read_aws_config
 from ._common import read_file
 from ._common import run_dag
 from ._common import serialize_filter
 from ._common import set_aws_context
+from .consolidate import ConsolidationPlan
+from .consolidate import ConsolidationTask
 from .consolidate import consolidate_and_vacuum
 from .consolidate import consolidate_fragments
 from .consolidate import group_fragments
+from .consolidate import plan_consolidation
 from .logging import get_logger
 from .logging import get_logger_wrapper
 from .profiler import Profiler
 from .profiler import create_log_array
 from .profiler import write_log_event
+from .resources import ResourceSample
+from .resources import ResourceSampler
 from .wheel import install_wheel
 from .wheel import upload_wheel
 
@@ -25,9 +32,11 @@ __all__ = [
     "as_batch",
     "chunk",
     "find",
+    "iter_files",
     "get_logger",
     "get_logger_wrapper",
     "max_memory_usage",
+    "partition_by_size",
     "process_stream",
     "read_aws_config",
     "read_file",
@@ -36,10 +45,15 @@ __all__ = [
     "consolidate_fragments",
     "consolidate_and_vacuum",
     "group_fragments",
+    "plan_consolidation",
+    "ConsolidationPlan",
+    "ConsolidationTask",
     "serialize_filter",
     "Profiler",
     "create_log_array",
     "write_log_event",
+    "ResourceSample",
+    "ResourceSampler",
     "upload_wheel",
     "install_wheel",
 ]
@@ -1,9 +1,15 @@
 import configparser
 import functools
+import heapq
 import inspect
+import json
+import math
 import os
 import pathlib
+import queue
 import subprocess
+import threading
+from concurrent.futures import Future
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import wait
 from fnmatch import fnmatch
@@ -12,6 +18,7 @@ from typing import (
     Callable,
     Dict,
     Iterator,
+    List,
     Mapping,
     Optional,
     Sequence,
@@ -24,6 +31,8 @@ import tiledb
 from tiledb.cloud import dag
 from tiledb.cloud.tiledb_cloud_error import TileDBCloudError
 
+from .resources import default_sampler
+
 # Default value if not set in config["vfs.s3.aws_region"]
 AWS_DEFAULT_REGION = "us-east-1"
 
@@ -186,18 +195,14 @@ def read_file(path: str) -> str:
 
 def max_memory_usage() -> int:
     """
-    Return the maximum memory usage in bytes from the cgroup file
-    `memory.memsw.max_usage_in_bytes`.
+    Return the maximum memory usage in bytes, from cgroup v2
+    (`memory.peak`), cgroup v1 (`memory.memsw.max_usage_in_bytes`) or procfs
+    (`VmHWM`), whichever is available.
 
-    :return: maximum memory usage in bytes or 0 if the cgroup file is not found
+    :return: maximum memory usage in bytes or 0 if it is not available
     """
 
-    try:
-        result = int(read_file("/sys/fs/cgroup/memory/memory.memsw.max_usage_in_bytes"))
-    except Exception:
-        result = 0
-
-    return result
+    return default_sampler().peak_memory()
 
 
 def process_stream(
@@ -381,59 +386,224 @@ def as_batch(func: _CT) -> _CT:
     return wrapper
 
 
-def find(
+def _matches(
+    uri: str,
+    include: Optional[Union[str, Callable]],
+    exclude: Optional[Union[str, Callable]],
+) -> bool:
+    """Check a URI against the include/exclude patterns of find."""
+    if include:
+        if not callable(include) and not fnmatch(uri, include):
+            return False
+        elif callable(include) and not include(uri):
+            return False
+    if exclude:
+        if not callable(exclude) and fnmatch(uri, exclude):
+            return False
+        elif callable(exclude) and exclude(uri):
+            return False
+    return True
+
+
+def _is_dir_entry(uri: str, size: int) -> bool:
+    """Classify an ls_recursive entry as a directory without another request.
+
+    Object store listings only report objects, so the only directories are
+    zero-byte "folder" markers ending in a slash. Local listings also report
+    directories, with a size of zero, which are told apart from empty files
+    with a local stat call.
+    """
+    if uri.endswith("/"):
+        return True
+    if size or not uri.startswith("file://"):
+        return False
+    return os.path.isdir(uri[len("file://") :])
+
+
+def _read_checkpoint(
+    vfs: tiledb.VFS, checkpoint_uri: str, uri: str
+) -> Dict[str, List[Tuple[str, int]]]:
+    """Read the files of the prefixes completed by an earlier search of `uri`."""
+    if not vfs.is_file(checkpoint_uri):
+        return {}
+    with vfs.open(checkpoint_uri) as f:
+        state = json.loads(f.read())
+    if state.get("uri") != uri:
+        return {}
+    return {
+        prefix: [(entry_uri, size) for entry_uri, size in entries]
+        for prefix, entries in state["prefixes"].items()
+    }
+
+
+def _write_checkpoint(
+    vfs: tiledb.VFS,
+    checkpoint_uri: str,
+    uri: str,
+    prefixes: Mapping[str, Sequence[Tuple[str, int]]],
+) -> None:
+    """Record the files of the completed prefixes of a search of `uri`."""
+    with vfs.open(checkpoint_uri, "wb") as f:
+        f.write(json.dumps({"uri": uri, "prefixes": prefixes}).encode())
+
+
+def iter_files(
     uri: str,
     *,
     config: Optional[Mapping[str, Any]] = None,
     include: Optional[Union[str, Callable]] = None,
     exclude: Optional[Union[str, Callable]] = None,
     max_count: Optional[int] = None,
-) -> Sequence[str]:
-    """Searches a path for files matching the include/exclude pattern using VFS.
+    max_workers: Optional[int] = None,
+    checkpoint_uri: Optional[str] = None,
+) -> Iterator[Tuple[str, int]]:
+    """Searches a path for files matching the include/exclude pattern using VFS,
+    yielding each file with its size as soon as it is listed.
+
+    Files and directories are told apart from the listing itself, so no
+    request is made per listed object.
+
+    With `max_workers` or `checkpoint_uri`, each entry directly under `uri`
+    is listed as a separate prefix, up to `max_workers` at a time. This suits
+    trees with a few large top-level prefixes; files directly under `uri`
+    each cost one extra request in this mode.
+
+    With `checkpoint_uri`, the files of each completely listed prefix are
+    recorded at that URI. A later search of the same `uri` with the same
+    `checkpoint_uri` yields the recorded files first and only lists the
+    remaining prefixes.
 
     :param uri: Input path to search
     :param config: Optional dict configuration to pass on tiledb.VFS
     :param include: Optional include pattern string
     :param exclude: Optional exclude pattern string
     :param max_count: Optional stop point when searching for files
+    :param max_workers: Optional number of prefixes listed in parallel
+    :param checkpoint_uri: Optional URI of a listing checkpoint file
+    :return: iterator of (URI, size in bytes) pairs
     """
-    with tiledb.scope_ctx(config):
-        vfs = tiledb.VFS(config=config, ctx=tiledb.Ctx(config))
-
-        uris = []
+    uri = str(uri)
+    vfs = tiledb.VFS(config=config, ctx=tiledb.Ctx(config))
+
+    # Listings run in worker threads and pass files to this generator
+    # through `results`. A worker's future is put on the queue once the
+    # worker is done, so it follows all of the worker's files.
+    results: "queue.Queue[Union[Tuple[str, int], Future]]" = queue.Queue()
+    stop = threading.Event()
+
+    def list_prefix(prefix: str, recorded: Optional[List[Tuple[str, int]]]):
+        """List the files under `prefix`, which may be a file itself."""
+        found = False
+        interrupted = False
+
+        def callback(entry_uri, size_bytes):
+            nonlocal found, interrupted
+            found = True
+            if not _is_dir_entry(entry_uri, size_bytes):
+                results.put((entry_uri, size_bytes))
+                if recorded is not None:
+                    recorded.append((entry_uri, size_bytes))
+            interrupted = stop.is_set()
+            return not interrupted
 
-        def callback(uri, size_bytes):
-            """Process each file found by the VFS.ls_recursive call"""
-
-            # Return True to continue searching for files without adding `uri`
-            # to the list of URIs found.
-            if include:
-                if not callable(include) and not fnmatch(uri, include):
-                    return True
-                elif callable(include) and not include(uri):
-                    return True
-            if exclude:
-                if not callable(exclude) and fnmatch(uri, exclude):
-                    return True
-                elif callable(exclude) and exclude(uri):
-                    return True
-
-            # Skip directories and continue searching.
-            if vfs.is_dir(uri):
-                return True
+        try:
+            vfs.ls_recursive(prefix, callback=callback)
+        except tiledb.TileDBError:
+            # Local listings fail on a file rather than returning nothing.
+            if found or not vfs.is_file(prefix):
+                raise
+        if not found and vfs.is_file(prefix):
+            size_bytes = vfs.file_size(prefix)
+            results.put((prefix, size_bytes))
+            if recorded is not None:
+                recorded.append((prefix, size_bytes))
+        return prefix, recorded, not interrupted
+
+    completed: Dict[str, List[Tuple[str, int]]] = {}
+    if checkpoint_uri:
+        completed = _read_checkpoint(vfs, checkpoint_uri, uri)
+
+    if max_workers or checkpoint_uri:
+        tasks = [
+            (prefix, [] if checkpoint_uri else None)
+            for prefix in vfs.ls(uri)
+            if prefix not in completed
+        ]
+    else:
+        tasks = [(uri, None)]
 
-            # Add to the list of URIs found
-            uris.append(uri)
+    count = 0
+    executor = ThreadPoolExecutor(max_workers=max_workers or 1)
+    try:
+        for entries in completed.values():
+            for entry in entries:
+                if _matches(entry[0], include, exclude):
+                    yield entry
+                    count += 1
+                    if max_count and count >= max_count:
+                        return
+
+        for task in tasks:
+            future = executor.submit(list_prefix, *task)
+            future.add_done_callback(results.put)
+
+        pending = len(tasks)
+        while pending:
+            item = results.get()
+            if isinstance(item, Future):
+                pending -= 1
+                prefix, recorded, complete = item.result()
+                if checkpoint_uri and complete:
+                    completed[prefix] = recorded
+                    _write_checkpoint(vfs, checkpoint_uri, uri, completed)
+                continue
+
+            if _matches(item[0], include, exclude):
+                yield item
+                count += 1
+                if max_count and count >= max_count:
+                    return
+    finally:
+        # Stop the running listings at their next entry.
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
 
-            # Stop `ls_recursive` if the maximum count is reached.
-            if max_count and len(uris) >= max_count:
-                return False
 
-            return True
+def find(
+    uri: str,
+    *,
+    config: Optional[Mapping[str, Any]] = None,
+    include: Optional[Union[str, Callable]] = None,
+    exclude: Optional[Union[str, Callable]] = None,
+    max_count: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    checkpoint_uri: Optional[str] = None,
+) -> Sequence[str]:
+    """Searches a path for files matching the include/exclude pattern using VFS.
 
-        vfs.ls_recursive(uri, callback=callback)
+    See iter_files for the parallel listing and checkpoint options.
 
-        return uris
+    :param uri: Input path to search
+    :param config: Optional dict configuration to pass on tiledb.VFS
+    :param include: Optional include pattern string
+    :param exclude: Optional exclude pattern string
+    :param max_count: Optional stop point when searching for files
+    :param max_workers: Optional number of prefixes listed in parallel
+    :param checkpoint_uri: Optional URI of a listing checkpoint file
+    """
+    with tiledb.scope_ctx(config):
+        return [
+            file_uri
+            for file_uri, _ in iter_files(
+                uri,
+                config=config,
+                include=include,
+                exclude=exclude,
+                max_count=max_count,
+                max_workers=max_workers,
+                checkpoint_uri=checkpoint_uri,
+            )
+        ]
 
 
 T = TypeVar("T")
@@ -452,6 +622,56 @@ def chunk(items: Sequence[T], chunk_size: int) -> Iterator[Sequence[T]]:
         yield items[ndx : min(ndx + chunk_size, length)]
 
 
+def partition_by_size(
+    items: Sequence[T],
+    sizes: Sequence[int],
+    *,
+    num_batches: Optional[int] = None,
+    max_batch_items: Optional[int] = None,
+    target_batch_bytes: Optional[int] = None,
+) -> List[List[T]]:
+    """Splits a sequence of objects into batches of similar total size.
+
+    The number of batches is the largest of `num_batches`, the number needed
+    to hold at most `max_batch_items` objects per batch and the number needed
+    to hold about `target_batch_bytes` per batch, but never more than the
+    number of objects. Objects are placed largest first into the batch with
+    the smallest total size (then the fewest objects), so a few large objects
+    end up in batches of their own rather than next to many small ones.
+    Objects keep their input order within each batch.
+
+    :param items: Sequence to split into batches
+    :param sizes: Size of each object, in bytes
+    :param num_batches: Optional minimum number of batches, defaults to 1
+    :param max_batch_items: Optional maximum number of objects per batch
+    :param target_batch_bytes: Optional target total size of each batch
+    :return: list of batches
+    """
+    if len(items) != len(sizes):
+        raise ValueError("items and sizes must have the same length")
+    if not items:
+        return []
+
+    count = num_batches or 1
+    if max_batch_items:
+        count = max(count, math.ceil(len(items) / max_batch_items))
+    if target_batch_bytes:
+        count = max(count, math.ceil(sum(sizes) / target_batch_bytes))
+    count = min(count, len(items))
+
+    # Heap of (total size, number of objects, batch index).
+    heap = [(0, 0, n) for n in range(count)]
+    batches: List[List[int]] = [[] for _ in range(count)]
+    for i in sorted(range(len(items)), key=lambda i: sizes[i], reverse=True):
+        total, num, n = heapq.heappop(heap)
+        batches[n].append(i)
+        # Full batches are not returned to the heap.
+        if not max_batch_items or num + 1 < max_batch_items:
+            heapq.heappush(heap, (total + sizes[i], num + 1, n))
+
+    return [[items[i] for i in sorted(batch)] for batch in batches]
+
+
 def serialize_filter(filter) -> dict:
     """Serialize TileDB filter.
 
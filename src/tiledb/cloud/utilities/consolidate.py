@@ -1,6 +1,11 @@
+import math
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from os.path import basename
-from typing import Any, Mapping, Optional, Sequence
+from typing import Any, List, Mapping, Optional, Sequence, Tuple, Union
+
+import attrs
+import numpy as np
 
 import tiledb
 from tiledb.cloud import dag
@@ -12,6 +17,15 @@ from .logging import get_logger
 
 MAX_FRAGMENT_SIZE_BYTES = 1 << 30
 
+MAX_TASK_FRAGMENTS = 500
+"""Default maximum number of fragments consolidated by one task."""
+
+MAX_TASK_BYTES = 8 << 30
+"""Default maximum total size of the fragments consolidated by one task."""
+
+METADATA_RESOURCES = {"cpu": "1", "memory": "2Gi"}
+"""Default resources of the commits and fragment metadata consolidation node."""
+
 
 def group_fragments(
     array_uri: str,
@@ -52,9 +66,225 @@ def group_fragments(
         return results
 
 
+@attrs.define(frozen=True)
+class ConsolidationTask:
+    """A run of fragments to consolidate into one (or a few) fragments."""
+
+    fragments: Sequence[str]
+    """Names of the fragments, in timestamp order."""
+    bytes: int
+    """Total size of the fragments, an estimate of both bytes read and written."""
+
+
+@attrs.define(frozen=True)
+class ConsolidationPlan:
+    """Fragment consolidation tasks of an array."""
+
+    array_uri: str
+    tasks: Sequence[ConsolidationTask]
+    fragments: int
+    """Number of fragments in the array."""
+    groups: int
+    """Number of fragment groups."""
+    skipped_groups: int
+    """Number of groups that are already consolidated as far as possible."""
+
+    @property
+    def bytes(self) -> int:
+        """Estimated bytes read (and written) by all tasks."""
+        return sum(task.bytes for task in self.tasks)
+
+    def report(self) -> str:
+        """A summary of the plan and its estimated I/O."""
+        lines = [
+            f"Consolidation plan for {self.array_uri}",
+            f"  {self.fragments} fragments in {self.groups} groups,"
+            f" {self.skipped_groups} groups already consolidated",
+            f"  {len(self.tasks)} tasks consolidating"
+            f" {sum(len(t.fragments) for t in self.tasks)} fragments,"
+            f" about {_mib(self.bytes)} read and written",
+        ]
+        for n, task in enumerate(self.tasks):
+            lines.append(
+                f"  task {n}: {len(task.fragments)} fragments, {_mib(task.bytes)}"
+            )
+        return "\n".join(lines)
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1 << 20):.1f} MiB"
+
+
+def _cell_size(schema: tiledb.ArraySchema) -> int:
+    """Estimate the stored size of a cell, counting var-sized values as 8 bytes."""
+    fields = list(schema.domain) + [schema.attr(i) for i in range(schema.nattr)]
+    size = 0
+    for field in fields:
+        if field.isvar:
+            # Offset plus a short value.
+            size += 16
+        else:
+            size += np.dtype(field.dtype).itemsize * getattr(field, "ncells", 1)
+    return size
+
+
+def _fragment_sizes(
+    array_uri: str, fragments: tiledb.FragmentInfoList, max_workers: int = 16
+) -> List[int]:
+    """Get the size in bytes of each fragment.
+
+    Sizes are read from storage where the fragment URIs are accessible, and
+    estimated from the cell count otherwise.
+    """
+    vfs = tiledb.VFS()
+    cell_size = _cell_size(tiledb.ArraySchema.load(array_uri))
+
+    def size(fi: tiledb.FragmentInfo) -> int:
+        try:
+            return vfs.dir_size(fi.uri)
+        except tiledb.TileDBError:
+            return fi.cell_num * cell_size
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(size, fragments))
+
+
+def _plan_group(
+    fragments: Sequence[Tuple[str, int]],
+    *,
+    max_fragment_size: int,
+    max_task_fragments: int,
+    max_task_bytes: int,
+) -> List[ConsolidationTask]:
+    """Split a timestamp-ordered group of (name, size) fragments into tasks.
+
+    Fragments of at least `max_fragment_size` are left alone, so only the runs
+    of smaller fragments between them are consolidated. Runs are consolidated
+    in contiguous parts to preserve the order of overlapping writes. A run that
+    already has as few fragments as `max_fragment_size` allows is skipped.
+    """
+    runs: List[List[Tuple[str, int]]] = [[]]
+    for fragment in fragments:
+        if fragment[1] >= max_fragment_size:
+            runs.append([])
+        else:
+            runs[-1].append(fragment)
+
+    tasks = []
+    for run in runs:
+        total = sum(size for _, size in run)
+        if len(run) <= max(1, math.ceil(total / max_fragment_size)):
+            continue
+
+        # Split the run into parts of similar size, within the task limits.
+        num_parts = max(
+            math.ceil(len(run) / max_task_fragments),
+            math.ceil(total / max_task_bytes),
+        )
+        parts: List[List[Tuple[str, int]]] = [[]]
+        done = 0
+        for name, size in run:
+            part = parts[-1]
+            if part and (
+                len(part) >= max_task_fragments
+                or (
+                    len(parts) < num_parts
+                    and done + size / 2 > total * len(parts) / num_parts
+                )
+            ):
+                parts.append([])
+            parts[-1].append((name, size))
+            done += size
+
+        tasks.extend(
+            ConsolidationTask(
+                fragments=[name for name, _ in part],
+                bytes=sum(size for _, size in part),
+            )
+            for part in parts
+            if len(part) > 1
+        )
+    return tasks
+
+
+def plan_consolidation(
+    array_uri: str,
+    *,
+    config: Optional[Mapping[str, Any]] = None,
+    group_by_first_dim: bool = False,
+    max_fragment_size: int = MAX_FRAGMENT_SIZE_BYTES,
+    max_task_fragments: int = MAX_TASK_FRAGMENTS,
+    max_task_bytes: int = MAX_TASK_BYTES,
+) -> ConsolidationPlan:
+    """
+    Plan the consolidation of the fragments of an array into balanced tasks.
+
+    Fragments are grouped as in `group_fragments`. Each group is split, in
+    timestamp order, into tasks of at most `max_task_fragments` fragments and
+    about `max_task_bytes` bytes. Groups that cannot be reduced to fewer
+    fragments of up to `max_fragment_size` are skipped.
+
+    :param array_uri: array URI
+    :param config: config dictionary, defaults to None
+    :param group_by_first_dim: group by first dimension, defaults to False
+    :param max_fragment_size: max size of consolidated fragments,
+        defaults to MAX_FRAGMENT_SIZE_BYTES
+    :param max_task_fragments: max number of fragments per task,
+        defaults to MAX_TASK_FRAGMENTS
+    :param max_task_bytes: max total size of the fragments of a task,
+        defaults to MAX_TASK_BYTES
+    :return: consolidation plan
+    """
+
+    logger = get_logger()
+    logger.info("Planning consolidation of array %r", array_uri)
+
+    with tiledb.scope_ctx(config):
+        fis = tiledb.FragmentInfoList(array_uri)
+        sizes = _fragment_sizes(array_uri, fis)
+
+        groups = defaultdict(list)
+        for fi, size in zip(fis, sizes):
+            key = fi.nonempty_domain[0] if group_by_first_dim else "all"
+            groups[key].append((fi.timestamp_range, basename(fi.uri), size))
+
+        tasks = []
+        skipped = 0
+        for group in groups.values():
+            group_tasks = _plan_group(
+                [(name, size) for _, name, size in sorted(group)],
+                max_fragment_size=max_fragment_size,
+                max_task_fragments=max_task_fragments,
+                max_task_bytes=max_task_bytes,
+            )
+            if not group_tasks:
+                skipped += 1
+            tasks.extend(group_tasks)
+
+        plan = ConsolidationPlan(
+            array_uri=array_uri,
+            tasks=tasks,
+            fragments=len(fis),
+            groups=len(groups),
+            skipped_groups=skipped,
+        )
+
+        logger.info(plan.report())
+        logger.info("max memory usage: %.3f GiB", max_memory_usage() / (1 << 30))
+
+        return plan
+
+
+def _plan_consolidation_udf(array_uri: str, **kwargs: Any) -> List[List[str]]:
+    """Plan a consolidation, returning the fragment names of each task."""
+    plan = plan_consolidation(array_uri, **kwargs)
+    # An empty list cannot be expanded into a stage, so return one empty task.
+    return [list(task.fragments) for task in plan.tasks] or [[]]
+
+
 def consolidate(
     array_uri: str,
-    fragments: Sequence[tiledb.FragmentInfo],
+    fragments: Sequence[Union[tiledb.FragmentInfo, str]],
     *,
     config: Optional[Mapping[str, Any]] = None,
     max_fragment_size: int = MAX_FRAGMENT_SIZE_BYTES,
@@ -63,7 +293,7 @@ def consolidate(
     Consolidate fragments
 
     :param array_uri: array URI
-    :param fragments: list of fragments
+    :param fragments: list of fragments, or of fragment names
     :param config: config dictionary, defaults to None
     :param max_fragment_size: max size of consolidated fragments,
         defaults to MAX_FRAGMENT_SIZE_BYTES
@@ -71,13 +301,17 @@ def consolidate(
 
     logger = get_logger()
     logger.info("Consolidating %d fragments", len(fragments))
+    if not fragments:
+        return
 
     config = tiledb.Config(config)
     config["sm.consolidation.mode"] = "fragments"
     config["sm.consolidation.max_fragment_size"] = max_fragment_size
 
     # Consolidate fragments.
-    fragment_names = [basename(fi.uri) for fi in fragments]
+    fragment_names = [
+        fi if isinstance(fi, str) else basename(fi.uri) for fi in fragments
+    ]
     with tiledb.open(array_uri, "w", config=config) as array:
         array.consolidate(fragment_uris=fragment_names)
 
@@ -143,7 +377,11 @@ def consolidate_fragments(
     group_fragments_resources: Optional[Mapping[str, str]] = None,
     namespace: Optional[str] = None,
     max_fragment_size: int = MAX_FRAGMENT_SIZE_BYTES,
-) -> None:
+    max_task_fragments: int = MAX_TASK_FRAGMENTS,
+    max_task_bytes: int = MAX_TASK_BYTES,
+    metadata_resources: Optional[Mapping[str, str]] = None,
+    dry_run: bool = False,
+) -> Optional[ConsolidationPlan]:
     """
     Consolidate fragments in an array.
 
@@ -151,6 +389,15 @@ def consolidate_fragments(
     dimension will be consolidated together. Otherwise, all fragments will be
     consolidated together.
 
+    The fragments are split into balanced consolidation tasks by
+    `plan_consolidation`, which skips groups that are already consolidated.
+    Commits and fragment metadata are then consolidated, and consolidated
+    fragments vacuumed, by a separate node with `metadata_resources`.
+
+    If `dry_run` is True, the consolidation is planned locally and the plan is
+    returned without submitting anything; `plan.report()` summarizes its tasks
+    and estimated I/O.
+
     If `graph` is provided, the consolidation task nodes will be submitted to the graph.
     If `dependencies` is provided, the consolidation nodes will depend on the nodes in
     the list.
@@ -172,8 +419,26 @@ def consolidate_fragments(
     :param namespace: TileDB Cloud namespace, defaults to the user's default namespace
     :param max_fragment_size: max size of consolidated fragments,
         defaults to MAX_FRAGMENT_SIZE_BYTES
+    :param max_task_fragments: max number of fragments per consolidation task,
+        defaults to MAX_TASK_FRAGMENTS
+    :param max_task_bytes: max total size of the fragments of a consolidation
+        task, defaults to MAX_TASK_BYTES
+    :param metadata_resources: resources for the commits and fragment metadata
+        consolidation node, defaults to METADATA_RESOURCES
+    :param dry_run: only plan the consolidation, defaults to False
+    :return: the consolidation plan if `dry_run` is True, otherwise None
     """
 
+    plan_kwargs = dict(
+        config=config,
+        group_by_first_dim=group_by_first_dim,
+        max_fragment_size=max_fragment_size,
+        max_task_fragments=max_task_fragments,
+        max_task_bytes=max_task_bytes,
+    )
+    if dry_run:
+        return plan_consolidation(array_uri, **plan_kwargs)
+
     graph_omitted = graph is None
 
     # If a graph is not provided, create a new graph and run it at the end of this
@@ -209,27 +474,26 @@ def consolidate_fragments(
 
     name = basename(array_uri)
 
-    fragment_groups = graph.submit(
-        group_fragments,
+    consolidation_tasks = graph.submit(
+        _plan_consolidation_udf,
         array_uri,
-        config=config,
-        group_by_first_dim=group_by_first_dim,
-        name=f"Groups Fragments - {name}",
+        **plan_kwargs,
+        name=f"Plan Consolidation - {name}",
         access_credentials_name=acn,
         resources=group_fragments_resources,
     )
 
     if dependencies:
         for node in dependencies:
-            fragment_groups.depends_on(node)
+            consolidation_tasks.depends_on(node)
 
     consolidate_node = graph.submit_udf_stage(
         consolidate,
         array_uri,
-        fragment_groups,
+        consolidation_tasks,
         config=config,
         max_fragment_size=max_fragment_size,
-        expand_node_output=fragment_groups,
+        expand_node_output=consolidation_tasks,
         name=f"Consolidate Fragments - {name}",
         access_credentials_name=acn,
         resources=consolidate_resources,
@@ -242,7 +506,7 @@ def consolidate_fragments(
         vacuum_fragments=True,
         name=f"Consolidate and Vacuum - {name}",
         access_credentials_name=acn,
-        resources=consolidate_resources,
+        resources=metadata_resources or METADATA_RESOURCES,
     )
 
     vacuum_node.depends_on(consolidate_node)
@@ -253,3 +517,4 @@ def consolidate_fragments(
             "Consolidate fragments submitted - ",
             f"https://cloud.tiledb.com/activity/taskgraphs/{graph.namespace}/{graph.server_graph_uuid}",
         )
+    return None
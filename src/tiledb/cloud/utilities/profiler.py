@@ -1,16 +1,37 @@
 import inspect
+import json
 import subprocess
 import threading
 import time
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 from typing_extensions import Self
 
 import tiledb
 
-from ._common import max_memory_usage
 from ._common import read_file
+from .resources import ResourceSample
+from .resources import ResourceSampler
+from .resources import default_sampler
+from .resources import summarize
+
+PROFILER_FLUSH_EVENTS = 1000
+"""Number of buffered profiler events that triggers a write to the log array."""
+
+PROFILER_FLUSH_SEC = 10.0
+"""Time since the last write after which buffered profiler events are written."""
+
+_STATS_ATTRS = {
+    "cpu": "cpu_ns",
+    "mem": "memory",
+    "peak_mem": "peak_memory",
+    "read_bytes": "read_bytes",
+    "write_bytes": "write_bytes",
+    "throttled": "throttled_ns",
+}
+"""Numeric attributes holding resource samples in newer log arrays, mapped to
+the ResourceSample fields they store."""
 
 
 def create_log_array(uri: str) -> None:
@@ -43,6 +64,10 @@ def create_log_array(uri: str) -> None:
             tiledb.Attr(name="op", dtype="ascii", filters=ascii_fl),
             tiledb.Attr(name="data", dtype="ascii", filters=ascii_fl),
             tiledb.Attr(name="extra", dtype="ascii", filters=ascii_fl),
+            *(
+                tiledb.Attr(name=name, dtype=np.uint64, filters=int_fl)
+                for name in _STATS_ATTRS
+            ),
         ],
         offsets_filters=int_fl,
         allows_duplicates=True,
@@ -52,6 +77,11 @@ def create_log_array(uri: str) -> None:
     tiledb.Array.create(uri, schema)
 
 
+def _has_stats_attrs(schema: tiledb.ArraySchema) -> bool:
+    """Check if a log array has the numeric resource sample attributes."""
+    return all(schema.has_attr(name) for name in _STATS_ATTRS)
+
+
 def write_log_event(
     uri: str,
     id: str,
@@ -74,22 +104,38 @@ def write_log_event(
 
     t_now_ms = time.time() * 1000
     with tiledb.open(uri, "w") as A:
-        A[t_now_ms] = {
+        values = {
             "id": [id],
             "op": [op],
             "data": [data],
             "extra": [extra],
         }
+        if _has_stats_attrs(A.schema):
+            values.update({name: np.zeros(1, dtype=np.uint64) for name in _STATS_ATTRS})
+        A[t_now_ms] = values
 
 
 class Profiler(object):
     """
-    A context manager–based profiler to log events and CPU and memory usage
+    A context manager–based profiler to log events and CPU, memory and I/O usage
     to a TileDB array.
 
     If the `trace` parameter is `True`, CPU and memory usage will be logged to the array
     every `period_sec` seconds. This is useful for profiling jobs that are OOM killed.
 
+    Events are buffered and written to the array in batches, once
+    `flush_events` events are buffered, `flush_sec` seconds after the last
+    write, and on exit. Each batch is a single fragment.
+
+    Resource usage is read from cgroup v2, cgroup v1 or procfs (see
+    `ResourceSampler`). Samples are stored as rows with op "sample" in the
+    numeric `cpu` (ns), `mem`, `peak_mem`, `read_bytes`, `write_bytes` and
+    `throttled` (ns) attributes of arrays created by `create_log_array`, and
+    the final "stats" event has a JSON summary of the run in its `extra` data.
+    Log arrays without these attributes get the CPU and memory samples as CSV
+    in the `extra` data of the "stats" event (and as "trace" events), as
+    before.
+
     Examples:
 
         # Basic usage
@@ -114,8 +160,11 @@ class Profiler(object):
         group_uri: Optional[str] = None,
         group_member: Optional[str] = None,
         id: Optional[str] = None,
-        period_sec: int = 5,
+        period_sec: float = 5,
         trace: bool = False,
+        flush_events: int = PROFILER_FLUSH_EVENTS,
+        flush_sec: float = PROFILER_FLUSH_SEC,
+        sampler: Optional[ResourceSampler] = None,
     ):
         """
         Create a profiler object which logs events to a TileDB array. The array can be
@@ -127,6 +176,12 @@ class Profiler(object):
         :param id: profiler id, written to event id
         :param period_sec: profiling period in seconds (0 = disabled), defaults to 5
         :param trace: enable trace logging, defaults to False
+        :param flush_events: number of buffered events that triggers a write,
+            defaults to PROFILER_FLUSH_EVENTS
+        :param flush_sec: time since the last write after which buffered events
+            are written, defaults to PROFILER_FLUSH_SEC
+        :param sampler: resource usage sampler, defaults to the sampler of
+            this container
         """
 
         if array_uri is None and group_uri is None:
@@ -153,12 +208,20 @@ class Profiler(object):
         self.id = id or inspect.stack()[1].function
         self.period_sec = period_sec
         self.trace = trace
+        self.flush_events = flush_events
+        self.flush_sec = flush_sec
+        self.sampler = sampler or default_sampler()
 
     def __enter__(self) -> Self:
         if not self.enabled:
             return self
 
         self.array = tiledb.open(self.array_uri, "w")
+        self.structured = _has_stats_attrs(self.array.schema)
+        self._events: List[Tuple[int, str, str, str, Optional[ResourceSample]]] = []
+        self._first_sample = self._last_sample = self.sampler.sample()
+        self._lock = threading.Lock()
+        self._t_flush = time.time()
 
         # Log useful system info
         node_id = read_file("/proc/sys/kernel/random/boot_id")
@@ -200,9 +263,15 @@ class Profiler(object):
         # Stop profiling timer and write stats event with max memory usage
         # and profiling stats
         self.done = True
-        mem = max_memory_usage()
-        extra = "\n".join(self.stats) if self.period_sec else ""
-        self.write("stats", mem, extra)
+        self._last_sample = self.sampler.sample()
+        if self.structured:
+            extra = json.dumps(self.resources())
+        elif self.period_sec:
+            extra = "\n".join(self.stats)
+        else:
+            extra = ""
+        self.write("stats", self._last_sample.peak_memory, extra)
+        self.flush()
         self.array.close()
 
     def write(self, op: str = "", data: str = "", extra: str = "") -> None:
@@ -220,36 +289,97 @@ class Profiler(object):
         if not self.enabled:
             return
 
-        t_now_ms = time.time() * 1000
+        t_now = time.time()
 
         if not self.array_uri:
-            print(f"{t_now_ms},{self.id},{op},{data},{extra}")
+            print(f"{t_now * 1000},{self.id},{op},{data},{extra}")
             return
 
-        self.array[t_now_ms] = {
-            "id": [self.id],
-            "op": [op],
-            "data": [data],
-            "extra": [extra],
-        }
+        self._record(t_now, op, str(data), str(extra))
+        if len(self._events) >= self.flush_events or (
+            t_now - self._t_flush >= self.flush_sec
+        ):
+            self.flush()
+
+    def resources(self) -> Dict[str, float]:
+        """
+        Summarize the resource usage since the profiler was entered.
+
+        :return: elapsed seconds, CPU seconds, average CPU cores, peak memory
+            bytes, bytes read and written, and CPU throttled seconds
+        """
+
+        if not self.enabled:
+            return {}
+        return summarize([self._first_sample, self._last_sample])
+
+    def flush(self) -> None:
+        """
+        Write the buffered events to the log array.
+        """
+
+        if not self.enabled:
+            return
+
+        with self._lock:
+            events, self._events = self._events, []
+            self._t_flush = time.time()
+            if not events:
+                return
+
+            t_ms, ops, data, extra, samples = zip(*events)
+            values = {
+                "id": [self.id] * len(events),
+                "op": list(ops),
+                "data": list(data),
+                "extra": list(extra),
+            }
+            if self.structured:
+                for name, field in _STATS_ATTRS.items():
+                    values[name] = np.array(
+                        [getattr(s, field) if s else 0 for s in samples],
+                        dtype=np.uint64,
+                    )
+            self.array[np.array(t_ms, dtype=np.uint64)] = values
+
+    def _record(
+        self,
+        t: float,
+        op: str,
+        data: str,
+        extra: str,
+        sample: Optional[ResourceSample] = None,
+    ) -> None:
+        """
+        Buffer an event.
+        """
+
+        with self._lock:
+            self._events.append((int(t * 1000), op, data, extra, sample))
 
     def _timeout(self) -> None:
         """
         Capture system stats and schedule the next timeout.
         """
 
-        try:
-            cpu = read_file("/sys/fs/cgroup/cpu/cpuacct.usage")
-            mem = read_file("/sys/fs/cgroup/memory/memory.usage_in_bytes")
-        except Exception:
-            cpu = 0
-            mem = 0
+        if self.done:
+            return
 
-        t_now = time.time()
-        self.stats.append(f"{int(t_now)},{cpu},{mem}")
+        sample = self.sampler.sample()
+        self._last_sample = sample
+        cpu, mem = sample.cpu_ns, sample.memory
+
+        t_now = sample.time
+        if self.structured:
+            self._record(t_now, "sample", "", "", sample)
+        else:
+            self.stats.append(f"{int(t_now)},{cpu},{mem}")
+            if self.trace:
+                self._record(t_now, "trace", str(cpu), str(mem))
 
-        if self.trace:
-            self.write("trace", cpu, mem)
+        # Write the samples (and events) periodically to survive OOM kills.
+        if self.trace and t_now - self._t_flush >= self.flush_sec:
+            self.flush()
 
         self.t_next += self.period_sec
         if not self.done:
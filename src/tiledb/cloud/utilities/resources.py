@@ -0,0 +1,251 @@
+"""Sampling of the CPU, memory and I/O usage of the current container.
+
+Usage is read from cgroup v2 or cgroup v1 controllers when available, so it
+covers all processes of a UDF container, and from procfs (the current process
+only) otherwise.
+"""
+
+import enum
+import os
+import pathlib
+import time
+from typing import Dict, Optional, Sequence
+
+import attrs
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+PROC_ROOT = "/proc"
+
+
+class CgroupVersion(enum.Enum):
+    """Source of the resource usage data."""
+
+    V2 = "v2"
+    V1 = "v1"
+    PROCFS = "procfs"
+
+
+@attrs.define(frozen=True)
+class ResourceSample:
+    """Resource usage at a point in time. Counters are cumulative."""
+
+    time: float
+    """Seconds since the epoch."""
+    cpu_ns: int = 0
+    """CPU time used, in nanoseconds."""
+    memory: int = 0
+    """Current memory usage, in bytes."""
+    peak_memory: int = 0
+    """Peak memory usage so far, in bytes."""
+    read_bytes: int = 0
+    """Bytes read from block devices."""
+    write_bytes: int = 0
+    """Bytes written to block devices."""
+    throttled_ns: int = 0
+    """Time the CPU was throttled by its quota, in nanoseconds."""
+
+
+def summarize(samples: Sequence[ResourceSample]) -> Dict[str, float]:
+    """
+    Summarize a series of samples, e.g. to size the resources of a task.
+
+    :param samples: samples in time order
+    :return: elapsed seconds, CPU seconds, average CPU cores, peak memory bytes,
+        bytes read and written, and throttled seconds over the samples
+    """
+
+    if not samples:
+        return {}
+    first, last = samples[0], samples[-1]
+    elapsed = last.time - first.time
+    cpu_sec = (last.cpu_ns - first.cpu_ns) / 1e9
+    return {
+        "elapsed_sec": elapsed,
+        "cpu_sec": cpu_sec,
+        "avg_cpus": cpu_sec / elapsed if elapsed > 0 else 0.0,
+        "peak_memory": max(s.peak_memory for s in samples),
+        "read_bytes": last.read_bytes - first.read_bytes,
+        "write_bytes": last.write_bytes - first.write_bytes,
+        "throttled_sec": (last.throttled_ns - first.throttled_ns) / 1e9,
+    }
+
+
+class ResourceSampler:
+    """
+    Reads resource usage from cgroup v2, cgroup v1 or procfs, whichever is
+    available.
+
+    Peak memory is the kernel's high-water mark where it is tracked, and the
+    highest usage seen by this sampler otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        cgroup_root: str = CGROUP_ROOT,
+        proc_root: str = PROC_ROOT,
+    ):
+        """
+        :param cgroup_root: mount point of the cgroup filesystem,
+            defaults to CGROUP_ROOT
+        :param proc_root: mount point of procfs, defaults to PROC_ROOT
+        """
+
+        self._proc = pathlib.Path(proc_root)
+        root = pathlib.Path(cgroup_root)
+        self._peak = 0
+
+        if (root / "cgroup.controllers").exists():
+            self.version = CgroupVersion.V2
+            self._root = self._v2_dir(root)
+        elif (root / "memory").is_dir():
+            self.version = CgroupVersion.V1
+            self._root = root
+        else:
+            self.version = CgroupVersion.PROCFS
+            self._root = root
+
+    def _v2_dir(self, root: pathlib.Path) -> pathlib.Path:
+        """Find the cgroup of this process under the unified hierarchy."""
+        try:
+            for line in (self._proc / "self" / "cgroup").read_text().splitlines():
+                if line.startswith("0::"):
+                    path = root / line[3:].strip().lstrip("/")
+                    if (path / "memory.current").exists():
+                        return path
+        except OSError:
+            pass
+        return root
+
+    def sample(self) -> ResourceSample:
+        """
+        Read the current resource usage. Values that cannot be read are 0.
+
+        :return: resource usage sample
+        """
+
+        if self.version is CgroupVersion.V2:
+            values = self._sample_v2()
+        elif self.version is CgroupVersion.V1:
+            values = self._sample_v1()
+        else:
+            values = self._sample_procfs()
+
+        self._peak = max(self._peak, values.get("memory", 0))
+        values["peak_memory"] = max(values.get("peak_memory", 0), self._peak)
+        return ResourceSample(time=time.time(), **values)
+
+    def peak_memory(self) -> int:
+        """
+        Read the peak memory usage.
+
+        :return: peak memory usage in bytes, or 0 if it is not available
+        """
+
+        return self.sample().peak_memory
+
+    def _sample_v2(self) -> Dict[str, int]:
+        cpu = _read_keyed(self._root / "cpu.stat")
+        values = {
+            "cpu_ns": cpu.get("usage_usec", 0) * 1000,
+            "throttled_ns": cpu.get("throttled_usec", 0) * 1000,
+            "memory": _read_int(self._root / "memory.current"),
+            "peak_memory": _read_int(self._root / "memory.peak"),
+        }
+        for line in _read_lines(self._root / "io.stat"):
+            fields = dict(f.split("=", 1) for f in line.split()[1:] if "=" in f)
+            values["read_bytes"] = values.get("read_bytes", 0) + int(
+                fields.get("rbytes", 0)
+            )
+            values["write_bytes"] = values.get("write_bytes", 0) + int(
+                fields.get("wbytes", 0)
+            )
+        return values
+
+    def _sample_v1(self) -> Dict[str, int]:
+        memory = self._root / "memory"
+        values = {
+            "cpu_ns": _read_int(
+                self._root / "cpuacct" / "cpuacct.usage",
+                self._root / "cpu" / "cpuacct.usage",
+            ),
+            "throttled_ns": _read_keyed(self._root / "cpu" / "cpu.stat").get(
+                "throttled_time", 0
+            ),
+            "memory": _read_int(memory / "memory.usage_in_bytes"),
+            "peak_memory": _read_int(
+                memory / "memory.memsw.max_usage_in_bytes",
+                memory / "memory.max_usage_in_bytes",
+            ),
+        }
+        blkio = self._root / "blkio" / "blkio.throttle.io_service_bytes"
+        for line in _read_lines(blkio):
+            fields = line.split()
+            if len(fields) == 3 and fields[1] in ("Read", "Write"):
+                key = "read_bytes" if fields[1] == "Read" else "write_bytes"
+                values[key] = values.get(key, 0) + int(fields[2])
+        return values
+
+    def _sample_procfs(self) -> Dict[str, int]:
+        values = {}
+        stat = _read_lines(self._proc / "self" / "stat")
+        if stat:
+            # Fields after the command name, which may contain spaces.
+            fields = stat[0].rsplit(")", 1)[-1].split()
+            ticks = int(fields[11]) + int(fields[12])  # utime + stime
+            values["cpu_ns"] = ticks * 1_000_000_000 // _clock_ticks()
+        status = _read_keyed(self._proc / "self" / "status")
+        values["memory"] = status.get("VmRSS:", 0) * 1024
+        values["peak_memory"] = status.get("VmHWM:", 0) * 1024
+        io = _read_keyed(self._proc / "self" / "io")
+        values["read_bytes"] = io.get("read_bytes:", 0)
+        values["write_bytes"] = io.get("write_bytes:", 0)
+        return values
+
+
+def _clock_ticks() -> int:
+    try:
+        return os.sysconf("SC_CLK_TCK")
+    except (AttributeError, ValueError, OSError):
+        return 100
+
+
+def _read_lines(path: pathlib.Path) -> Sequence[str]:
+    try:
+        return path.read_text().splitlines()
+    except OSError:
+        return []
+
+
+def _read_int(*paths: pathlib.Path) -> int:
+    """Read an integer from the first readable file, 0 if there is none."""
+    for path in paths:
+        try:
+            return int(path.read_text().strip())
+        except (OSError, ValueError):
+            continue
+    return 0
+
+
+def _read_keyed(path: pathlib.Path) -> Dict[str, int]:
+    """Read the "key value" lines of a file, ignoring non-integer values."""
+    values = {}
+    for line in _read_lines(path):
+        fields = line.split()
+        if len(fields) >= 2:
+            try:
+                values[fields[0]] = int(fields[1])
+            except ValueError:
+                continue
+    return values
+
+
+_default_sampler: Optional[ResourceSampler] = None
+
+
+def default_sampler() -> ResourceSampler:
+    """Get the shared sampler of the resource usage of this container."""
+    global _default_sampler
+    if _default_sampler is None:
+        _default_sampler = ResourceSampler()
+    return _default_sampler
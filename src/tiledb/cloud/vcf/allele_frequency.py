@@ -1,5 +1,16 @@
+import collections
+import threading
+from typing import Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple
+
+import attrs
 import pandas
 
+# Width (in base pairs) of the genomic bins cached by read_allele_frequency.
+AF_CACHE_BIN_SIZE = 100_000
+
+# Maximum number of bins held by the allele count cache.
+AF_CACHE_MAX_BINS = 1024
+
 
 def calc_af(df) -> pandas.DataFrame:
     """Consolidate AC and compute AN, AF
@@ -21,12 +32,199 @@ def calc_af(df) -> pandas.DataFrame:
 calculate_allele_frequency = calc_af
 
 
-def read_allele_frequency(dataset_uri: str, region: str) -> pandas.DataFrame():
+@attrs.define(frozen=True)
+class _BinEntry:
+    """Allele counts of one genomic bin, aggregated over a set of fragments."""
+
+    fragments: FrozenSet[str]
+    """URIs of the fragments that were aggregated."""
+    timestamp: int
+    """The latest timestamp of the aggregated fragments."""
+    counts: pandas.DataFrame
+    """AC summed by (pos, allele), with columns pos, allele and ac."""
+
+
+class _AlleleCountCache:
+    """A thread-safe LRU cache of per-bin allele counts."""
+
+    def __init__(self, max_bins: int = AF_CACHE_MAX_BINS):
+        self._max_bins = max_bins
+        self._entries: "collections.OrderedDict[Hashable, _BinEntry]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[_BinEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: _BinEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_bins:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _AlleleCountCache()
+
+
+def clear_allele_frequency_cache() -> None:
+    """Drop all allele counts cached by read_allele_frequency."""
+    _cache.clear()
+
+
+def _aggregate_ac(df: pandas.DataFrame) -> pandas.DataFrame:
+    """Sum AC by (pos, allele)."""
+    return df.groupby(["pos", "allele"], sort=True).ac.sum().reset_index()
+
+
+def _coalesce_bins(bins: Sequence[int], bin_size: int) -> List[slice]:
+    """Convert sorted bin numbers into the fewest inclusive position slices."""
+    slices: List[slice] = []
+    for b in bins:
+        start, end = b * bin_size, (b + 1) * bin_size - 1
+        if slices and slices[-1].stop + 1 == start:
+            slices[-1] = slice(slices[-1].start, end)
+        else:
+            slices.append(slice(start, end))
+    return slices
+
+
+def _read_counts(
+    alleles_uri: str,
+    contig: str,
+    bins: Sequence[int],
+    bin_size: int,
+    timestamp: Optional[Tuple[int, int]] = None,
+) -> Dict[int, pandas.DataFrame]:
+    """
+    Read and aggregate the allele counts of a set of bins.
+
+    :param alleles_uri: variant stats array URI
+    :param contig: contig to read
+    :param bins: sorted bin numbers to read
+    :param bin_size: width of each bin
+    :param timestamp: timestamp range of the fragments to read,
+        defaults to all fragments
+    :return: aggregated allele counts of each bin
+    """
+    import tiledb
+
+    with tiledb.open(alleles_uri, timestamp=timestamp) as A:
+        df = A.query(attrs=["ac", "allele"], dims=["pos", "contig"]).df[
+            contig, _coalesce_bins(bins, bin_size)
+        ]
+
+    df = _aggregate_ac(df)
+    groups = dict(iter(df.groupby(df.pos // bin_size)))
+    empty = df.iloc[:0]
+    return {b: groups.get(b, empty).reset_index(drop=True) for b in bins}
+
+
+def _read_allele_counts_cached(
+    alleles_uri: str,
+    contig: str,
+    region_slice: slice,
+    bin_size: int,
+) -> pandas.DataFrame:
+    """
+    Read allele counts for a region, reusing cached per-bin aggregates.
+
+    Cached bins are keyed by the variant stats array, contig, bin size and
+    bin number, and record the fragments they were computed from. A bin is reused as-is
+    if the fragments are unchanged. If new fragments were only added after
+    the bin was cached, just the new fragments are read and their counts are
+    added to the cached ones. Otherwise (e.g. after consolidation), the bin is
+    read again in full.
+
+    :param alleles_uri: variant stats array URI
+    :param contig: contig to read
+    :param region_slice: inclusive position range to read
+    :param bin_size: width of each bin
+    :return: allele counts summed by (pos, allele)
+    """
+    import tiledb
+
+    fragment_info = tiledb.array_fragments(alleles_uri)
+    fragments = frozenset(f.uri for f in fragment_info)
+    timestamp = max((f.timestamp_range[1] for f in fragment_info), default=0)
+
+    bins = range(region_slice.start // bin_size, region_slice.stop // bin_size + 1)
+    counts: Dict[int, pandas.DataFrame] = {}
+
+    # Group the bins by how they must be read, so each group is one query:
+    # either all fragments, or only the fragments newer than a cached entry.
+    full_reads: List[int] = []
+    delta_reads: Dict[Tuple[FrozenSet[str], int], List[int]] = {}
+    entries: Dict[int, _BinEntry] = {}
+    for b in bins:
+        entry = _cache.get((alleles_uri, contig, bin_size, b))
+        if entry is None or not entry.fragments <= fragments:
+            full_reads.append(b)
+        elif entry.fragments == fragments:
+            counts[b] = entry.counts
+        elif all(
+            f.timestamp_range[0] > entry.timestamp
+            for f in fragment_info
+            if f.uri not in entry.fragments
+        ):
+            entries[b] = entry
+            delta_reads.setdefault((entry.fragments, entry.timestamp), []).append(b)
+        else:
+            full_reads.append(b)
+
+    if full_reads:
+        # Read only the fragments listed above, which the bins are cached with.
+        full = _read_counts(
+            alleles_uri, contig, full_reads, bin_size, timestamp=(0, timestamp)
+        )
+        for b, df in full.items():
+            counts[b] = df
+
+    for (_, since), group in delta_reads.items():
+        delta = _read_counts(
+            alleles_uri, contig, group, bin_size, timestamp=(since + 1, timestamp)
+        )
+        for b, df in delta.items():
+            counts[b] = _aggregate_ac(pandas.concat([entries[b].counts, df]))
+
+    for b in full_reads + [b for group in delta_reads.values() for b in group]:
+        _cache.put(
+            (alleles_uri, contig, bin_size, b),
+            _BinEntry(fragments=fragments, timestamp=timestamp, counts=counts[b]),
+        )
+
+    df = pandas.concat([counts[b] for b in bins], ignore_index=True)
+    return df[(df.pos >= region_slice.start) & (df.pos <= region_slice.stop)]
+
+
+def read_allele_frequency(
+    dataset_uri: str,
+    region: str,
+    *,
+    use_cache: bool = True,
+    cache_bin_size: int = AF_CACHE_BIN_SIZE,
+) -> pandas.DataFrame():
     """
     Read variant status
 
+    Allele counts are cached in memory per genomic bin, so overlapping region
+    queries only read bins that were not read before, and only the fragments
+    ingested since a bin was cached.
+
     :param dataset_uri: dataset URI
     :param region: genomics region to read
+    :param use_cache: reuse cached allele counts, defaults to True
+    :param cache_bin_size: width (in base pairs) of the cached genomic bins,
+        defaults to AF_CACHE_BIN_SIZE
     """
     import tiledb
 
@@ -43,6 +241,12 @@ def read_allele_frequency(dataset_uri: str, region: str) -> pandas.DataFrame():
                 f"Invalid region: {region}. Expected format: contig:start-end"
             ) from e
 
+        if use_cache:
+            df = _read_allele_counts_cached(
+                alleles_uri, contig, region_slice, cache_bin_size
+            )
+            return calc_af(df)
+
         with tiledb.open(alleles_uri) as A:
             df = A.query(attrs=["ac", "allele"], dims=["pos", "contig"]).df[
                 contig, region_slice
@@ -4,10 +4,9 @@ import os
 import subprocess
 import sys
 from collections import defaultdict
-from fnmatch import fnmatch
 from math import ceil
 from multiprocessing.pool import ThreadPool
-from typing import Any, Callable, Mapping, Optional, Sequence, Union
+from typing import Any, Mapping, Optional, Sequence, Union
 
 import numpy as np
 
@@ -18,6 +17,7 @@ from tiledb.cloud.utilities import Profiler
 from tiledb.cloud.utilities import as_batch
 from tiledb.cloud.utilities import consolidate_fragments
 from tiledb.cloud.utilities import create_log_array
+from tiledb.cloud.utilities import find
 from tiledb.cloud.utilities import get_logger
 from tiledb.cloud.utilities import max_memory_usage
 from tiledb.cloud.utilities import process_stream
@@ -400,55 +400,6 @@ def find_uris_udf(
 
     with tiledb.scope_ctx(config):
         with Profiler(group_uri=dataset_uri, group_member=LOG_ARRAY) as prof:
-
-            def find(
-                uri: str,
-                *,
-                config: Optional[Mapping[str, Any]] = None,
-                include: Optional[Union[str, Callable]] = None,
-                exclude: Optional[Union[str, Callable]] = None,
-                max_count: Optional[int] = None,
-            ) -> Sequence[str]:
-                """Searches a path for files matching the include/exclude pattern.
-
-                :param uri: Input path to search
-                :param config: Optional dict configuration to pass on tiledb.VFS
-                :param include: Optional include pattern string
-                :param exclude: Optional exclude pattern string
-                :param max_count: Optional stop point when searching for files
-                """
-                with tiledb.scope_ctx(config):
-                    vfs = tiledb.VFS(config=config, ctx=tiledb.Ctx(config))
-
-                    uris = []
-
-                    def callback(uri, size_bytes):
-                        """Process each file found by the VFS.ls_recursive call"""
-
-                        # Skip files that do not match the include pattern or
-                        # match the exclude pattern.
-                        if callable(include) and not include(uri):
-                            return True
-                        if include and not fnmatch(uri, include):
-                            return True
-                        if callable(exclude) and exclude(uri):
-                            return True
-                        if exclude and fnmatch(uri, exclude):
-                            return True
-
-                        # Add to the list of URIs found
-                        uris.append(uri)
-
-                        # Stop `ls_recursive` if the maximum count is reached.
-                        if max_count and len(uris) >= max_count:
-                            return False
-
-                        return True
-
-                    vfs.ls_recursive(uri, callback=callback)
-
-                    return uris
-
             # Add one trailing slash to search_uri
             search_uri = search_uri.rstrip("/") + "/"
 
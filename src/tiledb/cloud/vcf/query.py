@@ -387,6 +387,7 @@ def build_read_dag(
     resources: Optional[Mapping[str, str]] = None,
     verbose: bool = False,
     batch_mode: bool = False,
+    speculation: Optional[tiledb.cloud.dag.Speculation] = None,
 ) -> Tuple[tiledb.cloud.dag.DAG, tiledb.cloud.dag.Node]:
     """
     Build the DAG for a distributed read on a TileDB-VCF dataset.
@@ -418,6 +419,8 @@ def build_read_dag(
     :param resources: TileDB-Cloud resources for batch UDFs, defaults to None
     :param verbose: verbose logging, defaults to False
     :param batch_mode: run the query with batch UDFs, defaults to False
+    :param speculation: when to start duplicates of straggling query nodes,
+        for realtime queries; by default, duplicates are never started
     :return: DAG and result Node
     """
 
@@ -492,6 +495,7 @@ def build_read_dag(
         name=dag_name,
         max_workers=max_workers,
         mode=mode,
+        speculation=speculation,
     )
 
     # If `regions` is a Delayed object, we set the parent nodes to `dag` so the
@@ -533,6 +537,7 @@ def build_read_dag(
                     resource_class=resource_class,
                     resources=resources,
                     result_format=result_format,
+                    idempotent=True,
                 )
             )
 
@@ -5,6 +5,7 @@ from typing import Mapping, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 import tiledb
 from tiledb.cloud.utilities import get_logger
@@ -83,6 +84,140 @@ def zygosity(gt: np.ndarray) -> str:
     return "HET"
 
 
+_ZYGOSITY_LABELS = np.array(["MISSING", "HOM_REF", "HEMI", "HOM_ALT", "HET"])
+
+
+def _as_list_array(values: pd.Series) -> pa.ListArray:
+    """
+    Convert a pandas column of array-like values into a pyarrow ListArray.
+
+    :param values: column of lists or numpy arrays
+    :return: pyarrow ListArray (chunked arrays are combined)
+    """
+    arr = pa.array(values, from_pandas=True)
+    if isinstance(arr, pa.ChunkedArray):
+        arr = pa.concat_arrays(arr.chunks)
+    return arr
+
+
+def _list_offsets(arr: pa.ListArray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the offsets and lengths of a ListArray, treating nulls as empty lists.
+
+    :param arr: pyarrow ListArray
+    :return: start offsets and lengths of each list
+    """
+    offsets = arr.offsets.to_numpy(zero_copy_only=False).astype(np.int64)
+    lengths = np.diff(offsets)
+    if arr.null_count:
+        lengths[arr.is_null().to_numpy(zero_copy_only=False)] = 0
+    return offsets[:-1], lengths
+
+
+def _list_values(arr: pa.ListArray) -> pa.Array:
+    """
+    Return the values buffer of a ListArray, including values of null slots.
+
+    :param arr: pyarrow ListArray
+    :return: the child values of the ListArray
+    """
+    # ``arr.values`` ignores the array offset, so slice it to the visible range
+    offsets = arr.offsets.to_numpy(zero_copy_only=False)
+    return arr.values.slice(0, offsets[-1] if len(offsets) else 0)
+
+
+def zygosity_array(gt: Union[pd.Series, pa.Array]) -> np.ndarray:
+    """
+    Convert a column of genotypes to zygosity strings.
+
+    This is a vectorized equivalent of calling :func:`zygosity` on each row:
+    the genotypes are flattened into a single array and classified using
+    per-row minimum and maximum allele values.
+
+    :param gt: column of genotypes, one array-like per row
+    :return: array of zygosity strings
+    """
+    arr = gt if isinstance(gt, pa.Array) else _as_list_array(gt)
+    starts, lengths = _list_offsets(arr)
+    values = _list_values(arr).to_numpy(zero_copy_only=False)
+
+    # Default to MISSING (label 0) for empty rows
+    codes = np.zeros(len(lengths), dtype=np.int8)
+    present = lengths > 0
+    if present.any():
+        # Segments of the non-empty rows are contiguous in the values array
+        idx = starts[present]
+        lo = np.minimum.reduceat(values, idx)
+        hi = np.maximum.reduceat(values, idx)
+        single = lengths[present] == 1
+
+        sub = np.full(len(idx), 4, dtype=np.int8)  # HET
+        sub[lo == hi] = 3  # HOM_ALT
+        sub[single] = 2  # HEMI
+        sub[(lo == 0) & (hi == 0)] = 1  # HOM_REF
+        sub[(lo == -1) & (hi == -1)] = 0  # MISSING
+        codes[present] = sub
+
+    return _ZYGOSITY_LABELS[codes]
+
+
+def _split_ref_alt(alleles: pd.Series) -> Tuple[pd.Series, pa.ListArray]:
+    """
+    Split a column of alleles into REF values and lists of ALT values.
+
+    :param alleles: column of alleles, with the REF allele first
+    :return: REF column and ALT ListArray
+    """
+    arr = _as_list_array(alleles)
+    starts, lengths = _list_offsets(arr)
+    values = _list_values(arr)
+
+    present = lengths > 0
+    ref_idx = np.where(present, starts, -1)
+    ref = values.take(pa.array(ref_idx, mask=~present))
+
+    # Drop the first value of every non-empty list
+    keep = np.ones(len(values), dtype=bool)
+    keep[starts[present]] = False
+    alt_lengths = np.maximum(lengths - 1, 0)
+    alt_offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+    np.cumsum(alt_lengths, out=alt_offsets[1:])
+    alt = pa.ListArray.from_arrays(pa.array(alt_offsets), values.filter(pa.array(keep)))
+
+    return ref.to_pandas(), alt
+
+
+def _explode(df: pd.DataFrame, lists: Mapping[str, pa.ListArray]) -> pd.DataFrame:
+    """
+    Explode list columns of a DataFrame into one row per list value.
+
+    All list columns must have the same lengths in every row. Like
+    ``DataFrame.explode``, empty lists produce a single row with a null value.
+
+    :param df: DataFrame to explode
+    :param lists: list columns to explode, by name
+    :return: exploded DataFrame
+    """
+    first = next(iter(lists.values()))
+    starts, lengths = _list_offsets(first)
+    for name, arr in lists.items():
+        if not np.array_equal(_list_offsets(arr)[1], lengths):
+            raise ValueError(f"columns must have matching element counts: {name}")
+
+    rows = np.maximum(lengths, 1)
+    parent = np.repeat(np.arange(len(rows)), rows)
+    # Position of each output row within its list
+    offset = np.arange(len(parent)) - np.repeat(np.cumsum(rows) - rows, rows)
+    take = np.repeat(starts, rows) + offset
+    missing = np.repeat(lengths == 0, rows)
+    take = pa.array(np.where(missing, -1, take), mask=missing)
+
+    result = df.take(parent)
+    for name, arr in lists.items():
+        result[name] = _list_values(arr).take(take).to_pandas().values
+    return result
+
+
 def _annotate(
     vcf_df: pd.DataFrame,
     *,
@@ -162,33 +297,32 @@ def _annotate(
         return vcf_df
 
     # Split alleles into ref and alt
-    vcf_df["ref"] = vcf_df["alleles"].str[0]
-    vcf_df["alt"] = vcf_df["alleles"].str[1:]
+    ref, alt = _split_ref_alt(vcf_df["alleles"])
     vcf_df.drop("alleles", axis=1, inplace=True)
+    vcf_df["ref"] = ref.values
     t_prev = log_event("split ref/alt", t_prev)
 
     # Create an af column with the ALT IAF values
     alt_af = "info_TILEDB_ALT_IAF"
+    lists = {"alt": alt}
     if "info_TILEDB_IAF" in vcf_df:
-        vcf_df[alt_af] = vcf_df["info_TILEDB_IAF"].str[1:]
+        _, lists[alt_af] = _split_ref_alt(vcf_df["info_TILEDB_IAF"])
 
     if split_multiallelic:
         # Split multiallelic variants
-        explode_cols = ["alt"]
-
-        if "info_TILEDB_IAF" in vcf_df:
-            explode_cols.append(alt_af)
-
-        vcf_df = vcf_df.explode(explode_cols)
+        vcf_df = _explode(vcf_df, lists)
         t_prev = log_event("split multiallelic", t_prev)
     else:
+        for name, arr in lists.items():
+            vcf_df[name] = arr.to_pandas().values
+
         # Convert alt to comma-separated string
         vcf_df["alt"] = vcf_df["alt"].str.join(",")
         t_prev = log_event("join multiallelic", t_prev)
 
     # Add zygosity
     if add_zygosity:
-        vcf_df["zygosity"] = vcf_df["fmt_GT"].apply(zygosity)
+        vcf_df["zygosity"] = zygosity_array(vcf_df["fmt_GT"])
         t_prev = log_event("add zygosity", t_prev)
 
     # Wait for annotation query
@@ -0,0 +1,199 @@
+import base64
+import inspect
+import pickle
+import threading
+import types
+import unittest
+import uuid
+from unittest import mock
+
+from tiledb.cloud import apply_batching
+from tiledb.cloud import array
+from tiledb.cloud import client
+from tiledb.cloud import tiledb_cloud_error as tce
+from tiledb.cloud._results import codecs
+from tiledb.cloud._results import results
+
+_TASK_ID = uuid.UUID(int=1)
+
+
+def _first_start(data, offset=0):
+    if offset < 0:
+        raise ValueError("negative offset")
+    return data[0][0] + offset
+
+
+class _FakeServer:
+    """Runs requests locally, passing each entry's ranges as its data."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.batches = []
+        self.singles = []
+
+    def exec_multi_array_udf_base(self, func, array_list, **kwargs):
+        entries = array_list.get()
+        with self.lock:
+            self.batches.append((entries, kwargs))
+        return apply_batching.BatchedResult(
+            func([e.ranges.ranges.value for e in entries]), _TASK_ID
+        )
+
+    def apply_base(self, uri, func, ranges, **kwargs):
+        with self.lock:
+            self.singles.append(uri)
+        kwargs = {k: v for k, v in kwargs.items() if k not in _APPLY_ARGS}
+        return results.LocalResult(func(array.parse_ranges(ranges).value, **kwargs))
+
+
+_APPLY_ARGS = frozenset(inspect.signature(array.apply_base).parameters)
+
+
+class ApplyBatchingTest(unittest.TestCase):
+    def setUp(self):
+        self.server = _FakeServer()
+        for name in ("exec_multi_array_udf_base", "apply_base"):
+            # Keep the signatures, which apply_async binds arguments to.
+            patcher = mock.patch.object(
+                array, name, autospec=True, side_effect=getattr(self.server, name)
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.batching = apply_batching.ApplyBatching(window_sec=60, max_batch=3)
+        old = client.client.apply_batching
+        client.client.apply_batching = self.batching
+        self.addCleanup(setattr, client.client, "apply_batching", old)
+
+    def test_batches(self):
+        calls = [
+            array.apply_async("tiledb://a/b", _first_start, [(i, i + 1)], offset=1)
+            for i in range(5)
+        ]
+        # The first three filled a batch, and were sent at once.
+        self.assertEqual([c.get(timeout=5) for c in calls[:3]], [1, 2, 3])
+        self.assertEqual(calls[0].task_id, _TASK_ID)
+        self.batching.flush()
+        self.assertEqual([c.get(timeout=5) for c in calls[3:]], [4, 5])
+
+        self.assertEqual((self.batching.calls, self.batching.requests), (5, 2))
+        entries, kwargs = self.server.batches[0]
+        self.assertEqual({e.uri for e in entries}, {"tiledb://a/b"})
+        self.assertEqual(kwargs["result_format"], "native")
+        self.assertFalse(kwargs["include_source_lines"])
+
+    def test_groups(self):
+        calls = [
+            array.apply_async("tiledb://a/b", _first_start, [(1, 1)]),
+            array.apply_async("tiledb://a/c", _first_start, [(2, 2)]),
+            array.apply_async("tiledb://a/b", _first_start, [(3, 3)], timeout=5),
+            array.apply_async("tiledb://a/b", _first_start, [(4, 4)]),
+        ]
+        self.batching.flush()
+        self.assertEqual([c.get(timeout=5) for c in calls], [1, 2, 3, 4])
+        self.assertEqual(len(self.server.batches), 1)
+        self.assertEqual(len(self.server.singles), 2)
+
+    def test_not_batched(self):
+        self.assertIsNone(
+            self.batching.submit(dict(self._call(), func="registered_udf"))
+        )
+        self.assertIsNone(self.batching.submit(dict(self._call(), store_results=True)))
+        # The server converts ARROW results, which cannot be done per call.
+        self.assertIsNone(
+            self.batching.submit(dict(self._call(), result_format="arrow"))
+        )
+        self.assertIsNone(self.batching.submit(dict(self._call(), ranges=[(2, 1)])))
+        self.assertIsNotNone(self.batching.submit(self._call()))
+        self.assertEqual(self.batching.calls, 1)
+
+    def test_errors(self):
+        calls = [
+            array.apply_async("tiledb://a/b", _first_start, [(1, 1)], offset=-1),
+            array.apply_async("tiledb://a/b", _first_start, [(2, 2)]),
+        ]
+        self.batching.flush()
+        with self.assertRaisesRegex(tce.TileDBCloudError, "negative offset"):
+            calls[0].get(timeout=5)
+        self.assertEqual(calls[1].get(timeout=5), 2)
+
+        with mock.patch.object(
+            array, "exec_multi_array_udf_base", side_effect=tce.TileDBCloudError("x")
+        ):
+            calls = [
+                array.apply_async("tiledb://a/b", _first_start, [(i, i)])
+                for i in range(2)
+            ]
+            self.batching.flush()
+            for call in calls:
+                with self.assertRaisesRegex(tce.TileDBCloudError, "x"):
+                    call.get(timeout=5)
+
+    def test_window(self):
+        batching = apply_batching.ApplyBatching(window_sec=0.01)
+        client.client.apply_batching = batching
+        call = array.apply_async("tiledb://a/b", _first_start, [(7, 8)])
+        self.assertEqual(call.get(timeout=5), 7)
+        self.assertEqual(self.server.singles, ["tiledb://a/b"])
+
+    def _call(self):
+        call = inspect.signature(array.apply_base).bind(
+            "tiledb://a/b", _first_start, [(1, 2)]
+        )
+        call.apply_defaults()
+        return call.arguments
+
+
+class _FakeUdfApi:
+    """Runs multi-array UDF requests as the server would, from the request."""
+
+    def __init__(self):
+        self.udfs = []
+
+    def submit_multi_array_udf(self, namespace, udf, **kwargs):
+        self.udfs.append(udf)
+        func = pickle.loads(base64.b64decode(udf._exec))
+        func_kwargs = {}
+        if udf.argument:
+            (func_kwargs,) = pickle.loads(base64.b64decode(udf.argument))
+        data = [entry.ranges.ranges.value for entry in udf.arrays]
+        return types.SimpleNamespace(
+            data=codecs.CODECS_BY_FORMAT[udf.result_format].encode(
+                func(data, **func_kwargs)
+            ),
+            headers={results.TASK_ID_HEADER: str(_TASK_ID)},
+            drain_conn=lambda: None,
+            release_conn=lambda: None,
+        )
+
+
+class ApplyBatchingRequestTest(unittest.TestCase):
+    def test_request(self):
+        api = _FakeUdfApi()
+        patcher = mock.patch.object(client, "build", return_value=api)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        batching = apply_batching.ApplyBatching(window_sec=60)
+        old = client.client.apply_batching
+        client.client.apply_batching = batching
+        self.addCleanup(setattr, client.client, "apply_batching", old)
+
+        calls = [
+            array.apply_async(
+                "tiledb://a/b",
+                _first_start,
+                [(i, i)],
+                namespace="ns",
+                timeout=30,
+                offset=i,
+            )
+            for i in range(2)
+        ]
+        batching.flush()
+        self.assertEqual([c.get(timeout=5) for c in calls], [0, 2])
+        self.assertEqual(calls[0].task_id, _TASK_ID)
+
+        (batch,) = api.udfs
+        self.assertEqual(len(batch.arrays), 2)
+        self.assertEqual(batch.timeout, 30)
+        # The arguments of each call are in the function, not the request.
+        self.assertIsNone(batch.argument)
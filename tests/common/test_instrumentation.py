@@ -0,0 +1,106 @@
+import types
+import unittest
+
+from tiledb.cloud import instrumentation
+from tiledb.cloud.pool_manager_wrapper import _PoolManagerWrapper
+
+
+def _retry(redirect_location=None):
+    return types.SimpleNamespace(redirect_location=redirect_location)
+
+
+class _FakePool:
+    def __init__(self):
+        self.connection_pool_kw = {"retries": None}
+        self.urls = []
+        self.responses = []
+
+    def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+def _response(status=200, size=0, history=()):
+    return types.SimpleNamespace(
+        status=status,
+        headers={"Content-Length": str(size)},
+        retries=types.SimpleNamespace(history=tuple(history)),
+    )
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self):
+        self.instr = instrumentation.Instrumentation()
+        self.pool = _FakePool()
+        self.wrapper = _PoolManagerWrapper(self.pool, self.instr)
+
+    def test_requests(self):
+        self.pool.responses = [
+            _response(
+                size=10,
+                history=[_retry(), _retry("https://us.api.example.com/v1/x")],
+            ),
+            _response(status=404, size=3),
+            ConnectionError("boom"),
+        ]
+        events = []
+        remove = self.instr.add_hook(events.append)
+        with instrumentation.endpoint("/v1/{name}"):
+            self.wrapper.request("GET", "https://api.example.com/v1/x", body=b"abc")
+            self.wrapper.request("GET", "https://api.example.com/v1/x?q=1")
+        remove()
+        with self.assertRaises(ConnectionError):
+            self.wrapper.request("POST", "https://api.example.com/v1/y")
+
+        self.assertEqual(len(events), 2)
+        first, second = events
+        self.assertEqual(first.endpoint, "/v1/{name}")
+        self.assertEqual(
+            (first.host, first.retries, first.request_bytes, first.response_bytes),
+            ("api.example.com", 1, 3, 10),
+        )
+        self.assertFalse(first.redirect_cached)
+        self.assertEqual(second.host, "us.api.example.com")
+        self.assertTrue(second.redirect_cached)
+        self.assertEqual(self.pool.urls[1], "https://us.api.example.com/v1/x?q=1")
+
+        stats = self.instr.stats()
+        self.assertEqual(set(stats), {"GET /v1/{name}", "POST /v1/y"})
+        get = stats["GET /v1/{name}"]
+        self.assertEqual((get.requests, get.errors, get.retries), (2, 1, 1))
+        self.assertEqual(get.response_bytes, 13)
+        self.assertEqual(get.latency.count, 2)
+        self.assertEqual(stats["POST /v1/y"].errors, 1)
+        self.assertAlmostEqual(self.instr.redirect_cache_hit_rate, 1 / 3)
+
+        self.instr.reset()
+        self.assertEqual(self.instr.stats(), {})
+        self.assertEqual(self.instr.redirect_cache_hit_rate, 0)
+
+    def test_failing_hook(self):
+        def fail(event):
+            raise ValueError(event)
+
+        events = []
+        self.instr.add_hook(fail)
+        self.instr.add_hook(events.append)
+        self.pool.responses = [_response()]
+        with self.assertLogs(instrumentation.logger):
+            self.wrapper.request("GET", "https://api.example.com/v1/x")
+        self.assertEqual(len(events), 1)
+
+
+class HistogramTest(unittest.TestCase):
+    def test_quantile(self):
+        hist = instrumentation.Histogram((1, 2, 5))
+        self.assertEqual(hist.quantile(0.5), 0)
+        for value in (0.5, 0.5, 1.5, 4, 7):
+            hist.observe(value)
+        self.assertEqual(hist.counts, [2, 1, 1, 1])
+        self.assertEqual(hist.quantile(0.4), 1)
+        self.assertEqual(hist.quantile(0.6), 2)
+        self.assertEqual(hist.quantile(1), 7)
+        self.assertAlmostEqual(hist.mean, 2.7)
@@ -0,0 +1,147 @@
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import tiledb
+from tiledb.cloud import array
+from tiledb.cloud import client
+from tiledb.cloud import local_execution
+from tiledb.cloud._results import results
+
+
+def _sum_a(data, offset=0):
+    return float(data["a"].sum()) + offset
+
+
+class LocalExecutionTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dense = f"{tmp.name}/dense"
+        self.sparse = f"{tmp.name}/sparse"
+        dom = tiledb.Domain(
+            tiledb.Dim("x", (0, 99), tile=10, dtype=np.int64),
+            tiledb.Dim("y", (0, 9), tile=10, dtype=np.int64),
+        )
+        tiledb.Array.create(
+            self.dense,
+            tiledb.ArraySchema(
+                domain=dom,
+                attrs=[
+                    tiledb.Attr("a", dtype=np.float64),
+                    tiledb.Attr("s", dtype=str),
+                ],
+            ),
+        )
+        with tiledb.open(self.dense, "w") as arr:
+            arr[:] = {
+                "a": np.arange(1000.0).reshape(100, 10),
+                "s": np.array(["x"] * 1000, dtype=object).reshape(100, 10),
+            }
+        tiledb.Array.create(
+            self.sparse,
+            tiledb.ArraySchema(
+                domain=tiledb.Domain(
+                    tiledb.Dim(
+                        "t",
+                        (np.datetime64(0, "s"), np.datetime64(1000, "s")),
+                        tile=np.timedelta64(10, "s"),
+                        dtype="datetime64[s]",
+                    ),
+                    tiledb.Dim("f", (0.0, 1.0), tile=0.5, dtype=np.float64),
+                ),
+                attrs=[tiledb.Attr("a", dtype=np.int32)],
+                sparse=True,
+            ),
+        )
+        with tiledb.open(self.sparse, "w") as arr:
+            arr[np.array([10, 20, 30], dtype="datetime64[s]"), [0.1, 0.2, 0.3]] = {
+                "a": np.array([1, 2, 3], dtype=np.int32)
+            }
+        self.local = local_execution.LocalExecution(max_bytes=1000, ctx=tiledb.Ctx())
+        self.addCleanup(self.local.close)
+
+    def test_estimate(self):
+        with tiledb.open(self.dense) as arr:
+            schema, nonempty = arr.schema, arr.nonempty_domain()
+        estimate = local_execution.estimate_bytes
+        # (8 bytes + a var-sized cell) per cell.
+        self.assertEqual(
+            estimate(schema, nonempty, []), 1000 * (8 + local_execution.VAR_CELL_BYTES)
+        )
+        self.assertEqual(estimate(schema, nonempty, [[0, 1, 5, 5], [0, 1]], ["a"]), 48)
+        # Ranges are clipped to the non-empty domain.
+        self.assertEqual(estimate(schema, nonempty, [[90, 200], []], ["a", "x"]), 1600)
+        self.assertEqual(estimate(schema, nonempty, [[200, 300]]), 0)
+
+        with tiledb.open(self.sparse) as arr:
+            schema, nonempty = arr.schema, arr.nonempty_domain()
+        self.assertIsNone(estimate(schema, nonempty, [[10, 20], [0.0, 0.5]]))
+        self.assertEqual(estimate(schema, nonempty, [[10, 20], [0.1, 0.1]]), 44)
+
+    def test_apply(self):
+        ranges = array.parse_ranges([(1, 2), [(0, 1)]]).value
+        result = self.local.apply(self.dense, _sum_a, ranges, ["a"], "R", {})
+        self.assertEqual(result, results.LocalResult(10.0 + 11 + 20 + 21))
+        # Too large to run locally.
+        self.assertIsNone(self.local.apply(self.dense, _sum_a, [], ["a"], None, {}))
+        self.assertEqual((self.local.local_runs, self.local.remote_runs), (1, 1))
+
+        ranges = array.parse_ranges(
+            [(np.datetime64(10, "s"), np.datetime64(20, "s")), 0.2]
+        ).value
+        result = self.local.apply(self.sparse, _sum_a, ranges, (), None, {})
+        self.assertEqual(result.get(), 2)
+
+        # Requests that fail to be read locally are left to the server...
+        ranges = [[0, 0], [0, 0]]
+        self.assertIsNone(self.local.apply(self.dense, _sum_a, ranges, ["a"], "X", {}))
+        # ...but errors of the function itself are not.
+        with self.assertRaises(KeyError):
+            self.local.apply(self.dense, _sum_a, ranges, ["s"], None, {})
+
+    def test_apply_base(self):
+        old = client.client.local_execution
+        client.client.local_execution = self.local
+        self.addCleanup(setattr, client.client, "local_execution", old)
+        self.assertEqual(
+            array.apply(self.dense, _sum_a, [[(0, 0)], 1], attrs=["a"], offset=1), 2.0
+        )
+        # The server converts ARROW results, so they are not run locally.
+        with mock.patch.object(
+            client, "build", side_effect=RuntimeError("remote")
+        ), self.assertRaisesRegex(RuntimeError, "remote"):
+            array.apply(
+                self.dense, _sum_a, [[(0, 0)], 1], attrs=["a"], result_format="arrow"
+            )
+        self.assertEqual(self.local.local_runs, 1)
+
+    def test_open_arrays(self):
+        local = local_execution.LocalExecution(
+            max_open_arrays=1, max_staleness_sec=0, ctx=tiledb.Ctx()
+        )
+        self.addCleanup(local.close)
+        first = local._open(self.dense)
+        self.assertIsNot(local._open(self.dense), first)
+        local._open(self.sparse)
+        self.assertEqual(list(local._arrays), [self.sparse])
+        # Of two concurrent opens of an array, one is kept and the other closed.
+        opens = []
+        real_open = tiledb.open
+
+        def open_twice(uri, **kwargs):
+            arr = real_open(uri, **kwargs)
+            opens.append(arr)
+            if len(opens) == 1:
+                opens.append(local._open(uri).array)
+            return arr
+
+        with mock.patch.object(tiledb, "open", open_twice):
+            self.assertIs(local._open(self.dense).array, opens[1])
+        self.assertFalse(opens[0].isopen)
+        self.assertTrue(opens[1].isopen)
+
+        # Missing arrays run remotely.
+        self.assertIsNone(local.apply(self.dense + "-x", _sum_a, [], (), None, {}))
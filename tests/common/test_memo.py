@@ -0,0 +1,106 @@
+import unittest
+import uuid
+
+from tiledb.cloud import dag
+from tiledb.cloud._results import decoders
+from tiledb.cloud._results import results
+from tiledb.cloud._results import stored_params
+
+_calls = []
+_TASK_ID = uuid.uuid4()
+
+
+def _value(name, value):
+    _calls.append((name, value))
+    return value
+
+
+def _add(a, b):
+    _calls.append(("add", a + b))
+    return a + b
+
+
+def _fake_base(func, *args, **kwargs):
+    """Stands in for a remote ``*_base`` function, storing its results."""
+    _calls.append(args)
+    return results.RemoteResult(
+        task_id=_TASK_ID,
+        decoder=decoders.Decoder("native"),
+        results_stored=True,
+        body=b"unused",
+    )
+
+
+class _Unpicklable:
+    def __reduce__(self):
+        raise TypeError("no")
+
+
+class MemoTest(unittest.TestCase):
+    def setUp(self):
+        self.memo = dag.MemoCache()
+        _calls.clear()
+        self.addCleanup(_calls.clear)
+
+    def _run(self, graph, node):
+        graph.compute()
+        graph.wait(10)
+        return node.result()
+
+    def test_local(self):
+        def build(b_value):
+            graph = dag.DAG(namespace="test", memo=self.memo)
+            a = graph.submit_local(_value, "a", 1)
+            b = graph.submit_local(_value, "b", b_value)
+            return graph, graph.submit_local(_add, a, b)
+
+        self.assertEqual(self._run(*build(2)), 3)
+        self.assertEqual(len(_calls), 3)
+        self.assertEqual(len(self.memo), 3)
+
+        _calls.clear()
+        self.assertEqual(self._run(*build(2)), 3)
+        self.assertEqual(_calls, [])
+
+        self.assertEqual(self._run(*build(5)), 6)
+        self.assertEqual(sorted(_calls), [("add", 6), ("b", 5)])
+        self.assertEqual((self.memo.hits, self.memo.misses), (4, 5))
+
+    def test_unpicklable(self):
+        def build():
+            graph = dag.DAG(namespace="test", memo=self.memo)
+            a = graph.submit_local(_value, "a", _Unpicklable())
+            return graph, graph.submit_local(_value, "b", a)
+
+        self._run(*build())
+        self._run(*build())
+        self.assertEqual(len(_calls), 4)
+        self.assertEqual(len(self.memo), 0)
+
+    def test_stored_params(self):
+        def build():
+            graph = dag.DAG(namespace="test", memo=self.memo)
+            # Skip registering the graph on the server.
+            graph._tried_setup = True
+            parent = graph._add_prewrapped_node(_fake_base, len, "x")
+            child = graph._add_prewrapped_node(_fake_base, len, parent)
+            return graph, parent, child
+
+        graph, parent, child = build()
+        graph.compute()
+        graph.wait(10)
+        self.assertEqual(len(_calls), 2)
+        # The child got the parent's result as a stored parameter.
+        (param,) = _calls[1]
+        self.assertIsInstance(param, stored_params.StoredParam)
+
+        graph, parent, child = build()
+        graph.compute()
+        graph.wait(10)
+        self.assertEqual(len(_calls), 2)
+        self.assertEqual(parent.task_id(), _TASK_ID)
+        self.assertEqual(child._result.to_stored_param().task_id, _TASK_ID)
+
+    def test_batch(self):
+        with self.assertRaises(ValueError):
+            dag.DAG(namespace="test", mode=dag.Mode.BATCH, memo=self.memo)
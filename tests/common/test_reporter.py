@@ -0,0 +1,55 @@
+import threading
+import unittest
+
+import urllib3
+
+from tiledb.cloud._common import reporter
+
+
+class StatusReporterTest(unittest.TestCase):
+    def test_coalesce(self):
+        rep = reporter.StatusReporter(max_workers=2)
+        gate = threading.Event()
+        sent = []
+
+        def send(name, value):
+            gate.wait(10)
+            sent.append((name, value))
+
+        for value in range(5):
+            rep.submit("a", send, name="a", value=value)
+            rep.submit(("b", value), send, name="b", value=value)
+        gate.set()
+        self.assertTrue(rep.flush(10))
+        # The first report of "a" may have been picked up before being replaced,
+        # but after that only the latest one is sent.
+        a_sent = [v for k, v in sent if k == "a"]
+        self.assertLessEqual(len(a_sent), 2)
+        self.assertEqual(a_sent[-1], 4)
+        self.assertEqual(sorted(v for k, v in sent if k == "b"), list(range(5)))
+
+    def test_retries(self):
+        rep = reporter.StatusReporter(max_attempts=3, backoff_sec=0.01)
+        calls = {"transient": 0, "permanent": 0}
+
+        def transient():
+            calls["transient"] += 1
+            if calls["transient"] < 3:
+                raise urllib3.exceptions.ProtocolError("reset")
+
+        def permanent():
+            calls["permanent"] += 1
+            raise ValueError("bad request")
+
+        rep.submit("transient", transient)
+        rep.submit("permanent", permanent)
+        self.assertTrue(rep.flush(10))
+        self.assertEqual(calls, {"transient": 3, "permanent": 1})
+
+    def test_flush_timeout(self):
+        rep = reporter.StatusReporter()
+        gate = threading.Event()
+        rep.submit("slow", gate.wait, timeout=10)
+        self.assertFalse(rep.flush(0.05))
+        gate.set()
+        self.assertTrue(rep.flush(10))
@@ -0,0 +1,66 @@
+import gzip
+import json
+import os
+import types
+import unittest
+
+from tiledb.cloud import request_compression as rc
+from tiledb.cloud.pool_manager_wrapper import _PoolManagerWrapper
+
+
+class _FakePool:
+    connection_pool_kw = {"retries": None}
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(kwargs)
+        return types.SimpleNamespace(retries=types.SimpleNamespace(history=()))
+
+
+class RequestCompressionTest(unittest.TestCase):
+    def test_compress(self):
+        comp = rc.RequestCompression(min_bytes=100)
+        body = json.dumps({"arguments": ["x" * 1000]})
+        self.assertEqual(gzip.decompress(comp.compress(body)), body.encode())
+        self.assertIsNone(comp.compress("x" * 99))
+        # Incompressible data is sent as-is.
+        self.assertIsNone(comp.compress(os.urandom(1000)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            rc.RequestCompression("brotli")
+
+    def test_zstd(self):
+        try:
+            import zstandard
+        except ImportError:
+            with self.assertRaises(ImportError):
+                rc.RequestCompression("zstd")
+            return
+        comp = rc.RequestCompression("zstd", min_bytes=0)
+        compressed = comp.compress(b"y" * 1000)
+        self.assertEqual(
+            zstandard.ZstdDecompressor().decompress(compressed), b"y" * 1000
+        )
+
+    def test_pool_manager_wrapper(self):
+        pool = _FakePool()
+        wrapper = _PoolManagerWrapper(
+            pool, compression=rc.RequestCompression(min_bytes=100)
+        )
+        headers = {"Content-Type": "application/json"}
+        big = json.dumps(["z" * 1000])
+        wrapper.request("POST", "https://example.com/udf", body=big, headers=headers)
+        wrapper.request("POST", "https://example.com/udf", body="[]", headers=headers)
+        wrapper.request("GET", "https://example.com/udf", headers=headers)
+
+        compressed, small, get = pool.calls
+        self.assertEqual(compressed["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed["body"]), big.encode())
+        self.assertEqual(small["body"], "[]")
+        self.assertNotIn("Content-Encoding", small["headers"])
+        self.assertNotIn("body", get)
+        # The caller's headers are left alone.
+        self.assertEqual(headers, {"Content-Type": "application/json"})
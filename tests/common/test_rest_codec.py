@@ -0,0 +1,226 @@
+import datetime
+import json
+import re
+import time
+import types
+import unittest
+
+import pytest
+from dateutil.parser import parse
+
+from tiledb.cloud import rest_api
+from tiledb.cloud._common import json_safe
+from tiledb.cloud._common import rest_codec
+from tiledb.cloud._common.api_v2 import models as models_v2
+from tiledb.cloud.rest_api import models
+
+
+def _reference_decode(models_module, data, klass):
+    """The original generated ``ApiClient.__deserialize``."""
+    if data is None:
+        return None
+    if isinstance(klass, str):
+        if klass.startswith("list["):
+            sub_kls = re.match(r"list\[(.*)\]", klass).group(1)
+            return [_reference_decode(models_module, d, sub_kls) for d in data]
+        if klass.startswith("dict("):
+            sub_kls = re.match(r"dict\(([^,]*), (.*)\)", klass).group(2)
+            return {
+                k: _reference_decode(models_module, v, sub_kls) for k, v in data.items()
+            }
+        if klass in rest_codec.NATIVE_TYPES_MAPPING:
+            klass = rest_codec.NATIVE_TYPES_MAPPING[klass]
+        else:
+            klass = getattr(models_module, klass)
+    if klass in rest_codec.PRIMITIVE_TYPES:
+        return klass(data)
+    if klass is object:
+        return data
+    if klass is datetime.date:
+        return parse(data).date()
+    if klass is datetime.datetime:
+        return parse(data)
+    if not klass.openapi_types:
+        return data
+    kwargs = {}
+    for attr, attr_type in klass.openapi_types.items():
+        if klass.attribute_map[attr] in data:
+            value = data[klass.attribute_map[attr]]
+            kwargs[attr] = _reference_decode(models_module, value, attr_type)
+    return klass(**kwargs)
+
+
+def _reference_encode(obj):
+    """The original generated ``ApiClient.sanitize_for_serialization``."""
+    if obj is None:
+        return None
+    if isinstance(obj, json_safe.Value):
+        return obj.value
+    if isinstance(obj, rest_codec.PRIMITIVE_TYPES):
+        return obj
+    if isinstance(obj, list):
+        return [_reference_encode(o) for o in obj]
+    if isinstance(obj, tuple):
+        return tuple(_reference_encode(o) for o in obj)
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if not isinstance(obj, dict):
+        obj = {
+            obj.attribute_map[attr]: getattr(obj, attr)
+            for attr in obj.openapi_types
+            if getattr(obj, attr) is not None
+        }
+    return {k: _reference_encode(v) for k, v in obj.items()}
+
+
+def _task_graph_log(n_nodes):
+    return {
+        "uuid": "graph",
+        "namespace": "ns",
+        "name": "big graph",
+        "created_at": "2024-01-02T03:04:05Z",
+        "status": "succeeded",
+        "total_cost": 1.5,
+        "status_count": {"COMPLETED": n_nodes},
+        "nodes": [
+            {
+                "client_node_uuid": f"node-{i}",
+                "name": f"node {i}",
+                "depends_on": [f"node-{i - 1}"] if i else [],
+                "status": "COMPLETED",
+                "executions": [
+                    {
+                        "id": f"task-{i}",
+                        "start_time": "2024-01-02T03:04:05.123Z",
+                        "finish_time": "2024-01-02T03:04:06.456Z",
+                        "memory": 2 << 30,
+                        "cpu": 2,
+                        "cost": 0.001,
+                        "sql_init_commands": ["SET x = 1"],
+                        "array_metadata": {
+                            "id": f"array-{i}",
+                            "name": "array",
+                            "file_properties": {"a": "b"},
+                            "tags": ["x", "y"],
+                            "size": 123.0,
+                        },
+                    }
+                ],
+            }
+            for i in range(n_nodes)
+        ],
+    }
+
+
+def _activity_logs(n_logs):
+    return {
+        "activitylogs": [
+            {
+                "event_at": "2024-01-02T03:04:05Z",
+                "action": "read_schema",
+                "username": "user",
+                "bytes_sent": i,
+                "bytes_received": 2 * i,
+                "id": str(i),
+            }
+            for i in range(n_logs)
+        ],
+        "pagination_metadata": {"page": 1, "per_page": n_logs},
+    }
+
+
+class DecodeTest(unittest.TestCase):
+    def test_matches_reference(self):
+        for models_module, data, klass in (
+            (models, _task_graph_log(20), "TaskGraphLog"),
+            (models, [_task_graph_log(2)] * 3, "list[TaskGraphLog]"),
+            (models, {"a": [1, 2], "b": None}, "dict(str, list[int])"),
+            (models_v2, _activity_logs(20), "ArrayActivityLogData"),
+            (models, "2024-01-02", "date"),
+            (models, {"a": 1}, "object"),
+            (models, None, "TaskGraphLog"),
+        ):
+            with self.subTest(klass):
+                self.assertEqual(
+                    rest_codec.decode(models_module, data, klass),
+                    _reference_decode(models_module, data, klass),
+                )
+
+    def test_class_argument(self):
+        log = rest_codec.decode(models, _task_graph_log(1), models.TaskGraphLog)
+        self.assertEqual(log.nodes[0].executions[0].array_metadata.tags, ["x", "y"])
+        self.assertIsInstance(log.created_at, datetime.datetime)
+
+    def test_plans_are_cached(self):
+        self.assertIs(
+            rest_codec.decoder(models, "list[ArrayInfo]"),
+            rest_codec.decoder(models, "list[ArrayInfo]"),
+        )
+        self.assertIsNot(
+            rest_codec.decoder(models, "ArrayActivityLog"),
+            rest_codec.decoder(models_v2, "ArrayActivityLog"),
+        )
+
+    def test_bad_datetime(self):
+        with self.assertRaises(rest_api.ApiException):
+            rest_codec.decode(models, "not a date", "datetime")
+
+    def test_api_client(self):
+        client = rest_api.ApiClient(rest_api.Configuration())
+        response = types.SimpleNamespace(data=json.dumps(_task_graph_log(3)))
+        self.assertEqual(
+            client.deserialize(response, "TaskGraphLog"),
+            _reference_decode(models, _task_graph_log(3), "TaskGraphLog"),
+        )
+
+
+class EncodeTest(unittest.TestCase):
+    def test_matches_reference(self):
+        log = rest_codec.decode(models, _task_graph_log(5), "TaskGraphLog")
+        for obj in (
+            log,
+            [log, None, (1, "a")],
+            {"x": log, "when": datetime.date(2024, 1, 2)},
+            json_safe.Value({"already": ["safe"]}),
+        ):
+            self.assertEqual(rest_codec.encode(obj), _reference_encode(obj))
+
+    def test_api_client(self):
+        client = rest_api.ApiClient(rest_api.Configuration())
+        log = rest_codec.decode(models, _task_graph_log(2), "TaskGraphLog")
+        self.assertEqual(client.sanitize_for_serialization(log), _reference_encode(log))
+
+
+@pytest.mark.benchmark
+def test_benchmark_rest_codec():
+    for models_module, data, klass in (
+        (models, _task_graph_log(2000), "TaskGraphLog"),
+        (models_v2, _activity_logs(20000), "ArrayActivityLogData"),
+    ):
+        t_start = time.perf_counter()
+        expected = _reference_decode(models_module, data, klass)
+        t_reference = time.perf_counter() - t_start
+
+        rest_codec.decode(models_module, data, klass)  # Build the plan.
+        t_start = time.perf_counter()
+        result = rest_codec.decode(models_module, data, klass)
+        t_planned = time.perf_counter() - t_start
+
+        t_start = time.perf_counter()
+        expected_json = _reference_encode(result)
+        t_reference_enc = time.perf_counter() - t_start
+
+        t_start = time.perf_counter()
+        result_json = rest_codec.encode(result)
+        t_planned_enc = time.perf_counter() - t_start
+
+        print(
+            f"{klass}: decode reference {t_reference:.3f} sec,"
+            f" planned {t_planned:.3f} sec;"
+            f" encode reference {t_reference_enc:.3f} sec,"
+            f" planned {t_planned_enc:.3f} sec"
+        )
+        assert result == expected
+        assert result_json == expected_json
+        assert t_planned < t_reference
+        assert t_planned_enc < t_reference_enc
@@ -0,0 +1,136 @@
+import http.server
+import threading
+import unittest
+from unittest import mock
+
+import urllib3
+
+import tiledb
+from tiledb.cloud import instrumentation
+from tiledb.cloud import notebook
+from tiledb.cloud import retry_policy as rp
+from tiledb.cloud.pool_manager_wrapper import _PoolManagerWrapper
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests += 1
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_token_bucket(self):
+        bucket = rp.TokenBucket(2, refill_per_sec=0)
+        self.assertTrue(bucket.take())
+        self.assertTrue(bucket.take())
+        self.assertFalse(bucket.take())
+        bucket.put(0.5)
+        self.assertFalse(bucket.take())
+        bucket.put(10)
+        self.assertEqual(bucket.tokens, 2)
+
+    def test_backoff(self):
+        policy = rp.RetryPolicy(backoff_base_sec=1, backoff_max_sec=5)
+        delay = 0.0
+        for _ in range(20):
+            new_delay = policy.backoff(delay)
+            self.assertGreaterEqual(new_delay, 1)
+            self.assertLessEqual(new_delay, min(5, max(1, delay * 3)))
+            delay = new_delay
+        self.assertGreaterEqual(policy.backoff(0, base=0.1), 0.1)
+
+    def test_circuit_breaker(self):
+        policy = rp.RetryPolicy(failure_threshold=2, reset_sec=0)
+        policy.before_request("a")
+        policy.record("a", False)
+        policy.before_request("a")
+        policy.record("a", False)
+        self.assertEqual(policy.open_circuits(), {"a": 2})
+        # After reset_sec, a single request is let through...
+        policy.before_request("a")
+        with self.assertRaises(rp.CircuitOpenError):
+            policy.before_request("a")
+        policy.before_request("b")
+        # ...and its failure opens the circuit again.
+        policy.record("a", False)
+        policy.before_request("a")
+        policy.record("a", True)
+        self.assertEqual(policy.open_circuits(), {})
+        policy.before_request("a")
+        metrics = policy.metrics()
+        self.assertEqual((metrics.circuit_opened, metrics.rejected), (1, 1))
+
+
+class PolicyRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.HTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.requests = 0
+        self.server.status = 503
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/thing"
+        self.pool = urllib3.PoolManager(
+            retries=urllib3.Retry(
+                total=10,
+                backoff_factor=0,
+                status_forcelist=[503],
+                raise_on_status=False,
+            )
+        )
+
+    def test_budget(self):
+        policy = rp.RetryPolicy(
+            budget=2, budget_refill_per_sec=0, backoff_base_sec=0, backoff_max_sec=0
+        )
+        wrapper = _PoolManagerWrapper(self.pool, retry_policy=policy)
+        resp = wrapper.request("GET", self.url)
+        self.assertEqual(resp.status, 503)
+        self.assertEqual(self.server.requests, 3)
+        metrics = policy.metrics()
+        self.assertEqual((metrics.retries, metrics.denied), (2, 1))
+
+        # With the budget exhausted, requests are no longer retried.
+        wrapper.request("GET", self.url)
+        self.assertEqual(self.server.requests, 4)
+
+        # Success refills the budget.
+        self.server.status = 200
+        self.assertEqual(wrapper.request("GET", self.url).status, 200)
+        self.assertGreater(policy.budget.tokens, 0)
+
+    def test_circuit(self):
+        policy = rp.RetryPolicy(budget=0, failure_threshold=2, reset_sec=60)
+        wrapper = _PoolManagerWrapper(self.pool, retry_policy=policy)
+        with instrumentation.endpoint("/v1/{name}"):
+            wrapper.request("GET", self.url)
+            wrapper.request("GET", self.url)
+            with self.assertRaises(rp.CircuitOpenError):
+                wrapper.request("GET", self.url)
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(
+            list(policy.open_circuits()),
+            [f"127.0.0.1:{self.server.server_port}/v1/{{name}}"],
+        )
+
+
+class NotebookRetryTest(unittest.TestCase):
+    def test_create_array_backoff(self):
+        helper = mock.Mock(
+            side_effect=[tiledb.TileDBError("x"), tiledb.TileDBError("y"), ("u", "n")]
+        )
+        with mock.patch.object(
+            notebook, "_create_notebook_array_retry_helper", helper
+        ), mock.patch.object(notebook.time, "sleep") as sleep:
+            result = notebook._create_notebook_array(
+                "s3://bucket", "nb", "ns", tiledb.Ctx(), retries=2
+            )
+        self.assertEqual(result, ("u", "n"))
+        self.assertEqual(sleep.call_count, 2)
+        self.assertTrue(all(call.args[0] > 0 for call in sleep.call_args_list))
@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import time
+import types
+import unittest
+
+import urllib3
+
+from tiledb.cloud import client
+from tiledb.cloud.pool_manager_wrapper import _PoolManagerWrapper
+from tiledb.cloud.region import AWS
+from tiledb.cloud.region import routing
+
+
+def _response(*redirects):
+    history = tuple(types.SimpleNamespace(redirect_location=r) for r in redirects)
+    return types.SimpleNamespace(retries=types.SimpleNamespace(history=history))
+
+
+class _FakePool:
+    connection_pool_kw = {"retries": None}
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.urls = []
+
+    def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        return self.responses.pop(0) if self.responses else _response()
+
+    def connection_from_url(self, url):
+        pool = self
+
+        class Conn:
+            def urlopen(self, method, path, **kwargs):
+                pool.urls.append(url)
+                if "down" in url:
+                    raise urllib3.exceptions.ConnectTimeoutError()
+
+        return Conn()
+
+
+class RouteCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.path = os.path.join(tmp.name, "sub", "routes.json")
+
+    def test_persisted(self):
+        first = routing.RouteCache(self.path)
+        self.assertIsNone(first.get("api.example.com"))
+        first.set("api.example.com", "us.example.com")
+        # Another process learns a different route meanwhile.
+        other = routing.RouteCache(self.path)
+        other.set("other.example.com", "eu.example.com")
+
+        second = routing.RouteCache(self.path)
+        self.assertEqual(second.get("api.example.com"), "us.example.com")
+        self.assertEqual(second.get("other.example.com"), "eu.example.com")
+
+        second.clear()
+        self.assertIsNone(routing.RouteCache(self.path).get("api.example.com"))
+
+    def test_expired(self):
+        path = os.path.join(self.dir, "routes.json")
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "routes": {
+                        "old.example.com": {"netloc": "x", "time": 0},
+                        "new.example.com": {"netloc": "y", "time": time.time()},
+                    }
+                },
+                f,
+            )
+        cache = routing.RouteCache(path)
+        self.assertIsNone(cache.get("old.example.com"))
+        self.assertEqual(cache.get("new.example.com"), "y")
+
+    def test_unreadable(self):
+        os.makedirs(self.path)  # A directory in place of the file.
+        cache = routing.RouteCache(self.path)
+        cache.set("api.example.com", "us.example.com")
+        self.assertEqual(cache.get("api.example.com"), "us.example.com")
+
+
+class WrapperRoutingTest(unittest.TestCase):
+    def test_route_by_host(self):
+        pool = _FakePool(
+            [
+                _response("https://us.example.com/v1/arrays/a"),
+                _response("https://eu.example.com/v1/arrays/b"),
+                _response("https://bucket.s3.example.com/file?sig=1"),
+            ]
+        )
+        routes = routing.RouteCache()
+        wrapper = _PoolManagerWrapper(pool, routes=routes)
+        wrapper.request("GET", "https://api.example.com/v1/arrays/a")
+        # A new path on the same host goes straight to the learned host...
+        wrapper.request("GET", "https://api.example.com/v1/arrays/b?x=1")
+        # ...where the redirect for a resource in another region
+        # only applies to that resource.
+        wrapper.request("GET", "https://api.example.com/v1/arrays/b")
+        wrapper.request("GET", "https://api.example.com/v1/user")
+        # Redirects elsewhere (e.g. downloads) don't change the route.
+        wrapper.request("GET", "https://other.example.com/v1/file")
+
+        self.assertEqual(
+            pool.urls,
+            [
+                "https://api.example.com/v1/arrays/a",
+                "https://us.example.com/v1/arrays/b?x=1",
+                "https://eu.example.com/v1/arrays/b",
+                "https://us.example.com/v1/user",
+                "https://other.example.com/v1/file",
+            ],
+        )
+        self.assertEqual(routes.get("api.example.com"), "us.example.com")
+        self.assertIsNone(routes.get("other.example.com"))
+
+    def test_off_by_default(self):
+        self.assertIsNone(client.Client().routes)
+        pool = _FakePool([_response("https://us.example.com/v1/arrays/a")])
+        wrapper = _PoolManagerWrapper(pool)
+        wrapper.request("GET", "https://api.example.com/v1/arrays/a")
+        wrapper.request("GET", "https://api.example.com/v1/arrays/a?x=1")
+        # Only the redirected URL is cached.
+        wrapper.request("GET", "https://api.example.com/v1/user")
+        self.assertEqual(
+            pool.urls,
+            [
+                "https://api.example.com/v1/arrays/a",
+                "https://us.example.com/v1/arrays/a?x=1",
+                "https://api.example.com/v1/user",
+            ],
+        )
+
+    def test_probe(self):
+        pool = _FakePool()
+        latencies = routing.probe(
+            pool, ["https://up.example.com/v1", "https://down.example.com"]
+        )
+        self.assertIsInstance(latencies["https://up.example.com/v1"], float)
+        self.assertIsNone(latencies["https://down.example.com"])
+        self.assertIn("https://up.example.com", pool.urls)
+
+    def test_hosts(self):
+        self.assertIn(AWS.US_EAST_1, routing.hosts())
+        self.assertEqual(len(routing.hosts()), 5)
@@ -0,0 +1,146 @@
+import functools
+import threading
+import time
+import unittest
+from concurrent import futures
+
+from tiledb.cloud import dag
+from tiledb.cloud._common import timing
+from tiledb.cloud._results import results
+from tiledb.cloud.dag import speculation
+
+
+def _straggler(calls):
+    """A function whose first call hangs until the second call is done."""
+    lock = threading.Lock()
+    second_done = threading.Event()
+
+    def func(value):
+        with lock:
+            calls.append(value)
+            first = len(calls) == 1
+        if first:
+            second_done.wait(10)
+            return "first"
+        second_done.set()
+        return "second"
+
+    return func
+
+
+def _prime(stages, stage, seconds=0.01, count=5):
+    for _ in range(count):
+        stages.record(stage, seconds)
+
+
+class StageTimesTest(unittest.TestCase):
+    def test_threshold(self):
+        stages = speculation.StageTimes(
+            speculation.Speculation(percentile=0.5, multiplier=2, min_samples=3)
+        )
+        stages.record("a", 3)
+        stages.record("a", 1)
+        self.assertIsNone(stages.threshold("a"))
+        stages.record("a", 2)
+        self.assertEqual(stages.threshold("a"), 4)
+        self.assertIsNone(stages.threshold("b"))
+        stages.record("a", 0.1)
+        self.assertEqual(stages.threshold("a"), 2)
+
+    def test_stage_of(self):
+        self.assertEqual(
+            speculation.stage_of(functools.partial(functools.partial(len), "x")),
+            "builtins.len",
+        )
+
+    def test_bad_percentile(self):
+        with self.assertRaises(ValueError):
+            speculation.Speculation(percentile=0)
+
+
+class RunTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = futures.ThreadPoolExecutor(4)
+        self.addCleanup(self.executor.shutdown)
+        self.stages = speculation.StageTimes(speculation.Speculation(min_sec=0))
+
+    def test_duplicate_wins(self):
+        calls = []
+        _prime(self.stages, "s")
+        times = timing.NodeTimes(queued=1, started=2)
+        result, won = speculation.run(
+            self.executor,
+            _straggler(calls),
+            ("x",),
+            {},
+            times=times,
+            stages=self.stages,
+            stage="s",
+            speculate=True,
+        )
+        self.assertEqual(result, "second")
+        self.assertEqual(calls, ["x", "x"])
+        self.assertIsNot(won, times)
+        self.assertEqual((won.queued, won.started), (1, 2))
+        self.assertEqual((self.stages.launched, self.stages.won), (1, 1))
+
+    def test_not_idempotent(self):
+        _prime(self.stages, "s")
+        result, won = speculation.run(
+            self.executor,
+            lambda: time.sleep(0.2) or "done",
+            (),
+            {},
+            times=timing.NodeTimes(),
+            stages=self.stages,
+            stage="s",
+        )
+        self.assertEqual(result, "done")
+        self.assertEqual(self.stages.launched, 0)
+        self.assertGreater(self.stages.threshold("s"), 0.01)
+
+    def test_failures(self):
+        _prime(self.stages, "s")
+        errors = iter((ValueError("first"), ValueError("second")))
+
+        def fail():
+            error = next(errors)
+            time.sleep(0.1)
+            raise error
+
+        with self.assertRaisesRegex(ValueError, "first"):
+            speculation.run(
+                self.executor,
+                fail,
+                (),
+                {},
+                times=timing.NodeTimes(),
+                stages=self.stages,
+                stage="s",
+                speculate=True,
+            )
+        self.assertEqual(self.stages.launched, 1)
+
+
+def _fake_base(func, *args, **kwargs):
+    """Stands in for a remote ``*_base`` function, running ``func`` locally."""
+    return results.LocalResult(func(*args))
+
+
+class DAGSpeculationTest(unittest.TestCase):
+    def test_dag(self):
+        calls = []
+        func = _straggler(calls)
+        d = dag.DAG(
+            namespace="test",
+            speculation=dag.Speculation(min_sec=0),
+        )
+        # Skip registering the graph on the server.
+        d._tried_setup = True
+        _prime(d.stage_times, speculation.stage_of(func))
+        node = d._add_prewrapped_node(_fake_base, func, "x", idempotent=True)
+        d.compute()
+        d.wait(5)
+        self.assertEqual(node.result(), "second")
+        self.assertEqual(d.stage_times.won, 1)
+        self.assertIsNotNone(node.times.completed)
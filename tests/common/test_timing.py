@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+import unittest
+
+from tiledb.cloud import dag
+from tiledb.cloud._common import timing
+
+
+def _node(id, parents=(), **times):
+    return timing.NodeTiming(
+        id=id, name=id.upper(), parents=tuple(parents), times=timing.NodeTimes(**times)
+    )
+
+
+class NodeTimesTest(unittest.TestCase):
+    def test_phases(self):
+        remote = timing.NodeTimes(
+            queued=1, started=2, submitted=4, accepted=7, downloaded=8, completed=9
+        )
+        self.assertEqual(
+            remote.phases(ready=0.5),
+            [
+                ("wait", 0.5, 1),
+                ("queue", 1, 2),
+                ("prepare", 2, 4),
+                ("server", 4, 7),
+                ("download", 7, 8),
+                ("finish", 8, 9),
+            ],
+        )
+        local = timing.NodeTimes(queued=1, started=2, submitted=2, completed=5)
+        self.assertEqual(
+            local.phases(),
+            [("queue", 1, 2), ("prepare", 2, 2), ("run", 2, 5)],
+        )
+        batch = timing.NodeTimes(started=3, completed=5)
+        self.assertEqual(batch.phases(ready=1), [("wait", 1, 3), ("run", 3, 5)])
+
+    def test_record(self):
+        times = timing.NodeTimes()
+
+        def work():
+            timing.mark("accepted")
+            return threading.current_thread().name
+
+        self.assertEqual(timing.record(times, work)(), threading.current_thread().name)
+        self.assertLessEqual(times.submitted, times.accepted)
+        self.assertLessEqual(times.accepted, times.completed)
+        # Outside of `record`, marks go nowhere.
+        timing.mark("downloaded")
+        self.assertIsNone(times.downloaded)
+
+
+class TimingReportTest(unittest.TestCase):
+    def test_critical_path(self):
+        report = timing.TimingReport.build(
+            [
+                _node("a", queued=0, started=1, submitted=1, completed=3),
+                _node("b", queued=0, started=0, submitted=0, completed=5),
+                _node("c", ["a", "b"], queued=6, started=6, submitted=7, completed=8),
+                _node("d", ["a"], queued=3, started=3, submitted=3, completed=4),
+                _node("unfinished", ["c"], queued=8),
+            ]
+        )
+        self.assertEqual([n.id for n in report.critical_path], ["b", "c"])
+        self.assertEqual(len(report.nodes), 4)
+        self.assertEqual(report.wall_sec, 8)
+        self.assertEqual(report.critical_path_sec, 8)
+        self.assertEqual(report.critical_phases["wait"], 1)
+        self.assertEqual(report.critical_phases["prepare"], 1)
+        self.assertEqual(report.client_overhead_sec, 1)
+        self.assertEqual(report.phases["run"], 9)
+        self.assertIn("critical path: B -> C", report.summary())
+
+        trace = report.to_chrome_trace()
+        json.dumps(trace)
+        slices = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual({e["args"]["node"] for e in slices}, {"A", "B", "C", "D"})
+        self.assertEqual(min(e["ts"] for e in slices), 0)
+        wait = next(e for e in slices if e["name"] == "wait")
+        self.assertEqual((wait["ts"], wait["dur"], wait["cat"]), (5e6, 1e6, "critical"))
+
+    def test_empty(self):
+        report = timing.TimingReport.build([])
+        self.assertEqual(report.critical_path, ())
+        self.assertEqual(report.wall_sec, 0)
+        self.assertEqual(report.to_chrome_trace()["traceEvents"], [])
+
+
+class DAGTimingTest(unittest.TestCase):
+    def test_local_dag(self):
+        d = dag.DAG(namespace="test")
+        slow = d.submit_local(time.sleep, 0.1, name="slow")
+        fast = d.submit_local(time.sleep, 0.01, name="fast")
+        last = d.submit_local(lambda *_: None, slow, fast, name="last")
+        d.compute()
+        d.wait(10)
+
+        for node in (slow, fast, last):
+            times = node.times
+            self.assertLessEqual(times.queued, times.started)
+            self.assertLessEqual(times.started, times.submitted)
+            self.assertLessEqual(times.submitted, times.completed)
+            self.assertIsNone(times.accepted)
+        self.assertGreaterEqual(last.times.queued, slow.times.completed)
+
+        report = d.timing_report()
+        self.assertEqual([n.name for n in report.critical_path], ["slow", "last"])
+        self.assertGreaterEqual(report.critical_phases["run"], 0.1)
@@ -4,11 +4,14 @@ import pathlib
 import pickle
 import tempfile
 import unittest
+from unittest import mock
 
 import pytz  # Test-only dependency.
 
 from tiledb.cloud._common import utils
 from tiledb.cloud.utilities import find
+from tiledb.cloud.utilities import iter_files
+from tiledb.cloud.utilities import partition_by_size
 
 
 class UtilsTest(unittest.TestCase):
@@ -69,6 +72,86 @@ class UtilsTest(unittest.TestCase):
                 len(list(find(tmp, include=lambda f: f.endswith(".dat")))), 1
             )
 
+    def test_iter_files(self):
+        with tempfile.TemporaryDirectory() as tmp_name:
+            tmp = pathlib.Path(tmp_name)
+            (tmp / "data.dat").write_text("test_data")
+            (tmp / "empty.dat").write_text("")
+            for name in ("a", "b", "c"):
+                (tmp / name).mkdir()
+                (tmp / name / "xx.txt").write_text(f"test_{name}")
+            (tmp / "c" / "d").mkdir()
+            (tmp / "c" / "d" / "yy.txt").write_text("test_yy")
+
+            expected = {
+                (tmp / "data.dat").as_uri(): 9,
+                (tmp / "empty.dat").as_uri(): 0,
+                (tmp / "a" / "xx.txt").as_uri(): 6,
+                (tmp / "b" / "xx.txt").as_uri(): 6,
+                (tmp / "c" / "xx.txt").as_uri(): 6,
+                (tmp / "c" / "d" / "yy.txt").as_uri(): 7,
+            }
+
+            # Directories are classified without a VFS.is_dir call.
+            with mock.patch("tiledb.VFS.is_dir", side_effect=AssertionError):
+                self.assertEqual(dict(iter_files(tmp)), expected)
+                self.assertEqual(dict(iter_files(tmp, max_workers=4)), expected)
+
+            self.assertEqual(len(list(iter_files(tmp, max_count=2))), 2)
+            self.assertEqual(len(list(iter_files(tmp, max_workers=4, max_count=2))), 2)
+
+    def test_iter_files_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_name:
+            tmp = pathlib.Path(tmp_name)
+            data = tmp / "data"
+            for name in ("a", "b"):
+                (data / name).mkdir(parents=True)
+                (data / name / "xx.txt").write_text(f"test_{name}")
+            checkpoint = str(tmp / "checkpoint.json")
+
+            first = sorted(iter_files(data, checkpoint_uri=checkpoint))
+            self.assertEqual(len(first), 2)
+
+            # Completed prefixes are not listed again.
+            (data / "a" / "new.txt").write_text("test_new")
+            second = sorted(iter_files(data, checkpoint_uri=checkpoint))
+            self.assertEqual(second, first)
+
+            # A checkpoint of another search is ignored.
+            other = sorted(iter_files(data / "a", checkpoint_uri=checkpoint))
+            self.assertEqual(len(other), 2)
+
+    def test_partition_by_size(self):
+        items = ["a", "b", "c", "d", "e", "f", "g"]
+        sizes = [100, 1, 1, 1, 1, 1, 50]
+
+        self.assertEqual(partition_by_size([], []), [])
+        self.assertEqual(partition_by_size(items, sizes), [items])
+        self.assertEqual(
+            partition_by_size(items, sizes, num_batches=3),
+            [["a"], ["g"], ["b", "c", "d", "e", "f"]],
+        )
+        # No more batches than items.
+        self.assertEqual(len(partition_by_size(items, sizes, num_batches=10)), 7)
+
+        batches = partition_by_size(items, sizes, max_batch_items=2)
+        self.assertEqual(len(batches), 4)
+        self.assertTrue(all(len(b) <= 2 for b in batches))
+        self.assertEqual(sorted(sum(batches, [])), items)
+
+        batches = partition_by_size(items, sizes, target_batch_bytes=60)
+        self.assertEqual(len(batches), 3)
+        self.assertIn(["a"], batches)
+
+        # Without sizes, batches are balanced by count.
+        self.assertEqual(
+            partition_by_size(items, [0] * 7, max_batch_items=3),
+            [["a", "d", "g"], ["b", "e"], ["c", "f"]],
+        )
+
+        with self.assertRaises(ValueError):
+            partition_by_size(items, sizes[1:])
+
 
 def _b64_unpickle(x):
     raw = base64.b64decode(x)
@@ -413,6 +413,40 @@ class BasicTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_ranges(["idx"])
 
+    def test_parse_ranges_bulk(self):
+        parse_ranges = array.parse_ranges
+
+        points = list(range(0, 10000, 2))
+        parsed = parse_ranges([points, [(1, 2), (5, 8)]])
+        self.assertEqual(parsed.value[0][:4], [0, 0, 2, 2])
+        self.assertEqual(len(parsed.value[0]), 10000)
+        self.assertEqual(parsed.value[1], [1, 2, 5, 8])
+        # Already-parsed ranges are passed through.
+        self.assertIs(parse_ranges(parsed), parsed)
+
+        a = [
+            np.array([[1, 2], [4, 4]]),
+            np.array(["2020-01-01", "2020-01-03"], dtype="datetime64[D]"),
+        ]
+        b = [[1, 2, 4, 4], [18262, 18264]]
+        self.assertEqual(parse_ranges(a), json_safe.Value(b))
+
+        a = [[(5, 9), (1, 3), 4, (20, 30), 25], [0.5, (0.1, 0.6), 2.0], [3, 1, 2]]
+        b = [[1, 9, 20, 30], [0.1, 0.6, 2.0, 2.0], [1, 3]]
+        self.assertEqual(parse_ranges(a, coalesce=True), json_safe.Value(b))
+
+        for bad in ([[(3, 1)]], [(3, 1)], [np.array([3, 1])], [np.array([1, 2, 3])]):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                parse_ranges(bad)
+
+        # Lists NumPy would convert to floats keep their exact values.
+        a = [[-1, 2**63], [1, 2.5], [(0, 2**64 - 1)]]
+        b = [[-1, -1, 2**63, 2**63], [1, 1, 2.5, 2.5], [0, 2**64 - 1]]
+        for coalesce in (False, True):
+            parsed = parse_ranges(a, coalesce=coalesce).value
+            self.assertEqual(parsed, b)
+            self.assertEqual([type(x) for x in parsed[1]], [int, int, float, float])
+
     def test_groups(self):
         self.needsUnittestUser()
         got = client.list_groups(
@@ -9,6 +9,7 @@ import base64
 import collections
 import collections.abc as cabc
 import itertools
+import json
 import operator
 import pickle
 import threading
@@ -38,6 +39,7 @@ from tiledb.cloud._vendor import cloudpickle as tdbcp
 from tiledb.cloud.client import default_user
 from tiledb.cloud.dag import Mode
 from tiledb.cloud.dag import dag as dag_dag
+from tiledb.cloud.dag import visualization as dag_visualization
 from tiledb.cloud.rest_api import models
 
 pytestmark = pytest.mark.udf
@@ -1088,6 +1090,103 @@ class DAGCallbackTest(unittest.TestCase):
         self.assertEqual(self.done_updates, 1)
 
 
+class _FakeNode:
+    def __init__(self, name, status=dag.Status.NOT_STARTED):
+        self.name = name
+        self.status = status
+
+
+class DAGVisualizationTest(unittest.TestCase):
+    def test_throttler_coalesces_updates(self):
+        rendered = threading.Event()
+        render = MagicMock(side_effect=lambda: rendered.set())
+        throttler = dag_visualization.UpdateThrottler(render, interval=0.05)
+
+        for _ in range(100):
+            throttler(None)
+        self.assertTrue(rendered.wait(5))
+        time.sleep(0.1)
+        self.assertEqual(render.call_count, 1)
+
+        throttler(None)
+        throttler.flush(None)
+        time.sleep(0.1)
+        self.assertEqual(render.call_count, 2)
+
+    def test_throttler_logs_render_errors(self):
+        render = MagicMock(side_effect=RuntimeError("widget closed"))
+        throttler = dag_visualization.UpdateThrottler(render)
+        with self.assertLogs(dag_visualization.logger) as logs:
+            throttler._fire()
+        self.assertIn("widget closed", logs.output[0])
+
+    def test_plotly_updater_renders_changes(self):
+        nodes = [_FakeNode("a"), _FakeNode("b", dag.Status.RUNNING)]
+        fig = MagicMock()
+        updater = dag_visualization.PlotlyGraphUpdater(nodes, fig)
+        self.assertEqual(updater.colors, ["black", "blue"])
+        self.assertEqual(updater.text, ["a - Not Started", "b - Running"])
+
+        updater()
+        fig.update_traces.assert_not_called()
+
+        nodes[1].status = dag.Status.PARENT_FAILED
+        updater()
+        fig.update_traces.assert_called_once_with(
+            marker=dict(color=["black", "orange"]),
+            text=["a - Not Started", "b - Parent Failed"],
+            selector=dict(mode="markers"),
+        )
+
+    def test_tiledb_updater_renders_changes(self):
+        nodes = {"1": _FakeNode("a"), "2": _FakeNode("b")}
+        fig = MagicMock()
+        updater = dag_visualization.TileDBGraphUpdater(
+            ["1", "2"], [("1", "2")], {"1": [0, 0], "2": [0, 1]}, nodes, fig
+        )
+        self.assertEqual(
+            json.loads(updater.data()),
+            {
+                "nodes": ["1", "2"],
+                "edges": [["1", "2"]],
+                "positions": {"1": [0, 0], "2": [0, 1]},
+                "node_details": {
+                    "1": {"name": "a", "status": "Not Started"},
+                    "2": {"name": "b", "status": "Not Started"},
+                },
+            },
+        )
+
+        updater()
+        fig.setData.assert_not_called()
+
+        nodes["2"].status = dag.Status.COMPLETED
+        updater()
+        fig.setData.assert_called_once()
+        data = json.loads(fig.setData.call_args.args[0])
+        self.assertEqual(data["node_details"]["2"]["status"], "Completed")
+
+    def test_layout_is_cached(self):
+        d = dag.DAG(namespace="namespace")
+        a = d.submit_local(len, "a")
+        d.submit_local(len, a)
+        d.submit_local(len, a)
+
+        with patch.object(
+            dag_visualization,
+            "build_visualization_positions",
+            side_effect=dag_visualization.build_visualization_positions,
+        ) as build:
+            first = d._visualization_positions(d.networkx_graph())
+            second = d._visualization_positions(d.networkx_graph())
+            self.assertIs(first, second)
+            self.assertEqual(build.call_count, 1)
+
+            d.submit_local(len, a)
+            d._visualization_positions(d.networkx_graph())
+            self.assertEqual(build.call_count, 2)
+
+
 class TopoSortTest(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(dag_dag._topo_sort([]), [])
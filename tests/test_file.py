@@ -5,6 +5,7 @@ import random
 import tempfile
 import unittest
 from typing import List
+from unittest import mock
 
 import pytest
 
@@ -153,6 +154,64 @@ class TestFileUDFs(unittest.TestCase):
                 )
                 self.assertEqual(result, chunks_out)
 
+    def test_find_uris_udf_sizes(self):
+        local_test_files = os.path.join(CURRENT_DIR, "data", "simple_files")
+        uris = file_udfs.find_uris_udf(local_test_files)
+        sized = file_udfs.find_uris_udf(local_test_files, include_sizes=True)
+        self.assertEqual(sorted(uri for uri, _ in sized), sorted(uris))
+        for uri, size in sized:
+            self.assertEqual(size, os.path.getsize(uri[len("file://") :]))
+
+    def test_ingest_files_udf_bulk(self):
+        def create_file(namespace, name, input_uri, output_uri, **kwargs):
+            if name == "exists.txt":
+                raise tiledb.cloud.TileDBCloudError(
+                    409,
+                    json_data={
+                        "message": "array already exists at location",
+                        "code": 8003,
+                    },
+                )
+            return tiledb.cloud.rest_api.models.FileCreated(
+                output_uri=output_uri, file_name=f"{name}-registered"
+            )
+
+        profile = mock.Mock(default_namespace_charged="ns")
+        with mock.patch.object(
+            file_utils, "create_file", side_effect=create_file
+        ) as create, mock.patch.object(
+            file_ingestion, "info", side_effect=AssertionError
+        ), mock.patch.object(
+            tiledb.cloud, "user_profile", return_value=profile
+        ) as user_profile:
+            result = file_ingestion.ingest_files_udf(
+                "s3://bucket/dataset",
+                [f"s3://bucket/input/{n}.txt" for n in range(20)]
+                + ["s3://bucket/input/exists.txt"],
+                max_workers=4,
+            )
+
+        user_profile.assert_called_once()
+        self.assertEqual(create.call_count, 21)
+        self.assertEqual(result, [f"tiledb://ns/{n}.txt-registered" for n in range(20)])
+
+    def test_chunk_sized_results(self):
+        items = [["big", 1000], ["a", 10], ["b", 10], ["c", 10], ["d", 10]]
+
+        result = file_udfs.chunk_udf(items=items, batch_size=4, sized_items=True)
+        self.assertEqual(result, [["big"], ["a", "b", "c", "d"]])
+
+        result = file_udfs.chunk_udf(
+            items=[items[:2], items[2:]],
+            batch_size=4,
+            flatten_items=True,
+            sized_items=True,
+            batch_bytes=400,
+        )
+        self.assertEqual(len(result), 3)
+        self.assertIn(["big"], result)
+        self.assertEqual(sorted(sum(result, [])), ["a", "b", "big", "c", "d"])
+
 
 def _cleanup_residual_test_arrays(array_uris: List[str]) -> None:
     """Deletes every array in a list and potential non unique tables"""
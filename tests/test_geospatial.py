@@ -222,6 +222,57 @@ class GeospatialTest(unittest.TestCase):
             self.assertEqual(meta_1[0].scales, (0.01, 0.01, 0.01))
             self.assertEqual(meta_1[0].offsets, (0.0, 0.0, 0.0))
 
+    def test_raster_load_metadata_cache(self):
+        import rasterio
+
+        import tiledb.cloud.geospatial as geo
+
+        sources = [str(self.test_dir.joinpath(r)) for r in RASTER_NAMES[:3]]
+        cache_uri = str(self.test_dir.joinpath("metadata_cache"))
+
+        meta_1 = geo.load_raster_metadata(sources, cache_uri=cache_uri)
+        self.assertEqual([m.path for m in meta_1], sources)
+        self.assertEqual(len(os.listdir(cache_uri)), 3)
+        for entry in os.listdir(cache_uri):
+            with open(os.path.join(cache_uri, entry)) as f:
+                self.assertIn("metadata", json.load(f))
+
+        # Unchanged sources are not opened again
+        with mock.patch.object(rasterio, "open", side_effect=rasterio.open) as m:
+            meta_2 = geo.load_raster_metadata(sources, cache_uri=cache_uri)
+            m.assert_not_called()
+        self.assertEqual(meta_2, meta_1)
+        self.assertIsInstance(meta_2[0].crs, rasterio.crs.CRS)
+
+        # A source with a different size is read again
+        with open(sources[0], "ab") as f:
+            f.write(b"\0")
+        with mock.patch.object(rasterio, "open", side_effect=rasterio.open) as m:
+            meta_3 = geo.load_raster_metadata(sources, cache_uri=cache_uri)
+            self.assertEqual(m.call_count, 1)
+        self.assertEqual(meta_3, meta_1)
+
+    def test_point_array(self):
+        import laspy
+
+        from tiledb.cloud.geospatial.ingestion import _fill_point_array
+        from tiledb.cloud.geospatial.ingestion import _point_array
+        from tiledb.cloud.geospatial.ingestion import _prefetch
+
+        with laspy.open(PC_NAMES[0]) as las:
+            chunks = list(_prefetch(las.chunk_iterator(30)))
+        self.assertEqual(len(chunks), 4)
+
+        # the buffer is reused for every chunk
+        buffer = _point_array(chunks[0], 30)
+        for c in chunks:
+            n = _fill_point_array(buffer, c)
+            self.assertEqual(n, len(c))
+            np.testing.assert_array_equal(buffer["X"][:n], c.x)
+            np.testing.assert_array_equal(buffer["Y"][:n], c.y)
+            np.testing.assert_array_equal(buffer["Z"][:n], c.z)
+            np.testing.assert_array_equal(buffer["intensity"][:n], c.intensity)
+
     def test_geometry_load_metadata(self):
         import fiona
 
@@ -233,6 +284,21 @@ class GeospatialTest(unittest.TestCase):
             self.assertEqual(meta_1[0].geometry_schema["geometry"], "Polygon")
             self.assertEqual(meta_1[0].crs, fiona.crs.CRS.from_epsg(4326))
 
+    def test_geometry_load_metadata_cache(self):
+        import fiona
+
+        import tiledb.cloud.geospatial as geo
+
+        sources = [str(self.test_dir.joinpath(g)) for g in GEOM_NAMES]
+        cache_uri = str(self.test_dir.joinpath("geometry_metadata_cache"))
+
+        meta_1 = geo.load_geometry_metadata(sources, cache_uri=cache_uri)
+        with mock.patch.object(fiona, "open", side_effect=fiona.open) as m:
+            meta_2 = geo.load_geometry_metadata(sources, cache_uri=cache_uri)
+            m.assert_not_called()
+        self.assertEqual(meta_2, meta_1)
+        self.assertIsInstance(meta_2[0].crs, fiona.crs.CRS)
+
     def test_raster_ingest(self):
         import rasterio
 
@@ -0,0 +1,130 @@
+import json
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy
+
+import tiledb
+from tiledb.cloud import notebook
+
+
+def _notebook_json(cells: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return json.dumps(
+        {
+            "cells": [
+                {
+                    "cell_type": "code",
+                    "source": [f"x = {rng.random()}\n" * rng.randint(1, 200)],
+                    "outputs": [{"text": "".join(rng.choices("abcdef", k=500))}],
+                }
+                for _ in range(cells)
+            ]
+        },
+        indent=1,
+    )
+
+
+def _create_local_notebook_array(uri: str) -> None:
+    dom = tiledb.Domain(
+        tiledb.Dim(
+            name="position",
+            domain=(0, numpy.iinfo(numpy.uint64).max - 1025),
+            tile=1024,
+            dtype=numpy.uint64,
+        )
+    )
+    schema = tiledb.ArraySchema(
+        domain=dom,
+        sparse=False,
+        attrs=[tiledb.Attr(name="contents", dtype=numpy.uint8)],
+    )
+    tiledb.Array.create(uri, schema)
+
+
+class ContentChunksTest(unittest.TestCase):
+    def test_chunks_cover_contents(self):
+        for size in (0, 10, notebook._CHUNK_WINDOW + 1, 300_000):
+            with self.subTest(size=size):
+                data = numpy.random.default_rng(size).integers(
+                    0, 256, size=size, dtype=numpy.uint8
+                )
+                chunks = notebook._content_chunks(data)
+                self.assertEqual(sum(length for _, length, _ in chunks), size)
+                self.assertTrue(
+                    all(length <= notebook._CHUNK_MAX_SIZE for _, length, _ in chunks)
+                )
+                self.assertEqual(
+                    notebook._decode_chunks(notebook._encode_chunks(chunks)), chunks
+                )
+
+    def test_boundaries_follow_content(self):
+        data = numpy.frombuffer(_notebook_json(300).encode(), dtype=numpy.uint8)
+        edited = numpy.concatenate([data[:1000], data[1000:1010], data[1000:]])
+        before = {digest for _, _, digest in notebook._content_chunks(data)}
+        after = notebook._content_chunks(edited)
+        self.assertGreater(len(after), 10)
+        # Only the chunk around the insertion differs.
+        self.assertLessEqual(
+            len([c for c in after if c[2] not in before]), 2, msg=after
+        )
+
+    def test_changed_ranges(self):
+        previous = [(0, 10, "a"), (10, 10, "b"), (20, 10, "c"), (30, 5, "d")]
+        current = [(0, 10, "a"), (10, 10, "x"), (20, 10, "y"), (30, 5, "d")]
+        self.assertEqual(notebook._changed_ranges(previous, current), [(10, 30)])
+        self.assertEqual(notebook._changed_ranges([], current), [(0, 35)])
+        # Same digest at another offset is not the same chunk.
+        self.assertEqual(
+            notebook._changed_ranges([(5, 10, "a")], [(0, 10, "a")]), [(0, 10)]
+        )
+
+
+class IncrementalWriteTest(unittest.TestCase):
+    def test_incremental_write(self):
+        contents = _notebook_json(300)
+        # Same-length edit near the end.
+        edit_at = len(contents) - 5000
+        edited = contents[:edit_at] + "Z" * 20 + contents[edit_at + 20 :]
+        shorter = contents[: len(contents) // 2]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            uri = f"{tmp}/notebook"
+            _create_local_notebook_array(uri)
+            ctx = tiledb.Ctx()
+
+            with mock.patch.object(notebook.client, "Ctx", tiledb.Ctx):
+                notebook._write_notebook_to_array(uri, contents, ctx)
+                self.assertEqual(notebook.download_notebook_contents(uri), contents)
+
+                notebook._write_notebook_to_array(uri, edited, ctx, incremental=True)
+                self.assertEqual(notebook.download_notebook_contents(uri), edited)
+
+                notebook._write_notebook_to_array(uri, shorter, ctx, incremental=True)
+                self.assertEqual(notebook.download_notebook_contents(uri), shorter)
+
+            # The edits only rewrote the chunks around the edit and the end.
+            fragments = tiledb.array_fragments(uri)
+            self.assertEqual(len(fragments), 3)
+            ((start, end),) = fragments[1].nonempty_domain
+            self.assertLessEqual(start, edit_at)
+            self.assertGreaterEqual(end, edit_at + 19)
+            self.assertLess(end - start, notebook._CHUNK_MAX_SIZE * 2)
+            ((start, end),) = fragments[2].nonempty_domain
+            self.assertEqual(end, len(shorter) - 1)
+            self.assertLessEqual(end - start, notebook._CHUNK_MAX_SIZE)
+
+    def test_consolidate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            uri = f"{tmp}/notebook"
+            _create_local_notebook_array(uri)
+            ctx = tiledb.Ctx()
+            for n in range(3):
+                notebook._write_notebook_to_array(uri, _notebook_json(10, n), ctx)
+
+            notebook._consolidate_notebook_array(uri, ctx, 4)
+            self.assertEqual(len(tiledb.array_fragments(uri)), 3)
+            notebook._consolidate_notebook_array(uri, ctx, 3)
+            self.assertEqual(len(tiledb.array_fragments(uri)), 1)
@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+import tiledb
+from tiledb.cloud.utilities import consolidate_fragments
+from tiledb.cloud.utilities import plan_consolidation
+from tiledb.cloud.utilities.consolidate import _plan_group
+from tiledb.cloud.utilities.consolidate import consolidate
+
+
+class PlanGroupTest(unittest.TestCase):
+    def plan(self, sizes, **kwargs):
+        kwargs.setdefault("max_fragment_size", 100)
+        kwargs.setdefault("max_task_fragments", 1000)
+        kwargs.setdefault("max_task_bytes", 1000)
+        tasks = _plan_group([(str(n), s) for n, s in enumerate(sizes)], **kwargs)
+        return [list(task.fragments) for task in tasks]
+
+    def test_skip_optimal(self):
+        self.assertEqual(self.plan([]), [])
+        self.assertEqual(self.plan([10]), [])
+        self.assertEqual(self.plan([60, 60]), [])
+        self.assertEqual(self.plan([100, 500, 200]), [])
+
+    def test_runs_between_large_fragments(self):
+        self.assertEqual(
+            self.plan([1, 1, 500, 1, 300, 1, 1, 1]),
+            [
+                ["0", "1"],
+                ["5", "6", "7"],
+            ],
+        )
+
+    def test_split_by_count(self):
+        tasks = self.plan([1] * 10, max_task_fragments=4)
+        self.assertEqual([len(t) for t in tasks], [3, 4, 3])
+        self.assertEqual(sum(tasks, []), [str(n) for n in range(10)])
+
+    def test_split_by_bytes(self):
+        tasks = self.plan([50] * 10 + [10] * 50, max_task_bytes=500)
+        self.assertEqual(len(tasks), 2)
+        self.assertEqual(tasks[0], [str(n) for n in range(10)])
+        self.assertEqual(sum(tasks, []), [str(n) for n in range(60)])
+
+
+class PlanConsolidationTest(unittest.TestCase):
+    def test_plan_and_consolidate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            uri = f"{tmp}/array"
+            schema = tiledb.ArraySchema(
+                domain=tiledb.Domain(
+                    tiledb.Dim("row", (0, 3), 1, dtype=np.int64),
+                    tiledb.Dim("col", (0, 999), 100, dtype=np.int64),
+                ),
+                attrs=[tiledb.Attr("a", dtype=np.int64)],
+                sparse=True,
+            )
+            tiledb.Array.create(uri, schema)
+            # Rows 0 and 1 get three fragments each, row 2 a single one.
+            for row, count in ((0, 3), (1, 3), (2, 1)):
+                for n in range(count):
+                    with tiledb.open(uri, "w") as A:
+                        cols = np.arange(n * 10, n * 10 + 10)
+                        A[np.full(10, row), cols] = {"a": cols}
+
+            plan = plan_consolidation(uri, group_by_first_dim=True)
+            self.assertEqual(plan.fragments, 7)
+            self.assertEqual(plan.groups, 3)
+            self.assertEqual(plan.skipped_groups, 1)
+            self.assertEqual([len(t.fragments) for t in plan.tasks], [3, 3])
+            self.assertGreater(plan.bytes, 0)
+            self.assertIn("2 tasks consolidating 6 fragments", plan.report())
+
+            dry_run = consolidate_fragments(uri, group_by_first_dim=True, dry_run=True)
+            self.assertEqual(dry_run, plan)
+
+            for task in plan.tasks:
+                consolidate(uri, task.fragments)
+            consolidate(uri, [])
+            tiledb.vacuum(uri)
+
+            self.assertEqual(len(tiledb.FragmentInfoList(uri)), 3)
+            plan = plan_consolidation(uri, group_by_first_dim=True)
+            self.assertEqual(plan.tasks, [])
+            self.assertEqual(plan.skipped_groups, 3)
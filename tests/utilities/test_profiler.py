@@ -0,0 +1,122 @@
+import json
+import pathlib
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+import tiledb
+from tiledb.cloud.utilities import Profiler
+from tiledb.cloud.utilities import ResourceSampler
+from tiledb.cloud.utilities import create_log_array
+from tiledb.cloud.utilities import write_log_event
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.uri = f"{self.tmp.name}/log"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_log(self):
+        with tiledb.open(self.uri) as A:
+            return A.df[:].sort_values("time_ms", kind="stable")
+
+    def test_batched_writes(self):
+        create_log_array(self.uri)
+        with Profiler(array_uri=self.uri, id="test", period_sec=0) as prof:
+            for n in range(10):
+                prof.write("event", str(n))
+
+        # start, 10 events, finish and stats in one fragment.
+        self.assertEqual(len(tiledb.array_fragments(self.uri)), 1)
+        df = self.read_log()
+        self.assertEqual(len(df), 13)
+        self.assertEqual(df.op.value_counts()["event"], 10)
+        self.assertEqual(
+            sorted(df.data[df.op == "event"]), sorted(str(n) for n in range(10))
+        )
+        self.assertEqual(set(df.id), {"test"})
+
+    def test_flush_thresholds(self):
+        create_log_array(self.uri)
+        with Profiler(
+            array_uri=self.uri, period_sec=0, flush_events=4, flush_sec=3600
+        ) as prof:
+            for n in range(6):
+                prof.write("event", str(n))
+            # start + 6 events: one batch of 4 written, 3 buffered.
+            self.assertEqual(len(tiledb.array_fragments(self.uri)), 1)
+
+            prof.flush_sec = 0
+            prof.write("event", "late")
+            self.assertEqual(len(tiledb.array_fragments(self.uri)), 2)
+
+        self.assertEqual(len(self.read_log()), 10)
+
+    def test_structured_samples(self):
+        create_log_array(self.uri)
+        with Profiler(array_uri=self.uri, period_sec=0.05):
+            time.sleep(0.3)
+
+        df = self.read_log()
+        samples = df[df.op == "sample"]
+        self.assertGreaterEqual(len(samples), 2)
+        self.assertEqual(samples.cpu.dtype, np.uint64)
+        stats = df[df.op == "stats"]
+        summary = json.loads(stats.extra.iloc[0])
+        self.assertGreater(summary["elapsed_sec"], 0)
+
+    def test_cgroup_samples(self):
+        cgroup = pathlib.Path(self.tmp.name, "cgroup")
+        cgroup.mkdir()
+        (cgroup / "cgroup.controllers").write_text("cpu memory\n")
+        (cgroup / "memory.current").write_text("1000\n")
+        (cgroup / "memory.peak").write_text("7000\n")
+        (cgroup / "cpu.stat").write_text("usage_usec 1000\nthrottled_usec 5\n")
+        sampler = ResourceSampler(cgroup_root=str(cgroup))
+
+        create_log_array(self.uri)
+        with Profiler(array_uri=self.uri, period_sec=0.05, sampler=sampler) as prof:
+            time.sleep(0.1)
+            # Replace the file at once, so the sampler never reads it half-written.
+            (cgroup / "cpu.new").write_text("usage_usec 3000\nthrottled_usec 5\n")
+            (cgroup / "cpu.new").replace(cgroup / "cpu.stat")
+            time.sleep(0.1)
+
+        df = self.read_log()
+        samples = df[df.op == "sample"]
+        self.assertEqual(set(samples.mem), {1000})
+        self.assertEqual(set(samples.peak_mem), {7000})
+        self.assertEqual(set(samples.throttled), {5000})
+        self.assertEqual(set(samples.cpu), {1_000_000, 3_000_000})
+        stats = df[df.op == "stats"]
+        self.assertEqual(list(stats.data), ["7000"])
+        summary = json.loads(stats.extra.iloc[0])
+        self.assertEqual(summary, prof.resources())
+        self.assertEqual(summary["cpu_sec"], 0.002)
+        self.assertEqual(summary["peak_memory"], 7000)
+
+    def test_legacy_log_array(self):
+        schema = tiledb.ArraySchema(
+            domain=tiledb.Domain(tiledb.Dim("time_ms", (0, 2**63), dtype=np.uint64)),
+            sparse=True,
+            attrs=[
+                tiledb.Attr(name=name, dtype="ascii", var=True)
+                for name in ("id", "op", "data", "extra")
+            ],
+            allows_duplicates=True,
+        )
+        tiledb.Array.create(self.uri, schema)
+        with Profiler(array_uri=self.uri, period_sec=0.05, trace=True):
+            time.sleep(0.2)
+        write_log_event(self.uri, "id", "op")
+
+        df = self.read_log()
+        self.assertGreaterEqual((df.op == "trace").sum(), 2)
+        stats = df[df.op == "stats"]
+        self.assertTrue(stats.extra.iloc[0].startswith("time,cpu,mem\n"))
+        self.assertEqual(df.op.value_counts()["op"], 1)
@@ -0,0 +1,136 @@
+import pathlib
+import tempfile
+import unittest
+
+from tiledb.cloud.utilities import ResourceSample
+from tiledb.cloud.utilities import ResourceSampler
+from tiledb.cloud.utilities.resources import CgroupVersion
+from tiledb.cloud.utilities.resources import summarize
+
+
+def _write_files(root: pathlib.Path, files: dict) -> None:
+    for name, contents in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents)
+
+
+class ResourceSamplerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cgroup = pathlib.Path(self.tmp.name, "cgroup")
+        self.proc = pathlib.Path(self.tmp.name, "proc")
+        self.cgroup.mkdir()
+        self.proc.mkdir()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sampler(self):
+        return ResourceSampler(cgroup_root=str(self.cgroup), proc_root=str(self.proc))
+
+    def test_cgroup_v2(self):
+        _write_files(
+            self.cgroup,
+            {
+                "cgroup.controllers": "cpu io memory\n",
+                "job/memory.current": "1000\n",
+                "job/memory.peak": "5000\n",
+                "job/cpu.stat": (
+                    "usage_usec 2500\nuser_usec 2000\nsystem_usec 500\n"
+                    "nr_periods 10\nnr_throttled 2\nthrottled_usec 300\n"
+                ),
+                "job/io.stat": (
+                    "8:0 rbytes=100 wbytes=200 rios=1 wios=2 dbytes=0 dios=0\n"
+                    "8:16 rbytes=10 wbytes=20 rios=1 wios=2 dbytes=0 dios=0\n"
+                ),
+            },
+        )
+        _write_files(self.proc, {"self/cgroup": "0::/job\n"})
+
+        sampler = self.sampler()
+        self.assertIs(sampler.version, CgroupVersion.V2)
+        sample = sampler.sample()
+        self.assertEqual(sample.cpu_ns, 2_500_000)
+        self.assertEqual(sample.throttled_ns, 300_000)
+        self.assertEqual(sample.memory, 1000)
+        self.assertEqual(sample.peak_memory, 5000)
+        self.assertEqual((sample.read_bytes, sample.write_bytes), (110, 220))
+
+    def test_cgroup_v2_without_peak(self):
+        _write_files(
+            self.cgroup,
+            {"cgroup.controllers": "memory\n", "memory.current": "3000\n"},
+        )
+        sampler = self.sampler()
+        self.assertEqual(sampler.peak_memory(), 3000)
+        (self.cgroup / "memory.current").write_text("1000\n")
+        # The highest usage seen stands in for the missing memory.peak.
+        self.assertEqual(sampler.peak_memory(), 3000)
+        self.assertEqual(sampler.sample().cpu_ns, 0)
+
+    def test_cgroup_v1(self):
+        _write_files(
+            self.cgroup,
+            {
+                "memory/memory.usage_in_bytes": "1000\n",
+                "memory/memory.max_usage_in_bytes": "4000\n",
+                "memory/memory.memsw.max_usage_in_bytes": "6000\n",
+                "cpu/cpuacct.usage": "123456789\n",
+                "cpu/cpu.stat": "nr_periods 5\nnr_throttled 1\nthrottled_time 42\n",
+                "blkio/blkio.throttle.io_service_bytes": (
+                    "8:0 Read 100\n8:0 Write 200\n8:0 Sync 300\n8:0 Total 300\n"
+                    "Total 300\n"
+                ),
+            },
+        )
+        sampler = self.sampler()
+        self.assertIs(sampler.version, CgroupVersion.V1)
+        sample = sampler.sample()
+        self.assertEqual(sample.cpu_ns, 123456789)
+        self.assertEqual(sample.throttled_ns, 42)
+        self.assertEqual(sample.memory, 1000)
+        self.assertEqual(sample.peak_memory, 6000)
+        self.assertEqual((sample.read_bytes, sample.write_bytes), (100, 200))
+
+    def test_procfs(self):
+        stat = "1 (my (odd) cmd) S" + " 0" * 10 + " 300 200" + " 0" * 30
+        _write_files(
+            self.proc,
+            {
+                "self/stat": stat + "\n",
+                "self/status": "Name:\tpython\nVmHWM:\t2048 kB\nVmRSS:\t1024 kB\n",
+                "self/io": "rchar: 1\nwchar: 2\nread_bytes: 4096\nwrite_bytes: 8192\n",
+            },
+        )
+        sampler = self.sampler()
+        self.assertIs(sampler.version, CgroupVersion.PROCFS)
+        sample = sampler.sample()
+        self.assertGreater(sample.cpu_ns, 0)
+        self.assertEqual(sample.memory, 1024 << 10)
+        self.assertEqual(sample.peak_memory, 2048 << 10)
+        self.assertEqual((sample.read_bytes, sample.write_bytes), (4096, 8192))
+
+    def test_unavailable(self):
+        sample = self.sampler().sample()
+        self.assertEqual(sample.memory, 0)
+        self.assertEqual(sample.peak_memory, 0)
+
+
+class SummarizeTest(unittest.TestCase):
+    def test_summarize(self):
+        self.assertEqual(summarize([]), {})
+        summary = summarize(
+            [
+                ResourceSample(time=10, cpu_ns=0, peak_memory=100, read_bytes=5),
+                ResourceSample(time=12, cpu_ns=3 * 10**9, peak_memory=300),
+                ResourceSample(
+                    time=14, cpu_ns=4 * 10**9, peak_memory=200, read_bytes=25
+                ),
+            ]
+        )
+        self.assertEqual(summary["elapsed_sec"], 4)
+        self.assertEqual(summary["cpu_sec"], 4)
+        self.assertEqual(summary["avg_cpus"], 1)
+        self.assertEqual(summary["peak_memory"], 300)
+        self.assertEqual(summary["read_bytes"], 20)
@@ -0,0 +1,125 @@
+"""Unit tests for tiledb.cloud.vcf.allele_frequency module."""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import tiledb
+from tiledb.cloud.vcf import allele_frequency
+
+
+class ReadAlleleFrequencyTest(unittest.TestCase):
+    def setUp(self):
+        allele_frequency.clear_allele_frequency_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dataset_uri = os.path.join(self.tmp.name, "dataset")
+        self.stats_uri = os.path.join(self.dataset_uri, "variant_stats")
+
+        tiledb.group_create(self.dataset_uri)
+        dom = tiledb.Domain(
+            tiledb.Dim(name="contig", domain=(None, None), tile=None, dtype="ascii"),
+            tiledb.Dim(name="pos", domain=(0, 1 << 30), tile=1000, dtype=np.uint32),
+        )
+        schema = tiledb.ArraySchema(
+            domain=dom,
+            sparse=True,
+            allows_duplicates=True,
+            attrs=[
+                tiledb.Attr(name="allele", dtype="ascii", var=True),
+                tiledb.Attr(name="ac", dtype=np.int32),
+            ],
+        )
+        tiledb.Array.create(self.stats_uri, schema)
+        with tiledb.Group(self.dataset_uri, "w") as g:
+            g.add(self.stats_uri, name="variant_stats")
+
+        self.timestamp = 1
+        self._write([100, 100, 150_000], ["ref", "A", "ref"], [3, 1, 2])
+        self._write([100, 250_000], ["ref", "C"], [2, 4])
+
+    def tearDown(self):
+        allele_frequency.clear_allele_frequency_cache()
+        self.tmp.cleanup()
+
+    def _write(self, pos, allele, ac):
+        with tiledb.open(self.stats_uri, "w", timestamp=self.timestamp) as A:
+            A[["chr1"] * len(pos), pos] = {
+                "allele": np.array(allele, dtype=object),
+                "ac": np.array(ac, dtype=np.int32),
+            }
+        self.timestamp += 1
+
+    def _read(self, region, **kwargs):
+        return allele_frequency.read_allele_frequency(
+            self.dataset_uri, region, cache_bin_size=100_000, **kwargs
+        )
+
+    def assert_matches_uncached(self, region):
+        actual = self._read(region)
+        expected = self._read(region, use_cache=False)
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+        )
+        return actual
+
+    def test_cached_matches_uncached(self):
+        for region in ["chr1:1-1000", "chr1:50-200000", "chr1:1-300000"]:
+            with self.subTest(region=region):
+                df = self.assert_matches_uncached(region)
+                self.assertFalse(df.empty)
+
+        df = self._read("chr1:100-100")
+        self.assertEqual(df.ac.tolist(), [1, 5])
+        self.assertEqual(df.an.tolist(), [6, 6])
+
+    def test_overlapping_queries_reuse_bins(self):
+        real_read = allele_frequency._read_counts
+        with patch.object(
+            allele_frequency, "_read_counts", side_effect=real_read
+        ) as read:
+            self._read("chr1:1-150000")
+            self.assertEqual(read.call_args.args[2], [0, 1])
+            self._read("chr1:50-250000")
+            self.assertEqual(read.call_count, 2)
+            self.assertEqual(read.call_args.args[2], [2])
+            self._read("chr1:1-299999")
+            self.assertEqual(read.call_count, 2)
+
+    def test_new_fragments_are_read_incrementally(self):
+        self._read("chr1:1-300000")
+        self._write([100, 150_001], ["A", "G"], [7, 1])
+
+        real_read = allele_frequency._read_counts
+        with patch.object(
+            allele_frequency, "_read_counts", side_effect=real_read
+        ) as read:
+            df = self.assert_matches_uncached("chr1:1-300000")
+            self.assertEqual(read.call_args_list[0].kwargs["timestamp"], (3, 3))
+
+        self.assertEqual(df[df.pos == 100].ac.tolist(), [8, 5])
+
+    def test_consolidation_invalidates_bins(self):
+        self._read("chr1:1-300000")
+        tiledb.consolidate(self.stats_uri)
+        tiledb.vacuum(self.stats_uri)
+
+        real_read = allele_frequency._read_counts
+        with patch.object(
+            allele_frequency, "_read_counts", side_effect=real_read
+        ) as read:
+            self.assert_matches_uncached("chr1:1-300000")
+            self.assertEqual(read.call_args_list[0].kwargs["timestamp"], (0, 2))
+
+    def test_bin_sizes_are_cached_separately(self):
+        self._write([5500], ["T"], [1])
+        allele_frequency.read_allele_frequency(
+            self.dataset_uri, "chr1:1-999", cache_bin_size=1000
+        )
+        df = self._read("chr1:1-99999")
+        self.assertEqual(sorted(set(df.pos)), [100, 5500])
@@ -0,0 +1,155 @@
+"""Unit tests for tiledb.cloud.vcf.vcf_toolbox.annotate module."""
+
+import time
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tiledb.cloud.vcf.vcf_toolbox.annotate import _annotate
+from tiledb.cloud.vcf.vcf_toolbox.annotate import _explode
+from tiledb.cloud.vcf.vcf_toolbox.annotate import _split_ref_alt
+from tiledb.cloud.vcf.vcf_toolbox.annotate import zygosity
+from tiledb.cloud.vcf.vcf_toolbox.annotate import zygosity_array
+
+
+def _random_genotypes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ploidy = rng.integers(0, 4, size=n)
+    return pd.Series(
+        [rng.integers(-1, 3, size=p).astype(np.int32) for p in ploidy],
+        dtype=object,
+    )
+
+
+def _reference_split(df):
+    """The pandas implementation that the vectorized helpers replace."""
+    df = df.copy()
+    df["ref"] = df["alleles"].str[0]
+    df["alt"] = df["alleles"].str[1:]
+    df.drop("alleles", axis=1, inplace=True)
+    df["info_TILEDB_ALT_IAF"] = df["info_TILEDB_IAF"].str[1:]
+    return df.explode(["alt", "info_TILEDB_ALT_IAF"])
+
+
+def _sample_df():
+    return pd.DataFrame(
+        {
+            "pos_start": [10, 20, 30, 40],
+            "alleles": [
+                np.array(["A", "C"], dtype=object),
+                np.array(["G", "T", "GT"], dtype=object),
+                np.array(["C"], dtype=object),
+                np.array(["T", "A"], dtype=object),
+            ],
+            "info_TILEDB_IAF": [
+                np.array([0.5, 0.5], dtype=np.float32),
+                np.array([0.25, 0.5, 0.25], dtype=np.float32),
+                np.array([1.0], dtype=np.float32),
+                np.array([0.9, 0.1], dtype=np.float32),
+            ],
+        }
+    )
+
+
+def test_zygosity_array():
+    cases = [[], [0], [1], [2], [0, 0], [0, 1], [1, 0], [2, 0], [1, 1], [1, 2]]
+    cases += [[2, 2], [-1, -1], [-1], [1, 2, 3], [0, -1], [-1, -1, 1]]
+    gt = pd.Series([np.array(c, dtype=np.int32) for c in cases], dtype=object)
+
+    expected = [zygosity(g) for g in gt]
+    assert list(zygosity_array(gt)) == expected
+
+
+def test_zygosity_array_random():
+    gt = _random_genotypes(10_000)
+
+    expected = gt.apply(zygosity).tolist()
+    assert zygosity_array(gt).tolist() == expected
+
+
+def test_split_and_explode():
+    df = _sample_df()
+    expected = _reference_split(df)
+
+    ref, alt = _split_ref_alt(df["alleles"])
+    _, alt_af = _split_ref_alt(df["info_TILEDB_IAF"])
+    df = df.drop("alleles", axis=1)
+    df["ref"] = ref.values
+    result = _explode(df, {"alt": alt, "info_TILEDB_ALT_IAF": alt_af})
+
+    assert list(result.columns) == list(expected.columns)
+    assert list(result.index) == list(expected.index)
+    assert result["pos_start"].tolist() == expected["pos_start"].tolist()
+    assert result["ref"].tolist() == expected["ref"].tolist()
+    assert result["alt"].tolist()[:3] == expected["alt"].tolist()[:3]
+    # Variants without an ALT allele produce a single row with a null ALT.
+    assert pd.isna(result["alt"].iloc[3]) and pd.isna(expected["alt"].iloc[3])
+    np.testing.assert_allclose(
+        result["info_TILEDB_ALT_IAF"].astype(float),
+        expected["info_TILEDB_ALT_IAF"].astype(float),
+    )
+
+
+def test_explode_mismatched_lengths():
+    df = _sample_df()
+    _, alt = _split_ref_alt(df["alleles"])
+    _, other = _split_ref_alt(df["alleles"].iloc[::-1])
+
+    with pytest.raises(ValueError):
+        _explode(df, {"alt": alt, "other": other})
+
+
+@patch("tiledb.open")
+def test_annotate(mocked_open: MagicMock) -> None:
+    ann_df = pd.DataFrame(
+        {
+            "contig": ["chr1", "chr1", "chr1", "chr1"],
+            "pos_start": [10, 20, 20, 20],
+            "ref": ["A", "G", "G", "G"],
+            "alt": ["C", "T", "GT", "GT"],
+            "Gene": ["G1", "G2", "G3", "G3"],
+        }
+    )
+    array = mocked_open.return_value.__enter__.return_value
+    array.query.return_value.df.__getitem__.return_value = ann_df
+
+    vcf_df = _sample_df()
+    vcf_df["contig"] = "chr1"
+    vcf_df["fmt_GT"] = [
+        np.array([0, 1]),
+        np.array([1, 2]),
+        np.array([0, 0]),
+        np.array([1, 1]),
+    ]
+
+    result = _annotate(
+        vcf_df,
+        ann_uri="ann",
+        ann_regions="chr1:1-100",
+        add_zygosity=True,
+    )
+
+    assert list(result.columns[-3:]) == ["info_TILEDB_ALT_IAF", "zygosity", "Gene"]
+    assert result["alt"].tolist()[:3] == ["C", "T", "GT"]
+    assert result["Gene"].tolist()[:3] == ["G1", "G2", "G3"]
+    assert result["zygosity"].tolist() == ["HET", "HET", "HET", "HOM_REF", "HOM_ALT"]
+
+
+@pytest.mark.benchmark
+def test_benchmark_zygosity():
+    gt = _random_genotypes(1_000_000)
+
+    t_start = time.perf_counter()
+    expected = gt.apply(zygosity)
+    t_apply = time.perf_counter() - t_start
+
+    t_start = time.perf_counter()
+    result = zygosity_array(gt)
+    t_vectorized = time.perf_counter() - t_start
+
+    print(f"zygosity: apply {t_apply:.3f} sec, vectorized {t_vectorized:.3f} sec")
+    assert result.tolist() == expected.tolist()
+    assert t_vectorized < t_apply
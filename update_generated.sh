@@ -133,19 +133,24 @@ run_format() {
   done
 }
 
-# Apply an api_client patch to avoid descending into known–JSON-safe values.
+# Apply an api_client patch to avoid descending into known–JSON-safe values,
+# to name endpoints for request instrumentation, and to convert models with
+# the cached codecs of tiledb.cloud._common.rest_codec.
 apply_json_safe_patch() {
-  git apply - <<EOF
+  git apply - <<'EOF'
 diff --git a/src/tiledb/cloud/rest_api/api_client.py b/src/tiledb/cloud/rest_api/api_client.py
-index 97319c27..f2307414 100644
 --- a/src/tiledb/cloud/rest_api/api_client.py
 +++ b/src/tiledb/cloud/rest_api/api_client.py
-@@ -24,7 +24,8 @@ import six
- from dateutil.parser import parse
+@@ -21,10 +21,11 @@ from multiprocessing.pool import ThreadPool
+ 
+ # python 2 and python 3 compatibility library
+ import six
+-from dateutil.parser import parse
  from six.moves.urllib.parse import quote
-
+ 
 -import tiledb.cloud.rest_api.models
-+from tiledb.cloud._common import json_safe
++from tiledb.cloud import instrumentation
++from tiledb.cloud._common import rest_codec
 +from tiledb.cloud.rest_api import models
  from tiledb.cloud.rest_api import rest
  from tiledb.cloud.rest_api.configuration import Configuration
@@ -168,27 +173,215 @@ index 97319c27..f2307414 100644
 +        This is needed to share the same API class between both this API version
 +        and API version 2.  See __deserialize for use.
 +        """
-
+ 
      def __enter__(self):
          return self
-@@ -250,6 +258,8 @@ class ApiClient(object):
+@@ -143,6 +151,7 @@ class ApiClient(object):
+         _host=None,
+     ):
+         config = self.configuration
++        endpoint = resource_path
+ 
+         # header parameters
+         header_params = header_params or {}
+@@ -193,16 +202,17 @@ class ApiClient(object):
+ 
+         try:
+             # perform request and return response
+-            response_data = self.request(
+-                method,
+-                url,
+-                query_params=query_params,
+-                headers=header_params,
+-                post_params=post_params,
+-                body=body,
+-                _preload_content=_preload_content,
+-                _request_timeout=_request_timeout,
+-            )
++            with instrumentation.endpoint(endpoint):
++                response_data = self.request(
++                    method,
++                    url,
++                    query_params=query_params,
++                    headers=header_params,
++                    post_params=post_params,
++                    body=body,
++                    _preload_content=_preload_content,
++                    _request_timeout=_request_timeout,
++                )
+         except ApiException as e:
+             e.body = e.body.decode("utf-8") if six.PY3 else e.body
+             raise e
+@@ -248,35 +258,7 @@ class ApiClient(object):
+         :param obj: The data to serialize.
+         :return: The serialized form of data.
          """
-         if obj is None:
-             return None
-+        elif isinstance(obj, json_safe.Value):
-+            return obj.value
-         elif isinstance(obj, self.PRIMITIVE_TYPES):
-             return obj
-         elif isinstance(obj, list):
-@@ -326,7 +336,7 @@ class ApiClient(object):
-             if klass in self.NATIVE_TYPES_MAPPING:
-                 klass = self.NATIVE_TYPES_MAPPING[klass]
-             else:
+-        if obj is None:
+-            return None
+-        elif isinstance(obj, self.PRIMITIVE_TYPES):
+-            return obj
+-        elif isinstance(obj, list):
+-            return [self.sanitize_for_serialization(sub_obj) for sub_obj in obj]
+-        elif isinstance(obj, tuple):
+-            return tuple(self.sanitize_for_serialization(sub_obj) for sub_obj in obj)
+-        elif isinstance(obj, (datetime.datetime, datetime.date)):
+-            return obj.isoformat()
+-
+-        if isinstance(obj, dict):
+-            obj_dict = obj
+-        else:
+-            # Convert model obj to dict except
+-            # attributes `openapi_types`, `attribute_map`
+-            # and attributes which value is not None.
+-            # Convert attribute name to json key in
+-            # model definition for request.
+-            obj_dict = {
+-                obj.attribute_map[attr]: getattr(obj, attr)
+-                for attr, _ in six.iteritems(obj.openapi_types)
+-                if getattr(obj, attr) is not None
+-            }
+-
+-        return {
+-            key: self.sanitize_for_serialization(val)
+-            for key, val in six.iteritems(obj_dict)
+-        }
++        return rest_codec.encode(obj)
+ 
+     def deserialize(self, response, response_type):
+         """Deserializes response into an object.
+@@ -308,36 +290,7 @@ class ApiClient(object):
+ 
+         :return: object.
+         """
+-        if data is None:
+-            return None
+-
+-        if type(klass) == str:
+-            if klass.startswith("list["):
+-                sub_kls = re.match(r"list\[(.*)\]", klass).group(1)
+-                return [self.__deserialize(sub_data, sub_kls) for sub_data in data]
+-
+-            if klass.startswith("dict("):
+-                sub_kls = re.match(r"dict\(([^,]*), (.*)\)", klass).group(2)
+-                return {
+-                    k: self.__deserialize(v, sub_kls) for k, v in six.iteritems(data)
+-                }
+-
+-            # convert str to class
+-            if klass in self.NATIVE_TYPES_MAPPING:
+-                klass = self.NATIVE_TYPES_MAPPING[klass]
+-            else:
 -                klass = getattr(tiledb.cloud.rest_api.models, klass)
-+                klass = getattr(self._tdb_models_module, klass)
-
-         if klass in self.PRIMITIVE_TYPES:
-             return self.__deserialize_primitive(data, klass)
+-
+-        if klass in self.PRIMITIVE_TYPES:
+-            return self.__deserialize_primitive(data, klass)
+-        elif klass == object:
+-            return self.__deserialize_object(data)
+-        elif klass == datetime.date:
+-            return self.__deserialize_date(data)
+-        elif klass == datetime.datetime:
+-            return self.__deserialize_datetime(data)
+-        else:
+-            return self.__deserialize_model(data, klass)
++        return rest_codec.decode(self._tdb_models_module, data, klass)
+ 
+     def call_api(
+         self,
+@@ -651,94 +604,3 @@ class ApiClient(object):
+             f.write(response.data)
+ 
+         return path
+-
+-    def __deserialize_primitive(self, data, klass):
+-        """Deserializes string to primitive type.
+-
+-        :param data: str.
+-        :param klass: class literal.
+-
+-        :return: int, long, float, str, bool.
+-        """
+-        try:
+-            return klass(data)
+-        except UnicodeEncodeError:
+-            return six.text_type(data)
+-        except TypeError:
+-            return data
+-
+-    def __deserialize_object(self, value):
+-        """Return an original value.
+-
+-        :return: object.
+-        """
+-        return value
+-
+-    def __deserialize_date(self, string):
+-        """Deserializes string to date.
+-
+-        :param string: str.
+-        :return: date.
+-        """
+-        try:
+-            return parse(string).date()
+-        except ImportError:
+-            return string
+-        except ValueError:
+-            raise rest.ApiException(
+-                status=0, reason="Failed to parse `{0}` as date object".format(string)
+-            )
+-
+-    def __deserialize_datetime(self, string):
+-        """Deserializes string to datetime.
+-
+-        The string should be in iso8601 datetime format.
+-
+-        :param string: str.
+-        :return: datetime.
+-        """
+-        try:
+-            return parse(string)
+-        except ImportError:
+-            return string
+-        except ValueError:
+-            raise rest.ApiException(
+-                status=0,
+-                reason=("Failed to parse `{0}` as datetime object".format(string)),
+-            )
+-
+-    def __deserialize_model(self, data, klass):
+-        """Deserializes list or dict to model.
+-
+-        :param data: dict, list.
+-        :param klass: class literal.
+-        :return: model object.
+-        """
+-        has_discriminator = False
+-        if (
+-            hasattr(klass, "get_real_child_model")
+-            and klass.discriminator_value_class_map
+-        ):
+-            has_discriminator = True
+-
+-        if not klass.openapi_types and has_discriminator is False:
+-            return data
+-
+-        kwargs = {}
+-        if (
+-            data is not None
+-            and klass.openapi_types is not None
+-            and isinstance(data, (list, dict))
+-        ):
+-            for attr, attr_type in six.iteritems(klass.openapi_types):
+-                if klass.attribute_map[attr] in data:
+-                    value = data[klass.attribute_map[attr]]
+-                    kwargs[attr] = self.__deserialize(value, attr_type)
+-
+-        instance = klass(**kwargs)
+-
+-        if has_discriminator:
+-            klass_name = instance.get_real_child_model(data)
+-            if klass_name:
+-                instance = self.__deserialize(data, klass_name)
+-        return instance
 EOF
 }
 